@@ -3,38 +3,58 @@ Background tasks para processar notificações e status automaticamente
 """
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Dict, List, Optional
 
+from sqlalchemy import case, func, or_, update
 from sqlalchemy.orm import Session
 
+from app.core.metrics import BACKGROUND_STAGE_SECONDS
 from app.core.notification_service import NotificationService
 from app.core.payment_service import PaymentCalculationService
 from app.src.contracts.models import Contract
+from app.src.dashboard.cache import mark_users_dirty
+from app.src.dashboard.rollups import MonthlyRollupService
 from app.src.payments.models import Payment
 
 
+def _user_scope(column, user_id: Optional[int], user_ids: Optional[List[int]]) -> list:
+    """Filtros por usuário: um usuário, um lote, ambos ou nenhum (todos)"""
+    scope = [column == user_id] if user_id is not None else []
+    if user_ids is not None:
+        scope.append(column.in_(user_ids))
+    return scope
+
+
 class BackgroundTasksService:
     """Serviço para executar tarefas em background"""
 
     @staticmethod
-    def process_contract_expiring_notifications(db: Session, user_id: int) -> int:
+    def process_contract_expiring_notifications(
+        db: Session,
+        user_id: Optional[int] = None,
+        commit: bool = True,
+        user_ids: Optional[List[int]] = None,
+    ) -> int:
         """
         Processa notificações de contratos vencendo
 
         Args:
             db: Sessão do banco
-            user_id: ID do usuário
+            user_id: ID do usuário (None = todos os usuários)
+            commit: Fazer commit ao final (False dentro de run_all_background_tasks)
+            user_ids: Lote de usuários (worker); combinado com user_id se ambos informados
 
         Returns:
             Número de notificações criadas
         """
-        # Buscar contratos ativos do usuário
+        # Buscar contratos ativos do(s) usuário(s)
         contracts = (
             db.query(Contract)
-            .filter(Contract.user_id == user_id, Contract.status == "active")
+            .filter(*_user_scope(Contract.user_id, user_id, user_ids), Contract.status == "active")
             .all()
         )
 
-        notifications_created = 0
+        items = []
 
         for contract in contracts:
             notification_type = (
@@ -43,40 +63,27 @@ class BackgroundTasksService:
 
             if notification_type:
                 days = 60 if notification_type == "60_days" else 30
+                items.append((contract, days))
 
-                # Verificar se já não existe notificação similar recente
-                from datetime import timedelta
-
-                from app.src.notifications.models import Notification
-
-                recent_notification = (
-                    db.query(Notification)
-                    .filter(
-                        Notification.user_id == user_id,
-                        Notification.type == "contract_expiring",
-                        Notification.related_id == str(contract.id),
-                        Notification.created_at
-                        >= datetime.utcnow() - timedelta(days=3),  # Últimos 3 dias
-                    )
-                    .first()
-                )
-
-                if not recent_notification:
-                    NotificationService.create_contract_expiring_notification(
-                        db=db, contract=contract, days_until_expiry=days
-                    )
-                    notifications_created += 1
-
-        return notifications_created
+        # O aviso de 60/30 dias dispara em 3 dias seguidos; a chave (contrato, marco,
+        # data de término) é a mesma nos três e o ON CONFLICT ignora as repetidas
+        return NotificationService.create_contract_expiring_notifications(db, items, commit=commit)
 
     @staticmethod
-    def process_payment_reminders(db: Session, user_id: int) -> int:
+    def process_payment_reminders(
+        db: Session,
+        user_id: Optional[int] = None,
+        commit: bool = True,
+        user_ids: Optional[List[int]] = None,
+    ) -> int:
         """
         Processa lembretes de pagamentos próximos do vencimento
 
         Args:
             db: Sessão do banco
-            user_id: ID do usuário
+            user_id: ID do usuário (None = todos os usuários)
+            commit: Fazer commit ao final (False dentro de run_all_background_tasks)
+            user_ids: Lote de usuários (worker); combinado com user_id se ambos informados
 
         Returns:
             Número de notificações criadas
@@ -84,11 +91,14 @@ class BackgroundTasksService:
         # Buscar pagamentos pendentes ou atrasados
         payments = (
             db.query(Payment)
-            .filter(Payment.user_id == user_id, Payment.status.in_(["pending", "overdue"]))
+            .filter(
+                *_user_scope(Payment.user_id, user_id, user_ids),
+                Payment.status.in_(["pending", "overdue"]),
+            )
             .all()
         )
 
-        notifications_created = 0
+        items = []
         current_date = datetime.now().date()
 
         for payment in payments:
@@ -101,163 +111,161 @@ class BackgroundTasksService:
             reminder_type = PaymentCalculationService.should_send_payment_reminder(due_date_val)  # type: ignore[arg-type]
 
             if reminder_type:
-                # Verificar se já não existe notificação similar recente
-                from datetime import timedelta
-
-                from app.src.notifications.models import Notification
-
-                recent_notification = (
-                    db.query(Notification)
-                    .filter(
-                        Notification.user_id == user_id,
-                        Notification.type == "reminder",
-                        Notification.related_id == str(payment.id),
-                        Notification.created_at >= datetime.utcnow() - timedelta(hours=12),
-                    )
-                    .first()
-                )
+                items.append((payment, days_until_due))
 
-                if not recent_notification:
-                    NotificationService.create_payment_reminder_notification(
-                        db=db, payment=payment, days_until_due=days_until_due
-                    )
-                    notifications_created += 1
-
-        return notifications_created
+        return NotificationService.create_payment_reminder_notifications(db, items, commit=commit)
 
     @staticmethod
-    def process_overdue_payment_notifications(db: Session, user_id: int) -> int:
+    def process_overdue_payment_notifications(
+        db: Session,
+        user_id: Optional[int] = None,
+        commit: bool = True,
+        user_ids: Optional[List[int]] = None,
+    ) -> int:
         """
         Processa notificações de pagamentos atrasados
 
         Args:
             db: Sessão do banco
-            user_id: ID do usuário
+            user_id: ID do usuário (None = todos os usuários)
+            commit: Fazer commit ao final (False dentro de run_all_background_tasks)
+            user_ids: Lote de usuários (worker); combinado com user_id se ambos informados
 
         Returns:
             Número de notificações criadas
         """
         # Buscar pagamentos atrasados
         payments = (
-            db.query(Payment).filter(Payment.user_id == user_id, Payment.status == "overdue").all()
+            db.query(Payment)
+            .filter(*_user_scope(Payment.user_id, user_id, user_ids), Payment.status == "overdue")
+            .all()
         )
 
-        notifications_created = 0
-
+        # Enviar notificação no primeiro dia e a cada 7 dias de atraso
+        due_payments = []
         for payment in payments:
             due_date_val = (
                 payment.due_date if isinstance(payment.due_date, date) else payment.due_date
             )
             days_overdue = PaymentCalculationService.calculate_days_overdue(due_date_val)  # type: ignore[arg-type]
 
-            if days_overdue > 0:
-                # Enviar notificação a cada 7 dias de atraso
-                if days_overdue % 7 == 0 or days_overdue == 1:
-                    # Verificar se já não existe notificação similar recente
-                    from datetime import timedelta
-
-                    from app.src.notifications.models import Notification
-
-                    recent_notification = (
-                        db.query(Notification)
-                        .filter(
-                            Notification.user_id == user_id,
-                            Notification.type == "payment_overdue",
-                            Notification.related_id == str(payment.id),
-                            Notification.created_at >= datetime.utcnow() - timedelta(days=3),
-                        )
-                        .first()
-                    )
-
-                    if not recent_notification:
-                        # Recalcular valores com multa e juros
-                        from app.src.contracts.models import Contract
-
-                        contract = (
-                            db.query(Contract).filter(Contract.id == payment.contract_id).first()
-                        )
-
-                        if contract:
-                            (
-                                _,
-                                _,
-                                total_addition,
-                            ) = PaymentCalculationService.calculate_fine_and_interest(
-                                Decimal(str(payment.amount)),
-                                Decimal(str(contract.fine_rate)),
-                                Decimal(str(contract.interest_rate)),
-                                days_overdue,
-                            )
-                            total_amount = Decimal(str(payment.amount)) + total_addition
-
-                            NotificationService.create_payment_overdue_notification(
-                                db=db,
-                                payment=payment,
-                                days_overdue=days_overdue,
-                                total_amount=Decimal(str(total_amount)),
-                            )
-                            notifications_created += 1
-
-        return notifications_created
+            if days_overdue > 0 and (days_overdue % 7 == 0 or days_overdue == 1):
+                due_payments.append((payment, days_overdue))
+
+        # Contratos (multa e juros) carregados em uma única consulta
+        contract_ids = {payment.contract_id for payment, _ in due_payments}
+        contracts = (
+            {c.id: c for c in db.query(Contract).filter(Contract.id.in_(contract_ids)).all()}
+            if contract_ids
+            else {}
+        )
+
+        items = []
+        for payment, days_overdue in due_payments:
+            contract = contracts.get(payment.contract_id)
+
+            if contract:
+                # Recalcular valores com multa e juros
+                (
+                    _,
+                    _,
+                    total_addition,
+                ) = PaymentCalculationService.calculate_fine_and_interest(
+                    Decimal(str(payment.amount)),
+                    Decimal(str(contract.fine_rate)),
+                    Decimal(str(contract.interest_rate)),
+                    days_overdue,
+                )
+                total_amount = Decimal(str(payment.amount)) + total_addition
+                items.append((payment, days_overdue, total_amount))
+
+        return NotificationService.create_payment_overdue_notifications(db, items, commit=commit)
 
     @staticmethod
-    def update_payment_statuses_automatically(db: Session, user_id: int) -> dict:
+    def update_payment_statuses_automatically(
+        db: Session,
+        user_id: Optional[int] = None,
+        commit: bool = True,
+        user_ids: Optional[List[int]] = None,
+    ) -> dict:
         """
-        Atualiza automaticamente os status de todos os pagamentos
+        Atualiza automaticamente os status dos pagamentos com UPDATEs em lote
+
+        Aplica no banco as mesmas regras de determine_payment_status:
+        sem data de pagamento ou com valor pago zero -> overdue se vencido, senão pending;
+        demais -> paid se amount >= total_amount, senão partial.
+        O custo é de poucas instruções, independente do histórico de pagamentos.
 
         Args:
             db: Sessão do banco
-            user_id: ID do usuário
+            user_id: ID do usuário (None = todos os usuários)
+            commit: Fazer commit ao final (False dentro de run_all_background_tasks)
+            user_ids: Lote de usuários (worker); combinado com user_id se ambos informados
 
         Returns:
             Dict com contadores de mudanças
         """
-        # Buscar todos os pagamentos do usuário
-        payments = db.query(Payment).filter(Payment.user_id == user_id).all()
-
-        changes = {
-            "pending_to_overdue": 0,
-            "total_overdue": 0,
-            "total_pending": 0,
-            "total_paid": 0,
-            "total_partial": 0,
-        }
-
-        for payment in payments:
-            old_status = payment.status
-
-            # Converter Column para tipos Python
-            due_date_val = (
-                payment.due_date if isinstance(payment.due_date, date) else payment.due_date
-            )
-            payment_date_val = (
-                payment.payment_date
-                if payment.payment_date is None or isinstance(payment.payment_date, date)
-                else payment.payment_date
+        today = date.today()
+        scope = _user_scope(Payment.user_id, user_id, user_ids)
+        returning = (Payment.user_id, Payment.property_id, Payment.due_date, Payment.payment_date)
+        # determine_payment_status só considera pago com data de pagamento e valor > 0
+        not_paid = or_(Payment.payment_date.is_(None), func.coalesce(Payment.amount, 0) == 0)
+
+        # Transição principal: pendentes que venceram passam a atrasados
+        overdue_rows = db.execute(
+            update(Payment)
+            .where(
+                *scope,
+                Payment.status == "pending",
+                not_paid,
+                Payment.due_date < today,
             )
-            amount_val = Decimal(str(payment.amount)) if payment.payment_date else None
-            total_val = Decimal(str(payment.total_amount))
-
-            # Determinar novo status
-            new_status = PaymentCalculationService.determine_payment_status(
-                due_date_val,  # type: ignore[arg-type]
-                payment_date_val,  # type: ignore[arg-type]
-                amount_val,
-                total_val,
-            )
-
-            # Atualizar se mudou
-            if old_status != new_status:
-                setattr(payment, "status", new_status)
+            .values(status="overdue", updated_at=datetime.utcnow())
+            .returning(*returning)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        # Demais divergências (ex.: pagamento registrado sem status atualizado)
+        expected_status = case(
+            (not_paid, case((Payment.due_date < today, "overdue"), else_="pending")),
+            (Payment.amount >= Payment.total_amount, "paid"),
+            else_="partial",
+        )
+        other_rows = db.execute(
+            update(Payment)
+            .where(*scope, Payment.status.is_distinct_from(expected_status))
+            .values(status=expected_status, updated_at=datetime.utcnow())
+            .returning(*returning)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        # Contagem final agrupada por status
+        status_counts: Dict[str, int] = {
+            status: count
+            for status, count in db.query(Payment.status, func.count(Payment.id))
+            .filter(*scope)
+            .group_by(Payment.status)
+        }
 
-                if old_status == "pending" and new_status == "overdue":
-                    changes["pending_to_overdue"] += 1
+        changed_rows = [*overdue_rows, *other_rows]
+        if changed_rows:
+            # UPDATE em lote não passa pelos listeners do ORM: manter rollups e cache
+            keys: set = set()
+            for row in changed_rows:
+                keys |= MonthlyRollupService.keys_for_row(*row)
+            MonthlyRollupService.refresh(db, keys)
+            mark_users_dirty(db, {row.user_id for row in changed_rows})
 
-            # Contabilizar
-            key = f"total_{new_status}"
-            changes[key] = changes.get(key, 0) + 1
+        if commit:
+            db.commit()
 
-        db.commit()
+        changes = {
+            "pending_to_overdue": len(overdue_rows),
+            "total_overdue": status_counts.get("overdue", 0),
+            "total_pending": status_counts.get("pending", 0),
+            "total_paid": status_counts.get("paid", 0),
+            "total_partial": status_counts.get("partial", 0),
+        }
 
         return changes
 
@@ -275,16 +283,30 @@ class BackgroundTasksService:
         """
         results: dict = {}
 
+        # Todas as etapas na mesma transação: um único commit ao final
+
         # Atualizar status de pagamentos
-        results["payment_status_changes"] = cls.update_payment_statuses_automatically(db, user_id)
+        with BACKGROUND_STAGE_SECONDS.labels("payment_status").time():
+            results["payment_status_changes"] = cls.update_payment_statuses_automatically(
+                db, user_id, commit=False
+            )
 
         # Processar notificações de contratos vencendo
-        results["contract_notifications"] = cls.process_contract_expiring_notifications(db, user_id)
+        with BACKGROUND_STAGE_SECONDS.labels("contract_notifications").time():
+            results["contract_notifications"] = cls.process_contract_expiring_notifications(
+                db, user_id, commit=False
+            )
 
         # Processar lembretes de pagamento
-        results["payment_reminders"] = cls.process_payment_reminders(db, user_id)
+        with BACKGROUND_STAGE_SECONDS.labels("payment_reminders").time():
+            results["payment_reminders"] = cls.process_payment_reminders(db, user_id, commit=False)
 
         # Processar notificações de atraso
-        results["overdue_notifications"] = cls.process_overdue_payment_notifications(db, user_id)
+        with BACKGROUND_STAGE_SECONDS.labels("overdue_notifications").time():
+            results["overdue_notifications"] = cls.process_overdue_payment_notifications(
+                db, user_id, commit=False
+            )
+
+        db.commit()
 
         return results
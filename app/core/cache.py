@@ -0,0 +1,191 @@
+"""
+Cache de respostas com backends plugáveis
+
+- memory: LRU + TTL em memória do processo (padrão)
+- redis: qualquer servidor compatível com Redis (requer o pacote `redis`)
+- none: cache desabilitado
+
+Cada usuário tem um contador de versão dos dados. A versão faz parte da chave
+das entradas, então incrementá-la após uma escrita torna todas as entradas
+anteriores do usuário inalcançáveis imediatamente.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+class CacheBackend:
+    """Interface dos backends de cache"""
+
+    # Backends remotos fazem I/O de rede e devem ser chamados fora do event loop
+    is_remote = False
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def get_version(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    def bump_version(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Backend que nunca armazena nada (cache desabilitado)"""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        pass
+
+    def get_version(self, user_id: int) -> int:
+        return 0
+
+    def bump_version(self, user_id: int) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """LRU com expiração por TTL, seguro para uso entre threads"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, user_id: int) -> int:
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def bump_version(self, user_id: int) -> int:
+        with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+            return version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisCache(CacheBackend):
+    """Backend compatível com Redis (valores serializados em JSON)"""
+
+    is_remote = True
+
+    def __init__(self, url: str, prefix: str = "imobly:cache:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requer o pacote 'redis' (pip install redis)"
+            ) from exc
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=1)
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self.prefix}version:{user_id}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=ttl)
+
+    def get_version(self, user_id: int) -> int:
+        raw = self.client.get(self._version_key(user_id))
+        return int(raw) if raw is not None else 0
+
+    def bump_version(self, user_id: int) -> int:
+        return int(self.client.incr(self._version_key(user_id)))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+def create_cache_backend(name: Optional[str] = None) -> CacheBackend:
+    """Cria o backend configurado em settings.CACHE_BACKEND"""
+    name = (name or settings.CACHE_BACKEND).lower()
+
+    if name == "memory":
+        return InMemoryCache(max_entries=settings.CACHE_MAX_ENTRIES)
+    if name == "redis":
+        return RedisCache(settings.REDIS_URL)
+    if name == "none":
+        return NullCache()
+
+    raise ValueError(f"CACHE_BACKEND inválido: {name} (use memory, redis ou none)")
+
+
+class ResponseCache:
+    """Cache de respostas por (user_id, endpoint, parâmetros) com versão por usuário"""
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def build_key(user_id: int, version: int, endpoint: str, params: Dict[str, Any]) -> str:
+        encoded = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        return f"{endpoint}:{user_id}:v{version}:{encoded}"
+
+    def get(self, user_id: int, endpoint: str, params: Dict[str, Any]) -> tuple:
+        """
+        Busca uma resposta em cache
+
+        Returns:
+            Tupla (chave, valor); valor é None em caso de miss. A chave já
+            contém a versão lida, então um set posterior nunca sobrescreve
+            dados de uma versão mais nova.
+        """
+        version = self.backend.get_version(user_id)
+        key = self.build_key(user_id, version, endpoint, params)
+        return key, self.backend.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Torna obsoletas todas as entradas do usuário"""
+        self.backend.bump_version(user_id)
+
+    def clear(self) -> None:
+        self.backend.clear()
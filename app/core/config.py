@@ -50,6 +50,24 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30min
 
+    # Schema no startup: check (só confere a revisão Alembic), skip, upgrade ou create_all
+    # Em produção aplique as migrations antes do deploy: python -m app.db.schema upgrade
+    DB_STARTUP_SCHEMA_MODE: str = os.getenv("DB_STARTUP_SCHEMA_MODE", "check").lower()
+
+    # Réplicas de leitura (opcional): URLs separadas por vírgula. Rotas GET de
+    # listagem, detalhe e dashboard usam uma réplica com atraso de replicação até
+    # DB_READ_MAX_LAG_SECONDS; sem réplica disponível, leem do primário.
+    # Mantido como str: o pydantic-settings lê campos List[str] do ambiente como JSON
+    DATABASE_READ_URLS: str = (
+        os.getenv("DATABASE_READ_URLS") or os.getenv("DATABASE_READ_URL") or ""
+    )
+    DB_READ_MAX_LAG_SECONDS: float = float(os.getenv("DB_READ_MAX_LAG_SECONDS", "5"))
+    DB_READ_LAG_CHECK_SECONDS: float = float(os.getenv("DB_READ_LAG_CHECK_SECONDS", "5"))
+
+    @property
+    def database_read_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_READ_URLS.split(",") if url.strip()]
+
     # Security Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
     ALGORITHM: str = "HS256"
@@ -75,8 +93,73 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     ALLOWED_EXTENSIONS: set = {".jpg", ".jpeg", ".png", ".pdf", ".doc", ".docx"}
 
-    # Redis Settings (desabilitado - não sendo usado)
-    # REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    # Cache Settings (respostas do dashboard)
+    # CACHE_BACKEND: memory (LRU + TTL no processo), redis ou none
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+
+    # Redis Settings (usado apenas com CACHE_BACKEND=redis)
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+    # Worker Settings (python -m app.worker)
+    WORKER_INTERVAL_SECONDS: int = int(os.getenv("WORKER_INTERVAL_SECONDS", "3600"))
+    WORKER_CHUNK_SIZE: int = int(os.getenv("WORKER_CHUNK_SIZE", "200"))
+
+    # Job Queue Settings (tabela jobs, app.core.job_queue)
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    JOB_RETRY_BASE_SECONDS: int = int(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+    JOB_RETRY_MAX_SECONDS: int = int(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "5"))
+
+    # Scheduler Settings (jobs periódicos com advisory lock, app.core.scheduler)
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    SCHEDULER_TICK_SECONDS: float = float(os.getenv("SCHEDULER_TICK_SECONDS", "60"))
+
+    # Logging Settings (app.core.logger)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()  # json | text
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")  # ex.: app.src.payments=DEBUG,sqlalchemy=WARNING
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+    # Query Stats Settings (app.db.instrumentation)
+    # Headers X-DB-Query-Count/X-DB-Time-Ms e aviso de N+1 no log (padrão: só em DEBUG)
+    DB_QUERY_STATS: bool = os.getenv("DB_QUERY_STATS", str(DEBUG)).lower() == "true"
+    # Repetições do mesmo formato de instrução em uma requisição para considerar N+1
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+    # Slow Query Log Settings (app.db.slow_queries, opcional)
+    SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    # Fração dos SELECTs lentos com EXPLAIN (ANALYZE, BUFFERS) capturado
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(
+        os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1")
+    )
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.jsonl")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", "10485760"))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+
+    # Metrics Settings (app.core.metrics)
+    # GET /metrics no formato do Prometheus (restrinja o acesso no proxy/rede)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Server-Timing Settings (app.core.server_timing)
+    # Header em todas as respostas (padrão: só em DEBUG)
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", str(DEBUG)).lower() == "true"
+    # Com o header desligado, requisições com X-Server-Timing-Token igual a este valor o recebem
+    SERVER_TIMING_TOKEN: str = os.getenv("SERVER_TIMING_TOKEN", "")
+
+    # Tracing Settings (app.core.tracing, requer os pacotes do OpenTelemetry)
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_SERVICE_NAME: str = os.getenv("TRACING_SERVICE_NAME", "imovel-gestao-api")
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "otlp")  # otlp | file
+    TRACING_OTLP_ENDPOINT: str = os.getenv(
+        "TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"
+    )
+    TRACING_FILE: str = os.getenv("TRACING_FILE", "logs/traces.jsonl")
+    # Fração dos traces gravados (decisão do chamador prevalece quando vier no traceparent)
+    TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", "0.1"))
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,407 @@
+"""
+Fila de jobs no Postgres (sem broker externo)
+
+Os jobs ficam na tabela `jobs` e são distribuídos entre quantos workers
+existirem: o lease usa `FOR UPDATE SKIP LOCKED`, de modo que dois workers nunca
+pegam o mesmo job e nenhum espera pelo lock do outro.
+
+Ciclo de vida:
+    queued -> running (lease com prazo, renovado por heartbeat)
+           -> done
+           -> queued novamente (falha, com backoff exponencial)
+           -> dead (tentativas esgotadas: dead-letter, reenfileirável)
+
+Uso:
+    @job_handler("emails.send")
+    def send_email(db, payload): ...
+
+    JobQueue.enqueue(db, "emails.send", {"to": "..."})
+    JobQueue.work_once(db, worker_id="worker-1")
+"""
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.src.jobs.models import JOB_DEAD, JOB_DONE, JOB_QUEUED, JOB_RUNNING, Job
+
+logger = get_logger(__name__)
+
+
+# Handlers registrados: nome do job -> função(db, payload)
+JOB_HANDLERS: Dict[str, Callable[[Session, dict], Any]] = {}
+
+
+def job_handler(name: str):
+    """Registra a função como handler dos jobs com este nome"""
+
+    def decorator(func: Callable[[Session, dict], Any]):
+        JOB_HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+def default_worker_id() -> str:
+    """Identificador do worker: host e pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Operações da fila de jobs"""
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        name: str,
+        payload: Optional[dict] = None,
+        queue: str = "default",
+        run_at: Optional[datetime] = None,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        dedupe_key: Optional[str] = None,
+        commit: bool = True,
+    ) -> Optional[int]:
+        """
+        Enfileira um job
+
+        Args:
+            db: Sessão do banco
+            name: Nome do handler
+            payload: Dados JSON passados ao handler
+            queue: Nome da fila
+            run_at: Executar a partir de (padrão: agora)
+            max_attempts: Tentativas antes do dead-letter
+            dedupe_key: Chave única; um job com a mesma chave não é duplicado
+            commit: Fazer commit ao final
+
+        Returns:
+            ID do job criado ou None se a dedupe_key já existia
+        """
+        now = datetime.utcnow()
+        job_id = db.execute(
+            insert(Job)
+            .values(
+                queue=queue,
+                name=name,
+                payload=payload or {},
+                status=JOB_QUEUED,
+                attempts=0,
+                max_attempts=max_attempts,
+                run_at=run_at or now,
+                dedupe_key=dedupe_key,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=["dedupe_key"])
+            .returning(Job.id)
+        ).scalar()
+
+        if commit:
+            db.commit()
+
+        return job_id
+
+    @staticmethod
+    def lease(
+        db: Session,
+        worker_id: str,
+        queue: str = "default",
+        limit: int = 1,
+        lease_seconds: int = settings.JOB_LEASE_SECONDS,
+    ) -> List[Job]:
+        """
+        Reserva até `limit` jobs prontos para este worker (commit imediato)
+
+        Pega jobs enfileirados com run_at vencido e jobs em execução cujo lease
+        expirou (worker que caiu). Linhas travadas por outro worker são puladas.
+
+        Returns:
+            Jobs reservados (status running, attempts já incrementado)
+        """
+        now = datetime.utcnow()
+
+        # Leases expirados sem tentativas restantes vão direto para o dead-letter
+        db.execute(
+            update(Job)
+            .where(
+                Job.queue == queue,
+                Job.status == JOB_RUNNING,
+                Job.locked_until < now,
+                Job.attempts >= Job.max_attempts,
+            )
+            .values(
+                status=JOB_DEAD,
+                locked_by=None,
+                locked_until=None,
+                last_error="Lease expirado sem tentativas restantes",
+                finished_at=now,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        candidates = (
+            select(Job.id)
+            .where(
+                Job.queue == queue,
+                or_(
+                    and_(Job.status == JOB_QUEUED, Job.run_at <= now),
+                    and_(
+                        Job.status == JOB_RUNNING,
+                        Job.locked_until < now,
+                        Job.attempts < Job.max_attempts,
+                    ),
+                ),
+            )
+            .order_by(Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        leased_ids = (
+            db.execute(
+                update(Job)
+                .where(Job.id.in_(candidates))
+                .values(
+                    status=JOB_RUNNING,
+                    attempts=Job.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=lease_seconds),
+                    updated_at=now,
+                )
+                .returning(Job.id)
+                .execution_options(synchronize_session=False)
+            )
+            .scalars()
+            .all()
+        )
+        db.commit()
+
+        if not leased_ids:
+            return []
+
+        return db.query(Job).filter(Job.id.in_(leased_ids)).order_by(Job.run_at, Job.id).all()
+
+    @staticmethod
+    def heartbeat(
+        db: Session,
+        job_id: int,
+        worker_id: str,
+        lease_seconds: int = settings.JOB_LEASE_SECONDS,
+    ) -> bool:
+        """
+        Renova o lease de um job em execução (commit imediato)
+
+        Returns:
+            False se o job não pertence mais a este worker
+        """
+        now = datetime.utcnow()
+        renewed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == JOB_RUNNING)
+            .values(locked_until=now + timedelta(seconds=lease_seconds), updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return renewed > 0
+
+    @staticmethod
+    def complete(db: Session, job_id: int, worker_id: str, commit: bool = True) -> bool:
+        """Marca o job como concluído (se o lease ainda for deste worker)"""
+        now = datetime.utcnow()
+        updated = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == JOB_RUNNING)
+            .values(
+                status=JOB_DONE,
+                locked_by=None,
+                locked_until=None,
+                last_error=None,
+                finished_at=now,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        if commit:
+            db.commit()
+
+        return updated > 0
+
+    @staticmethod
+    def retry_delay(attempts: int) -> int:
+        """Backoff exponencial em segundos após a tentativa `attempts` (1, 2, 3...)"""
+        delay = settings.JOB_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+        return int(min(delay, settings.JOB_RETRY_MAX_SECONDS))
+
+    @classmethod
+    def fail(cls, db: Session, job: Job, worker_id: str, error: str) -> str:
+        """
+        Registra a falha de um job: reagenda com backoff ou move para o dead-letter
+
+        Returns:
+            Novo status do job (queued ou dead)
+        """
+        now = datetime.utcnow()
+        attempts = int(job.attempts)
+        exhausted = attempts >= int(job.max_attempts)
+        status = JOB_DEAD if exhausted else JOB_QUEUED
+        values: Dict[str, Any] = {
+            "status": status,
+            "locked_by": None,
+            "locked_until": None,
+            "last_error": error,
+            "updated_at": now,
+        }
+
+        if exhausted:
+            values["finished_at"] = now
+        else:
+            values["run_at"] = now + timedelta(seconds=cls.retry_delay(attempts))
+
+        db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id, Job.status == JOB_RUNNING)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        return status
+
+    @staticmethod
+    def requeue_dead(db: Session, job_id: int) -> bool:
+        """Devolve um job do dead-letter para a fila, zerando as tentativas"""
+        now = datetime.utcnow()
+        updated = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JOB_DEAD)
+            .values(status=JOB_QUEUED, attempts=0, run_at=now, finished_at=None, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return updated > 0
+
+    @staticmethod
+    def count_by_status(db: Session, queue: Optional[str] = None) -> Dict[str, int]:
+        """Quantidade de jobs por status (uma consulta agrupada)"""
+        query = db.query(Job.status, func.count(Job.id))
+        if queue is not None:
+            query = query.filter(Job.queue == queue)
+        return {str(status): int(count) for status, count in query.group_by(Job.status)}
+
+    @classmethod
+    def execute(
+        cls,
+        db: Session,
+        job: Job,
+        worker_id: str,
+        heartbeat_session_factory: Optional[Callable[[], Session]] = None,
+        lease_seconds: int = settings.JOB_LEASE_SECONDS,
+    ) -> str:
+        """
+        Executa um job reservado na transação da sessão e registra o resultado
+
+        O handler não deve fazer commit: o trabalho e a conclusão do job são
+        gravados juntos. Com `heartbeat_session_factory`, uma thread renova o
+        lease (em outra conexão) enquanto o handler roda.
+
+        Returns:
+            Status final do job (done, queued ou dead)
+        """
+        job_id, name, payload = int(job.id), str(job.name), dict(job.payload or {})
+        handler = JOB_HANDLERS.get(name)
+        if handler is None:
+            return cls.fail(db, job, worker_id, f"Handler não registrado: {name}")
+
+        heartbeat = None
+        if heartbeat_session_factory is not None:
+            heartbeat = _HeartbeatThread(
+                heartbeat_session_factory, job_id, worker_id, lease_seconds
+            )
+            heartbeat.start()
+
+        try:
+            handler(db, payload)
+            if not cls.complete(db, job_id, worker_id, commit=False):
+                # Lease perdido (expirou e outro worker assumiu): descartar o trabalho
+                db.rollback()
+                logger.warning("Job perdeu o lease; resultado descartado", extra={"job_id": job_id})
+                return JOB_RUNNING
+            db.commit()
+            return JOB_DONE
+        except Exception:
+            db.rollback()
+            return cls.fail(db, job, worker_id, traceback.format_exc(limit=5))
+        finally:
+            if heartbeat is not None:
+                heartbeat.stop()
+
+    @classmethod
+    def work_once(
+        cls,
+        db: Session,
+        worker_id: str,
+        queue: str = "default",
+        limit: int = 1,
+        heartbeat_session_factory: Optional[Callable[[], Session]] = None,
+        lease_seconds: int = settings.JOB_LEASE_SECONDS,
+    ) -> Dict[str, int]:
+        """
+        Reserva e executa um lote de jobs
+
+        Returns:
+            Contagem de jobs por status final
+        """
+        results: Dict[str, int] = {}
+        for job in cls.lease(db, worker_id, queue=queue, limit=limit, lease_seconds=lease_seconds):
+            status = cls.execute(
+                db,
+                job,
+                worker_id,
+                heartbeat_session_factory=heartbeat_session_factory,
+                lease_seconds=lease_seconds,
+            )
+            results[status] = results.get(status, 0) + 1
+        return results
+
+
+class _HeartbeatThread(threading.Thread):
+    """Renova o lease de um job a cada terço do prazo, em sessão própria"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        job_id: int,
+        worker_id: str,
+        lease_seconds: int,
+    ):
+        super().__init__(daemon=True)
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.lease_seconds / 3):
+            db = self.session_factory()
+            try:
+                if not JobQueue.heartbeat(db, self.job_id, self.worker_id, self.lease_seconds):
+                    return
+            except Exception:
+                logger.warning("Falha no heartbeat", extra={"job_id": self.job_id}, exc_info=True)
+            finally:
+                db.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join(timeout=5)
@@ -0,0 +1,170 @@
+"""
+Logging estruturado
+
+Cada linha é um objeto JSON (ou texto legível com LOG_FORMAT=text) com
+timestamp, nível, logger, mensagem, request_id e os campos passados em
+`extra`. O request_id vem do header X-Request-ID (ou é gerado) e acompanha
+todos os logs emitidos durante a requisição.
+
+Uso:
+    from app.core.logger import get_logger
+
+    logger = get_logger(__name__)
+    logger.info("Pagamento criado", extra={"payment_id": payment.id})
+
+Configuração (Settings / variáveis de ambiente):
+    LOG_LEVEL=INFO                  # nível raiz
+    LOG_FORMAT=json                 # json | text
+    LOG_LEVELS=app.src.payments=DEBUG,sqlalchemy.engine=WARNING
+    LOG_DEBUG_SAMPLE_RATE=0.1       # fração das requisições com logs DEBUG
+"""
+import json
+import logging
+import random
+import sys
+import uuid
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Atributos padrão do LogRecord (o resto veio de `extra`)
+_RESERVED_ATTRS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_request_id() -> Optional[str]:
+    """Request id da requisição em andamento (None fora de requisições)"""
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Adiciona o request_id atual a todos os registros"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Mantém apenas uma fração dos registros DEBUG
+
+    Dentro de uma requisição a decisão é determinística pelo request_id: ou
+    todos os logs DEBUG da requisição são mantidos, ou nenhum.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(rate, 1.0))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
+        if request_id:
+            return (zlib.crc32(request_id.encode()) % 10000) < self.rate * 10000
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legível para desenvolvimento, com os campos extras ao final"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        line = super().format(record)
+        extras = {
+            key: value
+            for key, value in record.__dict__.items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        }
+        if extras:
+            line += " " + json.dumps(extras, ensure_ascii=False, default=str)
+        return line
+
+
+def parse_logger_levels(spec: str) -> Dict[str, str]:
+    """'a=DEBUG,b.c=WARNING' -> {'a': 'DEBUG', 'b.c': 'WARNING'}"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(
+    level: str = settings.LOG_LEVEL,
+    fmt: str = settings.LOG_FORMAT,
+    logger_levels: str = settings.LOG_LEVELS,
+    debug_sample_rate: float = settings.LOG_DEBUG_SAMPLE_RATE,
+) -> None:
+    """
+    Configura o logger raiz (idempotente: substitui o handler instalado antes)
+
+    Args:
+        level: Nível do logger raiz
+        fmt: json ou text
+        logger_levels: Níveis por logger ("nome=NIVEL,...")
+        debug_sample_rate: Fração (0-1) dos registros DEBUG mantidos
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.set_name("app")
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if existing.get_name() == "app":
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    for name, logger_level in parse_logger_levels(logger_levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
@@ -0,0 +1,255 @@
+"""
+Métricas no formato de exposição do Prometheus (GET /metrics)
+
+Implementação mínima, sem dependências: contadores, gauges e histogramas com
+labels. Cada combinação de labels é criada uma vez e reaproveitada (`labels`
+devolve o mesmo filho); observar um valor é uma busca binária no bucket e dois
+incrementos, sem lock (o GIL protege os incrementos de int/float). Valores
+lidos do ambiente no momento da coleta (ex.: pool do SQLAlchemy) vêm de
+coletores registrados com `register_collector`.
+
+Uso:
+    REQUESTS = Counter("app_jobs_total", "Jobs executados", ["status"])
+    REQUESTS.labels("done").inc()
+
+    with BACKGROUND_STAGE_SECONDS.labels("payment_status").time():
+        ...
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Amostra de um coletor: (nome, labels, valor)
+Sample = Tuple[str, Dict[str, str], float]
+
+# Índice = status_code // 100 (strings prontas: nada é montado por requisição)
+STATUS_CLASSES = ("0xx", "1xx", "2xx", "3xx", "4xx", "5xx")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_ChildT = TypeVar("_ChildT")
+
+
+class _Metric(ABC, Generic[_ChildT]):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], _ChildT] = {}
+        REGISTRY.append(self)
+
+    @abstractmethod
+    def _new_child(self) -> _ChildT:
+        """Filho novo para uma combinação de labels"""
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Linhas da métrica no formato de exposição"""
+
+    def labels(self, *values: str) -> _ChildT:
+        """Filho para os valores de label (criado na primeira vez, depois reaproveitado)"""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+_ValueChildT = TypeVar("_ValueChildT", bound=_CounterChild)
+
+
+class _ValueMetric(_Metric[_ValueChildT]):
+    """Métrica de um valor por combinação de labels (contador ou gauge)"""
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for values, child in list(self._children.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+            )
+        return lines
+
+
+class Counter(_ValueMetric[_CounterChild]):
+    """Contador monotônico"""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_ValueMetric[_GaugeChild]):
+    """Valor que sobe e desce (ex.: requisições em andamento)"""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # último = +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric[_HistogramChild]):
+    """Distribuição em buckets cumulativos (latências, contagens por requisição)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        names = self.labelnames + ("le",)
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (float("inf"),), list(child.counts)):
+                cumulative += count
+                labels = _format_labels(names, values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: List[_Metric[Any]] = []
+
+# Coletores chamados a cada scrape: nome -> (tipo, ajuda, função que devolve amostras)
+COLLECTORS: Dict[str, Tuple[str, str, Callable[[], Iterable[Sample]]]] = {}
+
+
+def register_collector(name: str, kind: str, documentation: str):
+    """Registra a função como fonte de amostras lidas no momento da coleta"""
+
+    def decorator(func: Callable[[], Iterable[Sample]]):
+        COLLECTORS[name] = (kind, documentation, func)
+        return func
+
+    return decorator
+
+
+def render_metrics() -> str:
+    """Texto completo do /metrics"""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for name, (kind, documentation, func) in COLLECTORS.items():
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in func():
+            label_text = _format_labels(tuple(labels), tuple(labels.values()))
+            lines.append(f"{sample_name}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ==================== MÉTRICAS DA APLICAÇÃO ====================
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ["method", "route", "status_class"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requisições HTTP em andamento", ["method"]
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Instruções SQL por requisição",
+    ["method", "route"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Esperas por conexão do pool que passaram de DB_POOL_TIMEOUT (contadas no checkout)",
+)
+BACKGROUND_STAGE_SECONDS = Histogram(
+    "background_stage_duration_seconds",
+    "Duração das etapas das tarefas de background",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
@@ -3,9 +3,10 @@ Serviço para gerenciamento de notificações inteligentes
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.src.contracts.models import Contract
@@ -18,7 +19,211 @@ class NotificationService:
     """Serviço para criar e gerenciar notificações automaticamente"""
 
     @staticmethod
+    def build_idempotency_key(user_id: int, type: str, related_id: str, milestone: str) -> str:
+        """
+        Monta a chave de idempotência (user_id, type, related_id, marco do evento)
+
+        O marco identifica o evento notificado, não o momento da execução: o
+        aviso de 60 dias de um contrato tem a mesma chave nos três dias em que
+        pode ser disparado (59 a 61), e muda se a data de término mudar.
+
+        Args:
+            user_id: ID do usuário
+            type: Tipo de notificação
+            related_id: ID da entidade relacionada
+            milestone: Marco do evento (ex.: "60d:2025-12-31", "due_today:2025-06-05")
+
+        Returns:
+            Chave única da notificação para o evento
+        """
+        return f"{user_id}:{type}:{related_id}:{milestone}"
+
+    @staticmethod
+    def bulk_insert_notifications(db: Session, notifications: List[Dict[str, Any]]) -> int:
+        """
+        Insere várias notificações em uma instrução, ignorando duplicadas
+
+        Usa INSERT ... ON CONFLICT (idempotency_key) DO NOTHING, então execuções
+        concorrentes não geram notificações repetidas. Não faz commit.
+
+        Args:
+            db: Sessão do banco
+            notifications: Valores das notificações (ver build_notification_values)
+
+        Returns:
+            Número de notificações efetivamente inseridas
+        """
+        if not notifications:
+            return 0
+
+        statement = (
+            insert(Notification)
+            .values(notifications)
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])
+            .returning(Notification.id)
+        )
+        return len(db.execute(statement).all())
+
+    @classmethod
+    def build_notification_values(
+        cls,
+        user_id: int,
+        type: str,
+        title: str,
+        message: str,
+        priority: str = "medium",
+        action_required: bool = False,
+        related_id: Optional[str] = None,
+        related_type: Optional[str] = None,
+        milestone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Valores de uma notificação para bulk_insert_notifications"""
+        now = datetime.utcnow()
+        return {
+            "id": str(uuid4()),
+            "user_id": user_id,
+            "type": type,
+            "title": title,
+            "message": message,
+            "date": now,
+            "priority": priority,
+            "read_status": False,
+            "action_required": action_required,
+            "related_id": related_id,
+            "related_type": related_type,
+            "idempotency_key": cls.build_idempotency_key(user_id, type, related_id, milestone)
+            if related_id is not None and milestone is not None
+            else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    @staticmethod
+    def get_tenant_name(db: Session, tenant_id: int) -> str:
+        """Nome do inquilino para as mensagens"""
+        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+        return str(tenant.name) if tenant else "Inquilino desconhecido"
+
+    @staticmethod
+    def get_tenant_names(db: Session, tenant_ids: Iterable[int]) -> Dict[int, str]:
+        """Nomes de vários inquilinos em uma única consulta"""
+        ids = set(tenant_ids)
+        if not ids:
+            return {}
+        rows = db.query(Tenant.id, Tenant.name).filter(Tenant.id.in_(ids))
+        return {int(tenant_id): str(name) for tenant_id, name in rows}
+
+    # ==================== CRIAÇÃO EM LOTE ====================
+
+    @classmethod
+    def create_notifications(
+        cls, db: Session, notifications: List[Dict[str, Any]], commit: bool = True
+    ) -> int:
+        """
+        Cria várias notificações em uma instrução e um único commit
+
+        Args:
+            db: Sessão do banco
+            notifications: Campos de cada notificação (ex.: contract_expiring_values)
+            commit: Fazer commit ao final (False para compor uma transação maior)
+
+        Returns:
+            Número de notificações inseridas (eventos já notificados são ignorados)
+        """
+        created = cls.bulk_insert_notifications(
+            db, [cls.build_notification_values(**fields) for fields in notifications]
+        )
+        if commit:
+            db.commit()
+        return created
+
+    @classmethod
+    def create_contract_expiring_notifications(
+        cls, db: Session, items: List[Tuple[Contract, int]], commit: bool = True
+    ) -> int:
+        """
+        Cria notificações de contratos vencendo em lote
+
+        Args:
+            db: Sessão do banco
+            items: Pares (contrato, dias até o vencimento)
+            commit: Fazer commit ao final
+
+        Returns:
+            Número de notificações inseridas
+        """
+        names = cls.get_tenant_names(db, (int(contract.tenant_id) for contract, _ in items))
+        return cls.create_notifications(
+            db,
+            [
+                cls.contract_expiring_values(
+                    contract, days, names.get(int(contract.tenant_id), "Inquilino desconhecido")
+                )
+                for contract, days in items
+            ],
+            commit=commit,
+        )
+
+    @classmethod
+    def create_payment_reminder_notifications(
+        cls, db: Session, items: List[Tuple[Payment, int]], commit: bool = True
+    ) -> int:
+        """
+        Cria lembretes de pagamento em lote
+
+        Args:
+            db: Sessão do banco
+            items: Pares (pagamento, dias até o vencimento)
+            commit: Fazer commit ao final
+
+        Returns:
+            Número de notificações inseridas
+        """
+        names = cls.get_tenant_names(db, (int(payment.tenant_id) for payment, _ in items))
+        return cls.create_notifications(
+            db,
+            [
+                cls.payment_reminder_values(
+                    payment, days, names.get(int(payment.tenant_id), "Inquilino desconhecido")
+                )
+                for payment, days in items
+            ],
+            commit=commit,
+        )
+
+    @classmethod
+    def create_payment_overdue_notifications(
+        cls, db: Session, items: List[Tuple[Payment, int, Decimal]], commit: bool = True
+    ) -> int:
+        """
+        Cria notificações de pagamentos atrasados em lote
+
+        Args:
+            db: Sessão do banco
+            items: Tuplas (pagamento, dias de atraso, valor total com multa e juros)
+            commit: Fazer commit ao final
+
+        Returns:
+            Número de notificações inseridas
+        """
+        names = cls.get_tenant_names(db, (int(payment.tenant_id) for payment, _, _ in items))
+        return cls.create_notifications(
+            db,
+            [
+                cls.payment_overdue_values(
+                    payment,
+                    days,
+                    total_amount,
+                    names.get(int(payment.tenant_id), "Inquilino desconhecido"),
+                )
+                for payment, days, total_amount in items
+            ],
+            commit=commit,
+        )
+
+    @classmethod
     def create_notification(
+        cls,
         db: Session,
         user_id: int,
         type: str,
@@ -28,6 +233,7 @@ class NotificationService:
         action_required: bool = False,
         related_id: Optional[str] = None,
         related_type: Optional[str] = None,
+        milestone: Optional[str] = None,
     ) -> Notification:
         """
         Cria uma nova notificação
@@ -42,29 +248,31 @@ class NotificationService:
             action_required: Se requer ação
             related_id: ID relacionado
             related_type: Tipo de entidade relacionada
+            milestone: Marco do evento (define a chave de idempotência)
 
         Returns:
-            Notificação criada
+            Notificação criada, ou a já existente se o evento já foi notificado
         """
-        notification = Notification(
-            id=str(uuid4()),
-            user_id=user_id,
-            type=type,
-            title=title,
-            message=message,
-            date=datetime.utcnow(),
+        values = cls.build_notification_values(
+            user_id,
+            type,
+            title,
+            message,
             priority=priority,
-            read_status=False,
             action_required=action_required,
             related_id=related_id,
             related_type=related_type,
+            milestone=milestone,
         )
-
-        db.add(notification)
+        # Mesmo INSERT ... ON CONFLICT DO NOTHING do lote: evento repetido não é erro
+        cls.bulk_insert_notifications(db, [values])
         db.commit()
-        db.refresh(notification)
 
-        return notification
+        key = values["idempotency_key"]
+        query = db.query(Notification)
+        if key is not None:
+            return query.filter(Notification.idempotency_key == key).one()
+        return query.filter(Notification.id == values["id"]).one()
 
     @classmethod
     def create_contract_expiring_notification(
@@ -81,9 +289,16 @@ class NotificationService:
         Returns:
             Notificação criada
         """
-        tenant = db.query(Tenant).filter(Tenant.id == contract.tenant_id).first()
-        tenant_name = tenant.name if tenant else "Inquilino desconhecido"
+        tenant_name = cls.get_tenant_name(db, int(contract.tenant_id))
+        return cls.create_notification(
+            db=db, **cls.contract_expiring_values(contract, days_until_expiry, tenant_name)
+        )
 
+    @staticmethod
+    def contract_expiring_values(
+        contract: Contract, days_until_expiry: int, tenant_name: str
+    ) -> Dict[str, Any]:
+        """Campos da notificação de contrato vencendo"""
         title = f"Contrato vencendo em {days_until_expiry} dias"
         message = (
             f"O contrato '{contract.title}' do inquilino {tenant_name} "
@@ -93,17 +308,17 @@ class NotificationService:
 
         priority = "high" if days_until_expiry <= 30 else "medium"
 
-        return cls.create_notification(
-            db=db,
-            user_id=int(contract.user_id),
-            type="contract_expiring",
-            title=title,
-            message=message,
-            priority=priority,
-            action_required=True,
-            related_id=str(contract.id),
-            related_type="contract",
-        )
+        return {
+            "user_id": int(contract.user_id),
+            "type": "contract_expiring",
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "action_required": True,
+            "related_id": str(contract.id),
+            "related_type": "contract",
+            "milestone": f"{days_until_expiry}d:{contract.end_date.isoformat()}",
+        }
 
     @classmethod
     def create_payment_reminder_notification(
@@ -120,9 +335,16 @@ class NotificationService:
         Returns:
             Notificação criada
         """
-        tenant = db.query(Tenant).filter(Tenant.id == payment.tenant_id).first()
-        tenant_name = tenant.name if tenant else "Inquilino desconhecido"
+        tenant_name = cls.get_tenant_name(db, int(payment.tenant_id))
+        return cls.create_notification(
+            db=db, **cls.payment_reminder_values(payment, days_until_due, tenant_name)
+        )
 
+    @staticmethod
+    def payment_reminder_values(
+        payment: Payment, days_until_due: int, tenant_name: str
+    ) -> Dict[str, Any]:
+        """Campos da notificação de lembrete de pagamento"""
         if days_until_due == 0:
             title = f"Pagamento vence HOJE - {tenant_name}"
             message = (
@@ -140,17 +362,18 @@ class NotificationService:
             )
             priority = "medium"
 
-        return cls.create_notification(
-            db=db,
-            user_id=int(payment.user_id),
-            type="reminder",
-            title=title,
-            message=message,
-            priority=priority,
-            action_required=False,
-            related_id=str(payment.id),
-            related_type="payment",
-        )
+        kind = "due_today" if days_until_due == 0 else f"{days_until_due}d_before"
+        return {
+            "user_id": int(payment.user_id),
+            "type": "reminder",
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "action_required": False,
+            "related_id": str(payment.id),
+            "related_type": "payment",
+            "milestone": f"{kind}:{payment.due_date.isoformat()}",
+        }
 
     @classmethod
     def create_payment_overdue_notification(
@@ -168,9 +391,17 @@ class NotificationService:
         Returns:
             Notificação criada
         """
-        tenant = db.query(Tenant).filter(Tenant.id == payment.tenant_id).first()
-        tenant_name = tenant.name if tenant else "Inquilino desconhecido"
+        tenant_name = cls.get_tenant_name(db, int(payment.tenant_id))
+        return cls.create_notification(
+            db=db,
+            **cls.payment_overdue_values(payment, days_overdue, total_amount, tenant_name),
+        )
 
+    @staticmethod
+    def payment_overdue_values(
+        payment: Payment, days_overdue: int, total_amount: Decimal, tenant_name: str
+    ) -> Dict[str, Any]:
+        """Campos da notificação de pagamento atrasado"""
         title = f"Pagamento ATRASADO - {tenant_name} ({days_overdue} dias)"
         message = (
             f"O pagamento do inquilino {tenant_name} está atrasado há {days_overdue} dias. "
@@ -188,17 +419,17 @@ class NotificationService:
         else:
             priority = "medium"
 
-        return cls.create_notification(
-            db=db,
-            user_id=int(payment.user_id),
-            type="payment_overdue",
-            title=title,
-            message=message,
-            priority=priority,
-            action_required=True,
-            related_id=str(payment.id),
-            related_type="payment",
-        )
+        return {
+            "user_id": int(payment.user_id),
+            "type": "payment_overdue",
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "action_required": True,
+            "related_id": str(payment.id),
+            "related_type": "payment",
+            "milestone": f"{days_overdue}d_overdue:{payment.due_date.isoformat()}",
+        }
 
     @classmethod
     def create_payment_received_notification(cls, db: Session, payment: Payment) -> Notification:
@@ -212,8 +443,7 @@ class NotificationService:
         Returns:
             Notificação criada
         """
-        tenant = db.query(Tenant).filter(Tenant.id == payment.tenant_id).first()
-        tenant_name = tenant.name if tenant else "Inquilino desconhecido"
+        tenant_name = cls.get_tenant_name(db, int(payment.tenant_id))
 
         if payment.status == "paid":
             title = f"Pagamento recebido - {tenant_name}"
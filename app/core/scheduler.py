@@ -0,0 +1,216 @@
+"""
+Agendador de jobs periódicos com eleição de líder por advisory lock
+
+Todas as réplicas podem hospedar o agendador: a cada tick, cada job vencido é
+disputado com `pg_try_advisory_xact_lock` (chave derivada do nome do job), em
+uma transação mantida aberta em conexão própria enquanto o job roda. Apenas a
+réplica que obtém o lock executa; as demais seguem sem esperar. Por ser um lock
+de transação, funciona também atrás do PgBouncer em transaction pooling.
+
+O estado da última execução fica na tabela `scheduler_runs`, relida depois do
+lock, o que garante uma execução por período mesmo com réplicas fora de sincronia.
+
+Uso:
+    @scheduled_job("rollups.rebuild", interval_seconds=86400)
+    def rebuild(db): ...
+
+    Scheduler.run_pending(db, engine, worker_id="api-1")
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.src.jobs.models import SchedulerRun
+
+logger = get_logger(__name__)
+
+RUN_RAN = "ran"
+RUN_FAILED = "failed"
+RUN_NOT_DUE = "not_due"
+RUN_LOCKED = "locked"
+
+
+# Jobs registrados: nome -> (intervalo em segundos, função(db))
+SCHEDULED_JOBS: Dict[str, Tuple[int, Callable[[Session], object]]] = {}
+
+
+def scheduled_job(name: str, interval_seconds: int):
+    """Registra a função como job periódico executado a cada `interval_seconds`"""
+
+    def decorator(func: Callable[[Session], object]):
+        SCHEDULED_JOBS[name] = (interval_seconds, func)
+        return func
+
+    return decorator
+
+
+class Scheduler:
+    """Execução dos jobs periódicos vencidos, uma réplica por job"""
+
+    @staticmethod
+    def lock_key(name: str) -> int:
+        """Chave bigint estável do advisory lock para o nome do job"""
+        digest = hashlib.sha1(f"scheduler:{name}".encode()).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
+    @classmethod
+    def try_lock(cls, conn: Connection, name: str) -> bool:
+        """Tenta o advisory lock da transação atual (não bloqueia; liberado no fim dela)"""
+        query = text("SELECT pg_try_advisory_xact_lock(:key)")
+        return bool(conn.execute(query, {"key": cls.lock_key(name)}).scalar())
+
+    @staticmethod
+    def is_due(last_started_at: Optional[datetime], interval_seconds: int, now: datetime) -> bool:
+        """Vencido se nunca executou ou se o intervalo passou desde o último início"""
+        if last_started_at is None:
+            return True
+        return now >= last_started_at + timedelta(seconds=interval_seconds)
+
+    @staticmethod
+    def get_last_started(db: Session) -> Dict[str, Optional[datetime]]:
+        """Último início de cada job (uma consulta)"""
+        rows = db.query(SchedulerRun.name, SchedulerRun.last_started_at)
+        return {str(name): started_at for name, started_at in rows}
+
+    @staticmethod
+    def get_last_started_at(db: Session, name: str) -> Optional[datetime]:
+        """Último início de um job, lido do banco (None se nunca executou)"""
+        return db.scalar(select(SchedulerRun.last_started_at).where(SchedulerRun.name == name))
+
+    @staticmethod
+    def _record(db: Session, name: str, **values) -> None:
+        db.execute(
+            insert(SchedulerRun)
+            .values(name=name, updated_at=datetime.utcnow(), **values)
+            .on_conflict_do_update(
+                index_elements=["name"],
+                set_={**values, "updated_at": datetime.utcnow()},
+            )
+        )
+        db.commit()
+
+    @classmethod
+    def run_job(cls, db: Session, name: str, func: Callable[[Session], object], worker_id: str):
+        """Executa um job (já com o lock) e grava início, fim e duração"""
+        started_at = datetime.utcnow()
+        cls._record(
+            db,
+            name,
+            last_started_at=started_at,
+            last_status="running",
+            last_run_by=worker_id,
+        )
+
+        started = time.perf_counter()
+        status, error = "success", None
+        try:
+            func(db)
+        except Exception as exc:
+            db.rollback()
+            status, error = "failed", f"{type(exc).__name__}: {exc}"
+            logger.exception("Job agendado falhou", extra={"job": name})
+
+        db.execute(
+            update(SchedulerRun)
+            .where(SchedulerRun.name == name)
+            .values(
+                last_finished_at=datetime.utcnow(),
+                last_status=status,
+                last_error=error,
+                last_duration_ms=int((time.perf_counter() - started) * 1000),
+                run_count=SchedulerRun.run_count + 1,
+                updated_at=datetime.utcnow(),
+            )
+        )
+        db.commit()
+
+        return RUN_RAN if status == "success" else RUN_FAILED
+
+    @classmethod
+    def run_pending(
+        cls,
+        db: Session,
+        lock_engine: Engine,
+        worker_id: str,
+        jobs: Optional[Dict[str, Tuple[int, Callable[[Session], object]]]] = None,
+    ) -> Dict[str, str]:
+        """
+        Um tick do agendador: executa os jobs vencidos cujo lock for obtido
+
+        Os jobs que não estão vencidos não chegam a disputar o lock; um tick sem
+        trabalho custa uma consulta a scheduler_runs.
+
+        Args:
+            db: Sessão usada pelos jobs e pelo registro de execuções
+            lock_engine: Engine da conexão que segura os advisory locks
+            worker_id: Identificador desta réplica
+            jobs: Jobs a considerar (padrão: todos os registrados)
+
+        Returns:
+            Resultado por job: ran, failed, not_due ou locked
+        """
+        jobs = SCHEDULED_JOBS if jobs is None else jobs
+        now = datetime.utcnow()
+        last_started = cls.get_last_started(db)
+        db.commit()
+
+        results = {
+            name: RUN_NOT_DUE
+            for name, (interval, _) in jobs.items()
+            if not cls.is_due(last_started.get(name), interval, now)
+        }
+        due = [name for name in jobs if name not in results]
+        if not due:
+            return results
+
+        with lock_engine.connect() as lock_conn:
+            for name in due:
+                interval, func = jobs[name]
+                # A transação de lock_conn segura o lock até o fim do job
+                with lock_conn.begin():
+                    if not cls.try_lock(lock_conn, name):
+                        results[name] = RUN_LOCKED
+                        continue
+
+                    # Outra réplica pode ter executado entre a leitura e o lock
+                    last_started_at = cls.get_last_started_at(db, name)
+                    if cls.is_due(last_started_at, interval, datetime.utcnow()):
+                        results[name] = cls.run_job(db, name, func, worker_id)
+                    else:
+                        db.commit()
+                        results[name] = RUN_NOT_DUE
+
+        return results
+
+    @classmethod
+    def run_forever(
+        cls,
+        session_factory: Callable[[], Session],
+        lock_engine: Engine,
+        worker_id: str,
+        tick_seconds: float = settings.SCHEDULER_TICK_SECONDS,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """Loop do agendador (thread da API ou python -m app.worker --mode schedule)"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            db = session_factory()
+            try:
+                results = cls.run_pending(db, lock_engine, worker_id)
+                ran = {name: status for name, status in results.items() if status != RUN_NOT_DUE}
+                if ran:
+                    logger.info("Tick do agendador", extra={"worker_id": worker_id, "jobs": ran})
+            except Exception:
+                logger.exception("Erro no agendador", extra={"worker_id": worker_id})
+            finally:
+                db.close()
+            stop_event.wait(tick_seconds)
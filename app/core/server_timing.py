@@ -0,0 +1,145 @@
+"""
+Header Server-Timing: onde cada requisição gastou o tempo
+
+As ferramentas de desenvolvedor do navegador mostram, na aba de rede, o
+detalhamento enviado pelo servidor:
+
+    Server-Timing: db;dur=41.20, db_count;desc="6", serialize;dur=3.10,
+                   app;dur=12.80, total;dur=57.10
+
+    db         tempo nas instruções SQL (eventos das engines, app.db.instrumentation)
+    db_count   número de instruções
+    serialize  validação do response_model e jsonable_encoder (sem o SQL de lazy
+               loads disparados durante a serialização, que conta em db)
+    app        o restante: dependências, controllers, loops em Python
+    total      da entrada no middleware ao início da resposta
+
+Expõe detalhes internos: só é enviado com SERVER_TIMING_ENABLED=true (padrão em
+DEBUG) ou quando a requisição traz X-Server-Timing-Token igual a
+SERVER_TIMING_TOKEN.
+"""
+import hmac
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import fastapi.routing
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.instrumentation import QueryStats, get_query_stats
+
+SERVER_TIMING_HEADER = "Server-Timing"
+SERVER_TIMING_TOKEN_HEADER = "X-Server-Timing-Token"
+
+
+class RequestTimings:
+    """Tempos acumulados na requisição além dos de banco"""
+
+    __slots__ = ("serialize_ms",)
+
+    def __init__(self):
+        self.serialize_ms = 0.0
+
+
+request_timings_var: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def format_server_timing(
+    total_ms: float, stats: Optional[QueryStats], timings: RequestTimings
+) -> str:
+    """Valor do header (app = total menos banco e serialização, nunca negativo)"""
+    db_ms = stats.total_ms if stats is not None else 0.0
+    db_count = stats.count if stats is not None else 0
+    app_ms = max(total_ms - db_ms - timings.serialize_ms, 0.0)
+    return (
+        f'db;dur={db_ms:.2f}, db_count;desc="{db_count}", '
+        f"serialize;dur={timings.serialize_ms:.2f}, app;dur={app_ms:.2f}, total;dur={total_ms:.2f}"
+    )
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware ASGI que adiciona o Server-Timing ao início da resposta
+
+    Deve ficar dentro do middleware que abre track_queries (registrado antes
+    dele), para enxergar as estatísticas de banco da requisição.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def allowed(headers: Headers) -> bool:
+        if settings.SERVER_TIMING_ENABLED:
+            return True
+        token = settings.SERVER_TIMING_TOKEN
+        if not token:
+            return False
+        sent = headers.get(SERVER_TIMING_TOKEN_HEADER, "")
+        return hmac.compare_digest(sent.encode(), token.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        if not self.allowed(request_headers):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings_var.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    SERVER_TIMING_HEADER,
+                    format_server_timing(total_ms, get_query_stats(), timings),
+                )
+                # Sem Timing-Allow-Origin o navegador oculta os tempos de outra origem
+                origin = request_headers.get("origin")
+                if origin:
+                    headers["Timing-Allow-Origin"] = origin
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings_var.reset(token)
+
+
+_original_serialize_response = fastapi.routing.serialize_response
+
+
+async def _timed_serialize_response(*args, **kwargs):
+    timings = request_timings_var.get()
+    if timings is None:
+        return await _original_serialize_response(*args, **kwargs)
+
+    stats = get_query_stats()
+    db_before = stats.total_ms if stats is not None else 0.0
+    started = time.perf_counter()
+    try:
+        return await _original_serialize_response(*args, **kwargs)
+    finally:
+        db_during = (stats.total_ms if stats is not None else 0.0) - db_before
+        timings.serialize_ms += (time.perf_counter() - started) * 1000 - db_during
+
+
+def install_serialization_timing() -> None:
+    """
+    Mede a serialização das respostas (idempotente)
+
+    O FastAPI não tem gancho para isso: o handler das rotas chama
+    `fastapi.routing.serialize_response` pelo nome do módulo, que é substituído
+    por uma versão que acumula o tempo em RequestTimings. Fora do middleware
+    (sem RequestTimings no contexto) o custo é uma leitura de ContextVar.
+    """
+    fastapi.routing.serialize_response = _timed_serialize_response
@@ -0,0 +1,204 @@
+"""
+Tracing distribuído com OpenTelemetry (opcional)
+
+Com TRACING_ENABLED=true cada requisição vira um trace: span do FastAPI (rota),
+spans dos métodos dos controllers, repositórios e do NotificationService, um
+span filho por instrução SQL (todas as engines, inclusive réplicas) e um por
+gravação/remoção de upload. Os spans vão para um coletor OTLP
+(TRACING_EXPORTER=otlp) ou para um arquivo JSONL local (TRACING_EXPORTER=file)
+para análise offline; TRACING_SAMPLE_RATE define a fração dos traces gravados
+(respeitando a decisão do serviço que chamou, quando houver).
+
+Os pacotes do OpenTelemetry são opcionais (ver requirements.txt). Desligado, o
+custo é nenhum: as classes não são envolvidas e `span()` devolve um contexto
+vazio.
+
+Uso:
+    with span("upload.write", {"upload.folder": folder}):
+        ...
+
+Análise do arquivo:
+    jq -c '{name, start_time, end_time, trace: .context.trace_id}' logs/traces.jsonl
+"""
+import functools
+import importlib
+import inspect
+import os
+import pkgutil
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tracer ativo (None = tracing desligado)
+_tracer: Optional[Any] = None
+
+# Camadas com um span por método público: módulos de cada domínio em app.src
+TRACED_LAYERS = ("controller", "repository")
+
+# Rotas sem trace (alto volume, sem interesse)
+EXCLUDED_URLS = "health,metrics"
+
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Any]]:
+    """Span filho do span atual (não faz nada com o tracing desligado)"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def _wrap(func, qualname: str, bound: bool):
+    """Envolve a função em um span (nome da classe real quando é método de instância)"""
+
+    def span_name(args) -> str:
+        return f"{type(args[0]).__name__}.{func.__name__}" if bound and args else qualname
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with span(span_name(args)):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(span_name(args)):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_class_methods(cls: type) -> type:
+    """Um span por chamada de cada método público definido na classe (idempotente)"""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        qualname = f"{cls.__name__}.{name}"
+        if isinstance(attr, (staticmethod, classmethod)):
+            func = attr.__func__
+            if getattr(func, "__traced__", False) or inspect.isgeneratorfunction(func):
+                continue
+            wrapped = _wrap(func, qualname, bound=False)
+            wrapped.__traced__ = True
+            setattr(cls, name, type(attr)(wrapped))
+        elif inspect.isfunction(attr):
+            if getattr(attr, "__traced__", False) or inspect.isgeneratorfunction(attr):
+                continue
+            wrapped = _wrap(attr, qualname, bound=True)
+            wrapped.__traced__ = True
+            setattr(cls, name, wrapped)
+    return cls
+
+
+def traced_classes():
+    """Controllers e repositórios de app.src, repositórios base e NotificationService"""
+    import app.src
+    from app.core.notification_service import NotificationService
+    from app.db.base_repository import AsyncBaseRepository, BaseRepository
+
+    classes = [BaseRepository, AsyncBaseRepository, NotificationService]
+    for domain in pkgutil.iter_modules(app.src.__path__):
+        if domain.name == "auth":  # autenticação fica no serviço externo
+            continue
+        for layer in TRACED_LAYERS:
+            module_name = f"app.src.{domain.name}.{layer}"
+            try:
+                module = importlib.import_module(module_name)
+            except ModuleNotFoundError as exc:
+                if exc.name != module_name:
+                    raise
+                continue
+            classes.extend(
+                member
+                for member in vars(module).values()
+                if inspect.isclass(member) and member.__module__ == module_name
+            )
+    return classes
+
+
+def _require_opentelemetry():
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as exc:
+        raise RuntimeError(
+            "TRACING_ENABLED=true requer os pacotes do OpenTelemetry "
+            "(pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http "
+            "opentelemetry-instrumentation-fastapi opentelemetry-instrumentation-sqlalchemy)"
+        ) from exc
+    return trace, Resource, TracerProvider, ParentBased, TraceIdRatioBased
+
+
+def build_exporter(name: str = settings.TRACING_EXPORTER):
+    """Exportador de spans: otlp (coletor) ou file (JSONL local)"""
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    if name == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        directory = os.path.dirname(settings.TRACING_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return ConsoleSpanExporter(
+            service_name=settings.TRACING_SERVICE_NAME,
+            out=open(settings.TRACING_FILE, "a", encoding="utf-8"),
+            formatter=lambda finished: finished.to_json(indent=None) + "\n",
+        )
+    raise ValueError(f"TRACING_EXPORTER inválido: {name} (use otlp ou file)")
+
+
+def configure_tracing(app=None, sample_rate: float = settings.TRACING_SAMPLE_RATE):
+    """
+    Ativa o tracing: provider com amostragem, exportador, FastAPI (se `app`),
+    SQLAlchemy em todas as engines e spans nas camadas da aplicação
+
+    Chamar uma vez na inicialização (API ou worker), antes da primeira requisição.
+    """
+    global _tracer
+
+    trace, Resource, TracerProvider, ParentBased, TraceIdRatioBased = _require_opentelemetry()
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    from app.db.session import async_engine, engine, read_router
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(build_exporter()))
+    trace.set_tracer_provider(provider)
+
+    if app is not None:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=provider, excluded_urls=EXCLUDED_URLS
+        )
+
+    engines = [engine, async_engine.sync_engine]
+    for replica in read_router.replicas:
+        engines.extend([replica.engine, replica.async_engine.sync_engine])
+    SQLAlchemyInstrumentor().instrument(engines=engines, tracer_provider=provider)
+
+    for cls in traced_classes():
+        trace_class_methods(cls)
+
+    _tracer = provider.get_tracer("app")
+    logger.info(
+        "Tracing ativo",
+        extra={"exporter": settings.TRACING_EXPORTER, "sample_rate": sample_rate},
+    )
+    return provider
@@ -10,6 +10,7 @@ from typing import List, Literal
 from fastapi import HTTPException, UploadFile, status
 
 from app.core.config import settings
+from app.core.tracing import span
 
 
 class UploadService:
@@ -101,8 +102,9 @@ class UploadService:
         unique_filename = self._generate_unique_filename(file.filename)
         file_path = upload_folder / unique_filename
 
-        with open(file_path, "wb") as f:
-            f.write(content)
+        with span("upload.write", {"upload.folder": folder, "upload.size": file_size}):
+            with open(file_path, "wb") as f:
+                f.write(content)
 
         # Retornar informações do arquivo
         file_url = f"/uploads/{folder}/{unique_filename}"
@@ -163,10 +165,11 @@ class UploadService:
             relative_path = file_url.replace("/uploads/", "")
             file_path = self.base_upload_dir / relative_path
 
-            if file_path.exists() and file_path.is_file():
-                file_path.unlink()
-                return True
-            return False
+            with span("upload.delete", {"upload.path": relative_path}):
+                if file_path.exists() and file_path.is_file():
+                    file_path.unlink()
+                    return True
+                return False
         except Exception:
             return False
 
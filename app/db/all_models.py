@@ -2,7 +2,9 @@
 # NOTA: User removido - autenticação gerenciada pelo Auth-api (banco separado)
 from app.db.base import Base  # noqa
 from app.src.contracts.models import Contract  # noqa
+from app.src.dashboard.models import MonthlyRollup  # noqa
 from app.src.expenses.models import Expense  # noqa
+from app.src.jobs.models import Job, SchedulerRun  # noqa
 from app.src.notifications.models import Notification  # noqa
 from app.src.payments.models import Payment  # noqa
 from app.src.properties.models import Property  # noqa
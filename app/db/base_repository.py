@@ -1,17 +1,56 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Column, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.base import Base
+from app.db.pagination import keyset_page
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Escritas em lote e UPDATE ... RETURNING não passam por before_flush/after_flush:
+# quem mantém dados derivados (rollups, cache) se registra aqui. Listener(db,
+# model, rows), com rows = valores das colunas de cada linha afetada (antes e
+# depois, nos updates).
+BulkWriteListener = Callable[[Session, type, List[Mapping[str, Any]]], None]
+BULK_WRITE_LISTENERS: Dict[type, List[BulkWriteListener]] = {}
+
+
+def on_bulk_write(*models: type):
+    """Registra a função como listener das escritas em lote dos modelos informados"""
+
+    def decorator(func: BulkWriteListener):
+        for model in models:
+            BULK_WRITE_LISTENERS.setdefault(model, []).append(func)
+        return func
+
+    return decorator
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Colunas de FK das tabelas filhas removidas junto no delete_owned
+    # (equivalente ao cascade="all, delete-orphan" do relationship)
+    cascade_delete: Sequence[Column] = ()
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -27,6 +66,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_multi_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Página por cursor ordenada por id (ver app.db.pagination)"""
+        return keyset_page(db.query(self.model), [self.model.id], cursor, limit)
+
     def create(self, db: Session, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
         """Create a new record.
 
@@ -60,6 +105,101 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj  # type: ignore[no-any-return]
 
+    def update_returning(
+        self,
+        db: Session,
+        id: Any,
+        user_id: int,
+        values: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
+    ) -> Optional[ModelType]:
+        """
+        Atualiza um registro do usuário em uma única instrução
+
+        UPDATE ... WHERE id = :id AND user_id = :user_id RETURNING *: a checagem
+        de dono, a escrita e a leitura do resultado em uma ida ao banco. Os
+        valores anteriores vêm de um self-join na mesma instrução, para os
+        listeners de on_bulk_write.
+
+        Args:
+            db: Sessão do banco
+            id: ID do registro
+            user_id: Dono do registro (multi-tenancy)
+            values: Schema (apenas campos enviados) ou dict com os campos a alterar
+            commit: Fazer commit ao final (False para compor uma transação maior)
+
+        Returns:
+            Registro atualizado, ou None se não existe ou é de outro usuário
+        """
+        update_data = values if isinstance(values, dict) else values.model_dump(exclude_unset=True)
+        table = self.model.__table__
+        if not update_data:
+            return (
+                db.query(self.model)
+                .filter(self.model.id == id, self.model.user_id == user_id)
+                .first()
+            )
+
+        previous = (
+            select(table)
+            .where(table.c.id == id, table.c.user_id == user_id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        statement = (
+            update(self.model)
+            .where(self.model.id == previous.c.id)
+            .values(**update_data)
+            .returning(self.model, *previous.c)
+            .execution_options(synchronize_session="fetch")
+        )
+        row = db.execute(statement).first()
+        if row is None:
+            return None
+
+        db_obj = row[0]
+        after = self._row_values(db_obj)
+        before = dict(zip([column.key for column in previous.c], row[1:]))
+        self._notify_bulk_write(db, [before, after])
+        self._finish(db, commit, [(db_obj, after)])
+        return db_obj
+
+    def delete_owned(self, db: Session, id: Any, user_id: int, commit: bool = True) -> bool:
+        """
+        Remove um registro do usuário em uma única instrução, sem carregá-lo
+
+        DELETE ... WHERE id = :id AND user_id = :user_id RETURNING *; as tabelas
+        filhas de `cascade_delete` são removidas na mesma instrução (CTEs).
+
+        Args:
+            db: Sessão do banco
+            id: ID do registro
+            user_id: Dono do registro (multi-tenancy)
+            commit: Fazer commit ao final (False para compor uma transação maior)
+
+        Returns:
+            True se removido; False se não existe ou é de outro usuário
+        """
+        table = self.model.__table__
+        deleted = (
+            delete(table)
+            .where(table.c.id == id, table.c.user_id == user_id)
+            .returning(*table.columns)
+            .cte("deleted")
+        )
+        statement = select(deleted)
+        for index, column in enumerate(self.cascade_delete):
+            children = delete(column.table).where(column.in_(select(deleted.c.id)))
+            statement = statement.add_cte(children.cte(f"children_{index}"))
+
+        rows = [dict(row) for row in db.execute(statement).mappings()]
+        if not rows:
+            return False
+
+        self._notify_bulk_write(db, rows)
+        self._finish(db, commit)
+        return True
+
     def delete(self, db: Session, *, id: int) -> ModelType:  # type: ignore[return]
         obj = db.query(self.model).get(id)
         if obj is None:
@@ -67,3 +207,178 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+
+    # ==================== OPERAÇÕES EM LOTE ====================
+
+    def _as_values(self, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> Dict[str, Any]:
+        return obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
+
+    def _row_values(self, row: Any) -> Dict[str, Any]:
+        return {column.key: getattr(row, column.key) for column in self.model.__table__.columns}
+
+    def _notify_bulk_write(self, db: Session, rows: List[Mapping[str, Any]]) -> None:
+        if rows:
+            for listener in BULK_WRITE_LISTENERS.get(self.model, ()):
+                listener(db, self.model, rows)
+
+    def _finish(
+        self,
+        db: Session,
+        commit: bool,
+        loaded: Sequence[Tuple[ModelType, Dict[str, Any]]] = (),
+    ) -> None:
+        # commit=False: unidade de trabalho do chamador (ele faz commit ou rollback)
+        if commit:
+            db.commit()
+            # Os valores vieram do RETURNING: evita o SELECT de refresh ao serializar
+            for db_obj, values in loaded:
+                for key, value in values.items():
+                    set_committed_value(db_obj, key, value)
+
+    def bulk_create(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Cria vários registros com um INSERT multi-linha ... RETURNING
+
+        Args:
+            db: Sessão do banco
+            objs_in: Schemas ou dicts, um por registro
+            commit: Fazer commit ao final (False para compor uma transação maior)
+
+        Returns:
+            Objetos criados, na ordem de `objs_in`
+        """
+        if not objs_in:
+            return []
+        statement = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        created = list(db.scalars(statement, [self._as_values(obj) for obj in objs_in]))
+
+        rows = [self._row_values(obj) for obj in created]
+        self._notify_bulk_write(db, rows)
+        self._finish(db, commit, list(zip(created, rows)))
+        return created
+
+    def bulk_update(
+        self, db: Session, *, values: Sequence[Dict[str, Any]], commit: bool = True
+    ) -> int:
+        """
+        Atualiza vários registros por id com um UPDATE em executemany
+
+        Args:
+            db: Sessão do banco
+            values: Um dict por registro, com "id" e os campos a alterar
+            commit: Fazer commit ao final (False para compor uma transação maior)
+
+        Returns:
+            Número de registros atualizados (ids inexistentes são ignorados)
+        """
+        if not values:
+            return 0
+        ids = [item["id"] for item in values]
+        table = self.model.__table__
+        # Estado anterior: ids existentes e buckets antigos para os listeners
+        before = {
+            row["id"]: dict(row)
+            for row in db.execute(select(table).where(table.c.id.in_(ids))).mappings()
+        }
+        values = [item for item in values if item["id"] in before]
+        if not values:
+            return 0
+
+        db.execute(update(self.model), values)
+        after = [{**before[item["id"]], **item} for item in values]
+
+        self._notify_bulk_write(db, list(before.values()) + after)
+        self._finish(db, commit)
+        return len(values)
+
+    def bulk_delete(self, db: Session, *, ids: Sequence[int], commit: bool = True) -> int:
+        """
+        Remove vários registros com um DELETE ... RETURNING
+
+        Args:
+            db: Sessão do banco
+            ids: IDs a remover
+            commit: Fazer commit ao final (False para compor uma transação maior)
+
+        Returns:
+            Número de registros removidos
+        """
+        if not ids:
+            return 0
+        table = self.model.__table__
+        rows = db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .returning(*table.columns)
+            .execution_options(synchronize_session="fetch")
+        ).mappings()
+        deleted = [dict(row) for row in rows]
+
+        self._notify_bulk_write(db, deleted)
+        self._finish(db, commit)
+        return len(deleted)
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        Versão assíncrona do BaseRepository, para uso com `get_async_db`.
+        **Parameters**
+        * `model`: A SQLAlchemy model class
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            obj_in_data = obj_in
+        else:
+            obj_in_data = obj_in.model_dump()
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, *, id: Any) -> ModelType:
+        obj = await db.get(self.model, id)
+        if obj is None:
+            raise ValueError(f"Object with id {id} not found")
+        await db.delete(obj)
+        await db.commit()
+        return obj
@@ -0,0 +1,148 @@
+"""
+Contagem de consultas e detector de N+1
+
+Os eventos before/after_cursor_execute de todas as engines (síncronas, async e
+réplicas) alimentam as estatísticas da requisição em andamento: número de
+instruções, tempo total no banco e quantas vezes cada formato de instrução se
+repetiu. O mesmo formato executado muitas vezes em uma requisição é o sintoma
+de N+1 (uma consulta por linha dentro de um loop).
+
+Uso:
+    with track_queries() as stats:      # escopo da requisição (ContextVar)
+        ...
+    stats.count, stats.total_ms, stats.repeated()
+
+    with capture_queries() as stats:    # todo o processo (testes, scripts)
+        client.get("/api/v1/payments/")
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+_START_TIMES = "query_stats_started"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Formato da instrução (os parâmetros já são placeholders; normaliza espaços)"""
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class QueryStats:
+    """Instruções executadas, tempo total e repetições por formato"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = settings.DB_N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Formatos executados pelo menos `threshold` vezes (suspeitos de N+1)"""
+        return {shape: n for shape, n in self.shapes.most_common() if n >= threshold}
+
+    def report(self, limit: int = 10) -> str:
+        """Resumo legível dos formatos mais frequentes (mensagens de teste e logs)"""
+        lines = [f"{self.count} consultas em {self.total_ms:.1f} ms"]
+        for shape, n in self.shapes.most_common(limit):
+            lines.append(f"  {n}x {shape[:200]}")
+        return "\n".join(lines)
+
+
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Coletores globais de capture_queries (todas as threads e tarefas)
+_global_collectors: List[QueryStats] = []
+
+# Rota da requisição em andamento ("GET /api/v1/payments/"), para quem registra instruções
+current_route_var: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+# Chamados após cada instrução: listener(statement, parameters, elapsed_ms, executemany)
+StatementListener = Callable[[str, Any, float, bool], None]
+STATEMENT_LISTENERS: List[StatementListener] = []
+
+
+def on_statement(func: StatementListener) -> StatementListener:
+    """Registra a função para receber cada instrução executada e sua duração"""
+    if func not in STATEMENT_LISTENERS:
+        STATEMENT_LISTENERS.append(func)
+    return func
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """Estatísticas da requisição em andamento (None fora de track_queries)"""
+    return query_stats_var.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Conta as consultas do contexto atual (requisição)
+
+    O objeto é compartilhado com as tarefas e threads criadas dentro do bloco
+    (o contexto é copiado, a referência é a mesma).
+    """
+    stats = QueryStats()
+    token = query_stats_var.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_var.reset(token)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """Conta todas as consultas do processo durante o bloco (ex.: TestClient em outra thread)"""
+    stats = QueryStats()
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info[_START_TIMES].pop()) * 1000
+    collectors = list(_global_collectors)
+    stats = query_stats_var.get()
+    if stats is not None:
+        collectors.append(stats)
+    for collector in collectors:
+        collector.record(statement, elapsed_ms)
+    for listener in STATEMENT_LISTENERS:
+        listener(statement, parameters, elapsed_ms, executemany)
+
+
+def _handle_error(exception_context) -> None:
+    # Instrução com erro não chega ao after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_START_TIMES):
+        conn.info[_START_TIMES].pop()
+
+
+def install_query_instrumentation() -> None:
+    """Registra os listeners em todas as engines (idempotente)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
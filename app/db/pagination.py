@@ -0,0 +1,124 @@
+"""
+Paginação por cursor (keyset)
+
+Em vez de OFFSET (que lê e descarta todas as linhas anteriores), cada página
+continua a partir da última linha da página anterior com um predicado de
+busca sobre (chave de ordenação, id):
+
+    WHERE (date, id) < (:date, :id) ORDER BY date DESC, id DESC LIMIT :limit
+
+Com um índice (user_id, chave, id) o custo é o mesmo na página 1 e na 500.
+
+O cursor entregue ao cliente é opaco (base64 de JSON) e é devolvido no
+header `X-Next-Cursor`; sem o header, não há próxima página. Na primeira
+página o cliente envia `cursor=` vazio.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CURSOR_DESCRIPTION = (
+    "Paginação por cursor: envie vazio na primeira página e o valor do header "
+    f"{NEXT_CURSOR_HEADER} nas seguintes (skip é ignorado)"
+)
+
+
+def _encode_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["n", str(value)]
+    return ["v", value]
+
+
+def _decode_value(tagged: list) -> Any:
+    tag, value = tagged
+    if tag == "dt":
+        return datetime.fromisoformat(value)
+    if tag == "d":
+        return date.fromisoformat(value)
+    if tag == "n":
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(keys: Sequence[str], values: Sequence[Any]) -> str:
+    """Cursor opaco com os nomes das chaves de ordenação e os valores da última linha"""
+    payload = {"k": list(keys), "v": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> List[Any]:
+    """
+    Valores do cursor para as chaves informadas
+
+    Raises:
+        HTTPException 400: cursor malformado ou gerado para outra ordenação
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != list(keys) or len(payload["v"]) != len(keys):
+            raise ValueError("cursor de outra listagem")
+        return [_decode_value(tagged) for tagged in payload["v"]]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido"
+        ) from exc
+
+
+def keyset_page(
+    query: Query,
+    order_by: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Uma página de `query` ordenada por `order_by` (a última coluna deve ser única, ex.: id)
+
+    Args:
+        query: Consulta já filtrada (sem ORDER BY/OFFSET/LIMIT)
+        order_by: Colunas da ordenação, todas na mesma direção
+        cursor: Cursor recebido ("" ou None = primeira página)
+        limit: Itens por página
+        descending: Ordem decrescente
+
+    Returns:
+        (itens, próximo cursor ou None na última página)
+    """
+    keys = [column.key for column in order_by]
+
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        row, bound = tuple_(*order_by), tuple_(*values)
+        query = query.filter(row < bound if descending else row > bound)
+
+    ordering = [column.desc() if descending else column.asc() for column in order_by]
+    # Uma linha a mais indica se existe próxima página, sem COUNT
+    items = query.order_by(*ordering).limit(limit + 1).all()
+
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(keys, [getattr(last, key) for key in keys])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Devolve o próximo cursor no header (ausente na última página)"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
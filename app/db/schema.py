@@ -0,0 +1,159 @@
+"""
+Gerenciamento do schema do banco (Alembic)
+
+A aplicação não cria tabelas na inicialização: o schema é aplicado por esta CLI
+(ou `alembic upgrade head`) e o startup apenas confere a revisão, conforme
+DB_STARTUP_SCHEMA_MODE.
+
+Uso:
+    python -m app.db.schema upgrade      # aplica as migrations pendentes
+    python -m app.db.schema check        # compara a revisão do banco com o head
+    python -m app.db.schema stamp 0001   # marca um banco criado com create_all
+    python -m app.db.schema create-all   # create_all legado (testes/protótipos)
+"""
+import argparse
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(str(ALEMBIC_INI))
+
+
+@lru_cache(maxsize=1)
+def get_head_revision() -> Optional[str]:
+    """Revisão head lida dos scripts em migrations/ (sem acessar o banco)"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def get_current_revision(connection: Optional[Connection] = None) -> Optional[str]:
+    """
+    Revisão aplicada no banco (uma única consulta a alembic_version)
+
+    Returns:
+        A revisão atual ou None se o banco ainda não foi versionado
+    """
+    query = text("SELECT version_num FROM alembic_version")
+
+    if connection is not None:
+        try:
+            with connection.begin_nested():
+                return connection.execute(query).scalar()
+        except DBAPIError:
+            return None
+
+    from app.db.session import engine
+
+    try:
+        with engine.connect() as conn:
+            return conn.execute(query).scalar()
+    except DBAPIError:
+        return None
+
+
+def check_schema_revision(connection: Optional[Connection] = None) -> bool:
+    """
+    Confere se o banco está na revisão head
+
+    Returns:
+        True se a revisão do banco é a mesma dos scripts
+    """
+    head = get_head_revision()
+    current = get_current_revision(connection)
+
+    if current == head:
+        logger.info("Schema do banco na revisão head", extra={"revision": current})
+        return True
+
+    logger.warning(
+        "Schema do banco atrás do head; rode: python -m app.db.schema upgrade",
+        extra={"revision": current, "head": head},
+    )
+    return False
+
+
+def upgrade_schema(revision: str = "head") -> None:
+    """Aplica as migrations até a revisão informada"""
+    from alembic import command
+
+    command.upgrade(_alembic_config(), revision)
+
+
+def stamp_schema(revision: str) -> None:
+    """Marca a revisão do banco sem executar migrations"""
+    from alembic import command
+
+    command.stamp(_alembic_config(), revision)
+
+
+def run_startup_schema_step(mode: str) -> None:
+    """
+    Passo de schema executado no startup da aplicação
+
+    Args:
+        mode: check (uma consulta, apenas avisa), skip (nenhum acesso ao banco),
+            upgrade (aplica migrations; desenvolvimento) ou create_all (legado)
+    """
+    if mode == "skip":
+        return
+    if mode == "check":
+        check_schema_revision()
+    elif mode == "upgrade":
+        upgrade_schema()
+    elif mode == "create_all":
+        from app.db.session import create_tables
+
+        create_tables()
+    else:
+        raise ValueError(
+            f"DB_STARTUP_SCHEMA_MODE inválido: {mode} (use check, skip, upgrade ou create_all)"
+        )
+
+
+def main() -> None:
+    """Entry point de linha de comando"""
+    parser = argparse.ArgumentParser(description="Gerenciamento do schema do banco")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade_parser = subparsers.add_parser("upgrade", help="Aplicar migrations")
+    upgrade_parser.add_argument("revision", nargs="?", default="head")
+
+    subparsers.add_parser("check", help="Comparar a revisão do banco com o head")
+
+    stamp_parser = subparsers.add_parser("stamp", help="Marcar revisão sem executar")
+    stamp_parser.add_argument("revision")
+
+    subparsers.add_parser("create-all", help="Criar tabelas com create_all (legado)")
+
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        upgrade_schema(args.revision)
+    elif args.command == "check":
+        sys.exit(0 if check_schema_revision() else 1)
+    elif args.command == "stamp":
+        stamp_schema(args.revision)
+    elif args.command == "create-all":
+        from app.db.session import create_tables
+
+        create_tables()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,103 @@
+import itertools
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.pool import NullPool
-from sqlalchemy.orm import sessionmaker
+import time
+from typing import List, Optional, Union
+
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool, QueuePool
 
 from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import DB_POOL_TIMEOUTS, register_collector
 from app.db.base import Base
 
-use_nullpool = os.getenv("DB_USE_NULLPOOL", "true").lower() == "true" or \
-    ("supabase.com" in settings.DATABASE_URL and ":6543" in settings.DATABASE_URL)
+logger = get_logger(__name__)
 
-if use_nullpool:
-    # PgBouncer (transaction pooling) gerencia o pool; evite segurar conexões
-    engine = create_engine(
-        settings.DATABASE_URL,
-        poolclass=NullPool,
-        pool_pre_ping=True,
-        echo=settings.DEBUG,
-    )
-else:
+use_nullpool = os.getenv("DB_USE_NULLPOOL", "true").lower() == "true" or (
+    "supabase.com" in settings.DATABASE_URL and ":6543" in settings.DATABASE_URL
+)
+
+
+def to_async_database_url(url: str) -> str:
+    """Converte uma URL síncrona (psycopg2) para o driver async do psycopg 3"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix) :]
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_database_url(settings.DATABASE_URL)
+
+
+class TimeoutCountingQueuePool(QueuePool):
+    """
+    QueuePool que conta as esperas por conexão que passaram de pool_timeout
+
+    A contagem fica no checkout do pool: vale para API, worker e agendador, e
+    não depende de qual handler captura (ou converte) o TimeoutError.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+
+
+class TimeoutCountingAsyncQueuePool(TimeoutCountingQueuePool, AsyncAdaptedQueuePool):
+    """Versão para as engines async (fila compatível com asyncio)"""
+
+
+def _pool_options(is_async: bool = False) -> dict:
+    if use_nullpool:
+        # PgBouncer (transaction pooling) gerencia o pool; evite segurar conexões
+        return {"poolclass": NullPool}
     # Pool próprio do SQLAlchemy (útil quando conectando direto ao Postgres)
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_size=settings.DB_POOL_SIZE,
-        max_overflow=settings.DB_MAX_OVERFLOW,
-        pool_timeout=settings.DB_POOL_TIMEOUT,
-        pool_recycle=settings.DB_POOL_RECYCLE,
+    return {
+        "poolclass": TimeoutCountingAsyncQueuePool if is_async else TimeoutCountingQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def create_sync_engine(url: str) -> Engine:
+    return create_engine(url, pool_pre_ping=True, echo=settings.DEBUG, **_pool_options())
+
+
+def create_async_engine_for(url: str) -> AsyncEngine:
+    # prepare_threshold=None: prepared statements não sobrevivem ao transaction pooling
+    connect_args = {"prepare_threshold": None} if use_nullpool else {}
+    return create_async_engine(
+        to_async_database_url(url),
         pool_pre_ping=True,
         echo=settings.DEBUG,
+        connect_args=connect_args,
+        **_pool_options(is_async=True),
     )
 
+
+engine = create_sync_engine(settings.DATABASE_URL)
+async_engine = create_async_engine_for(settings.DATABASE_URL)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: evita lazy-load (I/O implícito) ao serializar após o commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 # Dependency para obter sessão do banco de dados
 def get_db():
@@ -41,6 +108,173 @@ def get_db():
         db.close()
 
 
+# Dependency para obter sessão assíncrona (rotas async def não bloqueiam o event loop)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ==================== RÉPLICAS DE LEITURA ====================
+
+# Atraso (segundos) da réplica que atende a sessão; 0 = primário ou réplica em dia
+READ_LAG_INFO = "read_replica_lag"
+
+# Atraso de replicação: zero quando tudo o que foi recebido já foi aplicado
+# (um primário ocioso não gera WAL, e o timestamp do último replay envelhece)
+_REPLICATION_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReadReplica:
+    """Engines de uma réplica e a última medição do seu atraso"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_sync_engine(url)
+        self.async_engine = create_async_engine_for(url)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_session_factory = async_sessionmaker(
+            bind=self.async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+        self.lag: Optional[float] = None  # None = inacessível ou ainda não medida
+        self.checked_at = float("-inf")
+
+    def needs_check(self, interval: float) -> bool:
+        return time.monotonic() - self.checked_at >= interval
+
+    def check(self) -> Optional[float]:
+        """Mede o atraso (síncrono); erro de conexão marca a réplica como indisponível"""
+        try:
+            with self.engine.connect() as conn:
+                self.lag = float(conn.execute(_REPLICATION_LAG_SQL).scalar() or 0)
+        except Exception:
+            self.lag = None
+            logger.warning("Réplica de leitura indisponível", extra={"replica": self.host})
+        self.checked_at = time.monotonic()
+        return self.lag
+
+    async def async_check(self) -> Optional[float]:
+        """Mede o atraso sem bloquear o event loop"""
+        try:
+            async with self.async_engine.connect() as conn:
+                self.lag = float((await conn.execute(_REPLICATION_LAG_SQL)).scalar() or 0)
+        except Exception:
+            self.lag = None
+            logger.warning("Réplica de leitura indisponível", extra={"replica": self.host})
+        self.checked_at = time.monotonic()
+        return self.lag
+
+    @property
+    def host(self) -> str:
+        return make_url(self.url).host or ""
+
+
+class ReadRouter:
+    """
+    Escolha da réplica para uma sessão de leitura
+
+    Rodízio entre as réplicas com atraso medido até `max_lag_seconds`. O atraso
+    de cada réplica é medido no máximo a cada `check_seconds` (a medição é uma
+    consulta leve, feita por quem abrir a primeira sessão após o intervalo).
+    Sem réplica elegível, a leitura vai para o primário.
+    """
+
+    def __init__(self, urls: List[str], max_lag_seconds: float, check_seconds: float):
+        self.replicas = [ReadReplica(url) for url in urls]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._turn = itertools.count()
+
+    def _rotation(self) -> List[ReadReplica]:
+        start = next(self._turn) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    def _eligible(self, replica: ReadReplica, max_lag: Optional[float]) -> bool:
+        limit = self.max_lag_seconds if max_lag is None else max_lag
+        return replica.lag is not None and replica.lag <= limit
+
+    def choose(self, max_lag: Optional[float] = None) -> Optional[ReadReplica]:
+        """Réplica elegível (None = usar o primário)"""
+        for replica in self._rotation() if self.replicas else []:
+            if replica.needs_check(self.check_seconds):
+                replica.check()
+            if self._eligible(replica, max_lag):
+                return replica
+        return None
+
+    async def async_choose(self, max_lag: Optional[float] = None) -> Optional[ReadReplica]:
+        """Versão assíncrona de choose"""
+        for replica in self._rotation() if self.replicas else []:
+            if replica.needs_check(self.check_seconds):
+                await replica.async_check()
+            if self._eligible(replica, max_lag):
+                return replica
+        return None
+
+
+read_router = ReadRouter(
+    settings.database_read_urls_list,
+    max_lag_seconds=settings.DB_READ_MAX_LAG_SECONDS,
+    check_seconds=settings.DB_READ_LAG_CHECK_SECONDS,
+)
+
+
+def _pools():
+    """(nome, pool) das engines com pool próprio (NullPool não tem estatísticas)"""
+    engines = [("primary", engine), ("primary_async", async_engine.sync_engine)]
+    for index, replica in enumerate(read_router.replicas):
+        engines.append((f"replica{index}", replica.engine))
+        engines.append((f"replica{index}_async", replica.async_engine.sync_engine))
+    return [(name, eng.pool) for name, eng in engines if hasattr(eng.pool, "checkedout")]
+
+
+@register_collector("db_pool_checked_out", "gauge", "Conexões em uso por pool")
+def _pool_checked_out():
+    return [("db_pool_checked_out", {"engine": name}, pool.checkedout()) for name, pool in _pools()]
+
+
+@register_collector("db_pool_overflow", "gauge", "Conexões além de pool_size (negativo = ociosas)")
+def _pool_overflow():
+    return [("db_pool_overflow", {"engine": name}, pool.overflow()) for name, pool in _pools()]
+
+
+@register_collector("db_pool_size", "gauge", "Tamanho configurado do pool")
+def _pool_size():
+    return [("db_pool_size", {"engine": name}, pool.size()) for name, pool in _pools()]
+
+
+def is_stale_read(db: Union[Session, AsyncSession]) -> bool:
+    """A sessão lê de uma réplica atrasada (não cachear o resultado, por exemplo)"""
+    return bool(db.info.get(READ_LAG_INFO))
+
+
+# Dependency para rotas somente leitura: réplica dentro da tolerância ou primário
+def get_read_db():
+    replica = read_router.choose()
+    db = replica.session_factory() if replica else SessionLocal()
+    db.info[READ_LAG_INFO] = replica.lag if replica else 0.0
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Versão assíncrona de get_read_db (dashboard)
+async def get_async_read_db():
+    replica = await read_router.async_choose()
+    factory = replica.async_session_factory if replica else AsyncSessionLocal
+    async with factory() as db:
+        db.info[READ_LAG_INFO] = replica.lag if replica else 0.0
+        yield db
+
+
 # Função para criar tabelas
 def create_tables():
     # Importar todos os modelos para registrá-los com SQLAlchemy
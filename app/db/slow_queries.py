@@ -0,0 +1,197 @@
+"""
+Log de consultas lentas com EXPLAIN (ANALYZE, BUFFERS) amostrado
+
+Opcional (SLOW_QUERY_LOG_ENABLED=true). Toda instrução mais lenta que
+SLOW_QUERY_THRESHOLD_MS vira uma linha JSON em SLOW_QUERY_LOG_FILE (arquivo com
+rotação), com o formato da instrução, o formato dos parâmetros (tipos, nunca
+valores), a rota e o request_id. Para uma fração SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+dos SELECTs, o plano real é capturado com EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+em uma conexão de leitura (réplica, ou o primário em transação READ ONLY
+desfeita ao final), em uma thread separada, fora do caminho da requisição.
+Os planos trazem os valores literais nas condições (Index Cond, Filter): trate
+o arquivo como dado sensível.
+
+Revisão:
+    jq 'select(.plan) | {duration_ms, route, statement}' logs/slow_queries.jsonl
+"""
+import json
+import logging
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logger import get_logger, get_request_id
+from app.db.instrumentation import (
+    STATEMENT_LISTENERS,
+    current_route_var,
+    on_statement,
+    statement_shape,
+)
+
+logger = get_logger(__name__)
+
+# Explains pendentes além deste limite são descartados (a linha é gravada sem plano)
+MAX_PENDING_EXPLAINS = 4
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Tipos dos parâmetros (sem os valores, que podem conter dados pessoais)"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: formato da primeira linha e quantidade de linhas
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def default_explain_engine() -> Engine:
+    """Réplica de leitura elegível ou, sem réplica, o primário"""
+    from app.db.session import engine, read_router
+
+    replica = read_router.choose()
+    return replica.engine if replica else engine
+
+
+class SlowQueryLog:
+    """Registro das instruções lentas e captura amostrada dos planos"""
+
+    def __init__(
+        self,
+        path: str,
+        threshold_ms: float,
+        explain_sample_rate: float,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        explain_engine: Callable[[], Engine] = default_explain_engine,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_engine = explain_engine
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query")
+
+    def should_explain(self, statement: str, executemany: bool) -> bool:
+        # EXPLAIN ANALYZE executa a instrução: apenas SELECTs simples
+        if executemany or not statement.lstrip()[:6].upper() == "SELECT":
+            return False
+        return random.random() < self.explain_sample_rate
+
+    def record(self, statement: str, parameters: Any, elapsed_ms: float, executemany: bool):
+        """Listener de instruções: grava as que passam do limite"""
+        if elapsed_ms < self.threshold_ms or statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed_ms, 2),
+            "statement": statement_shape(statement),
+            "parameters": parameter_shape(parameters),
+            "executemany": executemany,
+            "route": current_route_var.get(),
+            "request_id": get_request_id(),
+        }
+
+        if self.should_explain(statement, executemany) and self._reserve():
+            self._executor.submit(self._explain_and_write, entry, statement, parameters)
+        else:
+            self.write(entry)
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._pending >= MAX_PENDING_EXPLAINS:
+                return False
+            self._pending += 1
+            return True
+
+    def _explain_and_write(self, entry: Dict[str, Any], statement: str, parameters: Any):
+        try:
+            entry["plan"] = self.explain(statement, parameters)
+        except Exception as exc:
+            entry["explain_error"] = f"{type(exc).__name__}: {exc}"
+        finally:
+            with self._lock:
+                self._pending -= 1
+        self.write(entry)
+
+    def explain(self, statement: str, parameters: Any) -> Any:
+        """Plano real da instrução, em transação somente leitura desfeita ao final"""
+        with self.explain_engine().connect() as conn:
+            with conn.begin() as transaction:
+                conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                result = conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+                )
+                plan = result.scalar()
+                transaction.rollback()
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Uma linha JSON no arquivo (o handler cuida da rotação)"""
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        self.handler.emit(logging.makeLogRecord({"msg": line, "levelno": logging.WARNING}))
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """Espera os explains pendentes (testes e encerramento)"""
+        self._executor.submit(lambda: None).result(timeout=timeout)
+        self.handler.flush()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.handler.close()
+
+
+slow_query_log: Optional[SlowQueryLog] = None
+
+
+def install_slow_query_log(
+    path: str = settings.SLOW_QUERY_LOG_FILE,
+    threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_sample_rate: float = settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    explain_engine: Callable[[], Engine] = default_explain_engine,
+) -> SlowQueryLog:
+    """Ativa o log de consultas lentas (substitui um log instalado antes)"""
+    global slow_query_log
+
+    uninstall_slow_query_log()
+    slow_query_log = SlowQueryLog(
+        path,
+        threshold_ms,
+        explain_sample_rate,
+        max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backup_count=settings.SLOW_QUERY_LOG_BACKUPS,
+        explain_engine=explain_engine,
+    )
+    on_statement(slow_query_log.record)
+    logger.info(
+        "Log de consultas lentas ativo",
+        extra={"path": path, "threshold_ms": threshold_ms, "sample_rate": explain_sample_rate},
+    )
+    return slow_query_log
+
+
+def uninstall_slow_query_log() -> None:
+    global slow_query_log
+
+    if slow_query_log is not None:
+        if slow_query_log.record in STATEMENT_LISTENERS:
+            STATEMENT_LISTENERS.remove(slow_query_log.record)
+        slow_query_log.close()
+        slow_query_log = None
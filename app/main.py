@@ -1,17 +1,50 @@
 import os
+import time
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.db.session import create_tables
+from app.core.logger import (
+    REQUEST_ID_HEADER,
+    configure_logging,
+    get_logger,
+    new_request_id,
+    request_id_var,
+)
+from app.core.metrics import (
+    CONTENT_TYPE,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    STATUS_CLASSES,
+    render_metrics,
+)
+from app.core.server_timing import ServerTimingMiddleware, install_serialization_timing
+from app.db.instrumentation import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    current_route_var,
+    install_query_instrumentation,
+    track_queries,
+)
+from app.db.schema import run_startup_schema_step
 
 # Descomente a linha abaixo para habilitar o middleware de autenticação global
 # from app.src.auth.middleware import AuthMiddleware
 
+configure_logging()
+install_query_instrumentation()
+install_serialization_timing()
+if settings.SLOW_QUERY_LOG_ENABLED:
+    from app.db.slow_queries import install_slow_query_log
+
+    install_slow_query_log()
+logger = get_logger("app.main")
+
 # Inicializar aplicação FastAPI
 app = FastAPI(
     title="Imóvel Gestão API",
@@ -32,18 +65,19 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Server-Timing (dentro do request_context_middleware, que abre a contagem de consultas)
+app.add_middleware(ServerTimingMiddleware)
+
 
 # Middleware para capturar erros 500 e adicionar CORS headers
 @app.middleware("http")
 async def catch_exceptions_middleware(request: Request, call_next):
     try:
         return await call_next(request)
-    except Exception as exc:
-        # Log do erro (em produção, use logging adequado)
-        print(f"❌ Erro não tratado: {exc}")
-        import traceback
-
-        traceback.print_exc()
+    except Exception:
+        logger.exception(
+            "Erro não tratado", extra={"method": request.method, "path": request.url.path}
+        )
 
         # Retornar erro 500 com CORS habilitado
         return JSONResponse(
@@ -56,6 +90,69 @@ async def catch_exceptions_middleware(request: Request, call_next):
         )
 
 
+def report_query_stats(request: Request, response, stats) -> None:
+    """Headers de contagem de consultas e aviso de N+1 (DB_QUERY_STATS)"""
+    response.headers[QUERY_COUNT_HEADER] = str(stats.count)
+    response.headers[QUERY_TIME_HEADER] = f"{stats.total_ms:.2f}"
+    repeated = stats.repeated()
+    if repeated:
+        logger.warning(
+            "Possível N+1: instrução repetida na mesma requisição",
+            extra={"method": request.method, "path": request.url.path, "repeated": repeated},
+        )
+
+
+def record_request_metrics(request: Request, status_code: int, elapsed: float, queries: int):
+    """Latência e consultas por rota (template da rota, não o path com ids)"""
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else "unmatched"
+    status_class = STATUS_CLASSES[status_code // 100] if status_code < 600 else "5xx"
+    HTTP_REQUEST_SECONDS.labels(request.method, route_path, status_class).observe(elapsed)
+    HTTP_REQUEST_DB_QUERIES.labels(request.method, route_path).observe(queries)
+
+
+# Request id, consultas e log de acesso (registrado por último: envolve os demais)
+@app.middleware("http")
+async def request_context_middleware(request: Request, call_next):
+    request_id = request.headers.get(REQUEST_ID_HEADER) or new_request_id()
+    token = request_id_var.set(request_id)
+    route_token = current_route_var.set(f"{request.method} {request.url.path}")
+    in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(request.method)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        with track_queries() as stats:
+            response = await call_next(request)
+        elapsed = time.perf_counter() - started
+        response.headers[REQUEST_ID_HEADER] = request_id
+        if settings.DB_QUERY_STATS:
+            report_query_stats(request, response, stats)
+        record_request_metrics(request, response.status_code, elapsed, stats.count)
+        logger.info(
+            "Requisição concluída",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": round(elapsed * 1000, 2),
+                "db_queries": stats.count,
+                "db_ms": round(stats.total_ms, 2),
+            },
+        )
+        return response
+    finally:
+        in_flight.dec()
+        current_route_var.reset(route_token)
+        request_id_var.reset(token)
+
+
+# Tracing (depois dos middlewares acima: o span da requisição envolve todos eles)
+if settings.TRACING_ENABLED:
+    from app.core.tracing import configure_tracing
+
+    configure_tracing(app)
+
+
 # Middleware de autenticação global (OPCIONAL - desabilitado por padrão)
 # Para habilitar autenticação obrigatória em todas as rotas (exceto públicas),
 # descomente as linhas abaixo:
@@ -74,8 +171,26 @@ app.include_router(api_router, prefix="/api/v1")
 @app.on_event("startup")
 async def startup_event():
     """Executar na inicialização da aplicação"""
-    # Criar tabelas no banco de dados
-    create_tables()
+    # Schema é aplicado fora do processo web (python -m app.db.schema upgrade);
+    # aqui no máximo conferimos a revisão, sem consultas ao catálogo
+    run_startup_schema_step(settings.DB_STARTUP_SCHEMA_MODE)
+
+    if settings.SCHEDULER_ENABLED:
+        # Todas as réplicas podem hospedar o agendador: o advisory lock garante
+        # que cada job periódico rode em apenas uma delas por período
+        import threading
+
+        from app.core.job_queue import default_worker_id
+        from app.core.scheduler import Scheduler
+        from app.db.session import SessionLocal, engine
+        from app.worker import process_all_users  # noqa: F401  # registra o job periódico
+
+        threading.Thread(
+            target=Scheduler.run_forever,
+            args=(SessionLocal, engine, default_worker_id()),
+            name="scheduler",
+            daemon=True,
+        ).start()
 
 
 @app.get("/")
@@ -96,6 +211,14 @@ async def health_check():
     return {"status": "healthy", "service": settings.PROJECT_NAME}
 
 
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Métricas no formato de exposição do Prometheus"""
+        return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -3,7 +3,17 @@ Source module - Todos os módulos de domínio da aplicação
 """
 
 # Importar todos os módulos para facilitar acesso
-from . import contracts, dashboard, expenses, notifications, payments, properties, tenants, units
+from . import (
+    contracts,
+    dashboard,
+    expenses,
+    jobs,
+    notifications,
+    payments,
+    properties,
+    tenants,
+    units,
+)
 
 __all__ = [
     "properties",
@@ -14,4 +24,5 @@ __all__ = [
     "notifications",
     "units",
     "dashboard",
+    "jobs",
 ]
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
@@ -41,6 +41,27 @@ class contract_controller:
 
         return contracts
 
+    def get_contracts_page(
+        self,
+        db: Session,
+        user_id: int,
+        cursor: Optional[str],
+        limit: int = 100,
+        status: Optional[str] = None,
+        property_id: Optional[int] = None,
+        tenant_id: Optional[int] = None,
+    ) -> Tuple[List[Contract], Optional[str]]:
+        """Listar contratos por cursor (filtros combinados)"""
+        return self.repository.get_page_by_user(
+            db,
+            user_id,
+            cursor=cursor,
+            limit=limit,
+            status=status,
+            property_id=property_id,
+            tenant_id=tenant_id,
+        )
+
     def get_contract_by_id(self, db: Session, contract_id: int, user_id: int) -> ContractResponse:
         """Obter contrato por ID"""
         contract_obj = self.repository.get_by_id_and_user(db, contract_id, user_id)
@@ -74,22 +95,15 @@ class contract_controller:
     def update_contract(
         self, db: Session, contract_id: int, user_id: int, contract_data: ContractUpdate
     ) -> ContractResponse:
-        """Atualizar contrato"""
-        contract_obj = self.repository.get_by_id_and_user(db, contract_id, user_id)
+        """Atualizar contrato (checagem de dono e escrita em uma instrução)"""
+        contract_obj = self.repository.update_returning(db, contract_id, user_id, contract_data)
         if not contract_obj:
             raise HTTPException(status_code=404, detail="Contrato não encontrado")
-
-        return self.repository.update(db, db_obj=contract_obj, obj_in=contract_data)
+        return contract_obj
 
     def delete_contract(self, db: Session, contract_id: int, user_id: int) -> dict:
-        """Deletar contrato"""
-        # Primeiro verifica se o contrato pertence ao usuário
-        contract_obj = self.repository.get_by_id_and_user(db, contract_id, user_id)
-        if not contract_obj:
-            raise HTTPException(status_code=404, detail="Contrato não encontrado")
-
-        success = self.repository.delete(db, id=contract_id)
-        if not success:
+        """Deletar contrato (checagem de dono e remoção em uma instrução)"""
+        if not self.repository.delete_owned(db, contract_id, user_id):
             raise HTTPException(status_code=404, detail="Contrato não encontrado")
         return {"message": "Contrato deletado com sucesso"}
 
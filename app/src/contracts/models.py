@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -8,6 +8,22 @@ from app.db.base import Base
 
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        # Contratos ativos/vencendo/vencidos por usuário (dashboard, background tasks)
+        Index("ix_contracts_user_status_end_date", "user_id", "status", "end_date"),
+        # Parcial: contrato vigente e verificação de disponibilidade do imóvel
+        Index(
+            "ix_contracts_active_property_period",
+            "property_id",
+            "start_date",
+            "end_date",
+            postgresql_where=text("status = 'active'"),
+        ),
+        # Atividades recentes (ORDER BY created_at DESC)
+        Index("ix_contracts_user_created_at", "user_id", "created_at"),
+        # Paginação por cursor: WHERE user_id = ? AND id > ? ORDER BY id
+        Index("ix_contracts_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)  # Reference to user in auth-api
@@ -1,10 +1,12 @@
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.base_repository import BaseRepository
+from app.db.base_repository import AsyncBaseRepository, BaseRepository
+from app.db.pagination import keyset_page
 
 from .models import Contract
 from .schemas import ContractCreate, ContractUpdate
@@ -25,6 +27,26 @@ class ContractRepository(BaseRepository[Contract, ContractCreate, ContractUpdate
             db.query(Contract).filter(Contract.user_id == user_id).offset(skip).limit(limit).all()
         )
 
+    def get_page_by_user(
+        self,
+        db: Session,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+        property_id: Optional[int] = None,
+        tenant_id: Optional[int] = None,
+    ) -> Tuple[List[Contract], Optional[str]]:
+        """Página por cursor dos contratos do usuário (ordem por id), com filtros opcionais"""
+        query = db.query(Contract).filter(Contract.user_id == user_id)
+        if status:
+            query = query.filter(Contract.status == status)
+        if property_id:
+            query = query.filter(Contract.property_id == property_id)
+        if tenant_id:
+            query = query.filter(Contract.tenant_id == tenant_id)
+        return keyset_page(query, [Contract.id], cursor, limit)
+
     def get_by_id_and_user(self, db: Session, contract_id: int, user_id: int) -> Optional[Contract]:
         """Buscar contrato por ID validando propriedade do usuário"""
         return (
@@ -175,3 +197,70 @@ class ContractRepository(BaseRepository[Contract, ContractCreate, ContractUpdate
             db.refresh(contract_obj)
             return contract_obj
         return None
+
+
+class AsyncContractRepository(AsyncBaseRepository[Contract, ContractCreate, ContractUpdate]):
+    """Repository assíncrono para operações com contratos"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Contract)
+        self.db = db
+
+    async def get_by_user(
+        self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Contract]:
+        """Buscar contratos do usuário"""
+        result = await db.execute(
+            select(Contract).where(Contract.user_id == user_id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id_and_user(
+        self, db: AsyncSession, contract_id: int, user_id: int
+    ) -> Optional[Contract]:
+        """Buscar contrato por ID validando propriedade do usuário"""
+        result = await db.execute(
+            select(Contract).where(Contract.id == contract_id, Contract.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def count_active(self, db: AsyncSession, user_id: int) -> int:
+        """Contar contratos ativos do usuário"""
+        result = await db.execute(
+            select(func.count(Contract.id)).where(
+                Contract.user_id == user_id, Contract.status == "active"
+            )
+        )
+        return result.scalar() or 0
+
+    async def sum_active_rent(self, db: AsyncSession, user_id: int) -> float:
+        """Somar aluguéis dos contratos ativos do usuário"""
+        result = await db.execute(
+            select(func.sum(Contract.rent)).where(
+                Contract.user_id == user_id, Contract.status == "active"
+            )
+        )
+        return float(result.scalar() or 0.0)
+
+    async def count_expiring(self, db: AsyncSession, user_id: int, days_ahead: int = 30) -> int:
+        """Contar contratos ativos que vencem nos próximos X dias"""
+        future_date = date.today() + timedelta(days=days_ahead)
+        result = await db.execute(
+            select(func.count(Contract.id)).where(
+                Contract.user_id == user_id,
+                Contract.status == "active",
+                Contract.end_date <= future_date,
+                Contract.end_date >= date.today(),
+            )
+        )
+        return result.scalar() or 0
+
+    async def get_recent(self, db: AsyncSession, user_id: int, limit: int = 5) -> List[Contract]:
+        """Buscar contratos criados mais recentemente"""
+        result = await db.execute(
+            select(Contract)
+            .where(Contract.user_id == user_id)
+            .order_by(Contract.created_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
@@ -1,10 +1,11 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id_from_token
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 from .controller import contract_controller
 from .schemas import ContractCreate, ContractResponse, ContractUpdate
@@ -24,17 +25,32 @@ async def create_contract(
 
 @router.get("/", response_model=List[ContractResponse])
 async def list_contracts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     status: Optional[str] = Query(
         None, description="Filtrar por status: active, expired, terminated"
     ),
     property_id: Optional[int] = Query(None, description="Filtrar por propriedade"),
     tenant_id: Optional[int] = Query(None, description="Filtrar por inquilino"),
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Listar contratos do usuário autenticado"""
+    if cursor is not None:
+        contracts, next_cursor = contract_controller(db).get_contracts_page(
+            db,
+            user_id,
+            cursor,
+            limit,
+            status=status,
+            property_id=property_id,
+            tenant_id=tenant_id,
+        )
+        set_next_cursor(response, next_cursor)
+        return contracts
+
     return contract_controller(db).get_contracts(
         db,
         user_id,
@@ -48,7 +64,7 @@ async def list_contracts(
 
 @router.get("/active", response_model=List[ContractResponse])
 async def list_active_contracts(
-    user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_read_db)
 ):
     """Listar apenas contratos ativos"""
     return contract_controller(db).get_active_contracts(db, user_id)
@@ -58,7 +74,7 @@ async def list_active_contracts(
 async def list_expiring_contracts(
     days_ahead: int = Query(30, description="Dias à frente para verificar vencimento"),
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Listar contratos que vencem em breve"""
     return contract_controller(db).get_expiring_contracts(db, user_id, days_ahead)
@@ -68,7 +84,7 @@ async def list_expiring_contracts(
 async def get_contract(
     contract_id: int,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Obter contrato por ID"""
     return contract_controller(db).get_contract_by_id(db, contract_id, user_id)
@@ -1,4 +1,5 @@
 # Dashboard module
+from . import rollups  # noqa: F401 - registra os listeners que mantêm monthly_rollups
 from .router import router
 
 __all__ = ["dashboard_controller", "router"]
@@ -0,0 +1,112 @@
+"""
+Cache das respostas do dashboard por (user_id, endpoint, parâmetros)
+
+A versão dos dados do usuário é incrementada após o commit de qualquer escrita
+em Payment, Contract, Expense, Property ou Tenant feita pelo ORM ou pelas
+operações em lote do BaseRepository. Escritas em SQL puro devem chamar mark_users_dirty(session, user_ids) antes do commit.
+"""
+from functools import wraps
+from typing import Callable, Set
+
+from anyio.to_thread import run_sync
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import ResponseCache, create_cache_backend
+from app.core.config import settings
+from app.db.base_repository import on_bulk_write
+from app.db.session import is_stale_read
+from app.src.contracts.models import Contract
+from app.src.expenses.models import Expense
+from app.src.payments.models import Payment
+from app.src.properties.models import Property
+from app.src.tenants.models import Tenant
+
+dashboard_cache = ResponseCache(create_cache_backend(), ttl=settings.CACHE_TTL_SECONDS)
+
+# Modelos cujas escritas alteram alguma resposta do dashboard
+_TRACKED_MODELS = (Payment, Contract, Expense, Property, Tenant)
+
+# Parâmetros da rota que não fazem parte da chave
+_EXCLUDED_PARAMS = {"db", "user_id"}
+
+_DIRTY_USERS = "dashboard_cache_dirty_users"
+
+
+def cached_response(endpoint: str) -> Callable:
+    """
+    Decorator para rotas do dashboard
+
+    A rota precisa receber `user_id`; os demais parâmetros (exceto `db`)
+    compõem a chave. A assinatura original é preservada para o FastAPI.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            user_id = kwargs["user_id"]
+            params = {k: v for k, v in kwargs.items() if k not in _EXCLUDED_PARAMS}
+            backend = dashboard_cache.backend
+
+            if backend.is_remote:
+                key, value = await run_sync(dashboard_cache.get, user_id, endpoint, params)
+            else:
+                key, value = dashboard_cache.get(user_id, endpoint, params)
+            if value is not None:
+                return value
+
+            value = await func(*args, **kwargs)
+
+            # Resposta lida de réplica atrasada não vai para o cache: ficaria
+            # presa à versão atual dos dados até a próxima escrita
+            db = kwargs.get("db")
+            if db is not None and is_stale_read(db):
+                return value
+
+            if backend.is_remote:
+                await run_sync(dashboard_cache.set, key, value)
+            else:
+                dashboard_cache.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _owners(objects) -> Set[int]:
+    return {
+        obj.user_id
+        for obj in objects
+        if isinstance(obj, _TRACKED_MODELS) and obj.user_id is not None
+    }
+
+
+def mark_users_dirty(session: Session, user_ids) -> None:
+    """Agenda a invalidação do cache dos usuários para o commit da sessão"""
+    session.info.setdefault(_DIRTY_USERS, set()).update(user_ids)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_dirty_users(session: Session, flush_context, instances) -> None:
+    users = _owners(session.new) | _owners(session.dirty) | _owners(session.deleted)
+    if users:
+        mark_users_dirty(session, users)
+
+
+@on_bulk_write(*_TRACKED_MODELS)
+def _collect_bulk_dirty_users(db: Session, model: type, rows) -> None:
+    mark_users_dirty(db, {row["user_id"] for row in rows if row["user_id"] is not None})
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_user_versions(session: Session) -> None:
+    """Invalida o cache somente depois que a escrita está visível para os leitores"""
+    users = session.info.pop(_DIRTY_USERS, None)
+    for user_id in users or ():
+        dashboard_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_users(session: Session) -> None:
+    session.info.pop(_DIRTY_USERS, None)
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.base import Base
+
+
+class MonthlyRollup(Base):
+    """Totais financeiros mensais por usuário e imóvel (mantidos a cada escrita)"""
+
+    __tablename__ = "monthly_rollups"
+
+    user_id = Column(Integer, primary_key=True)  # Reference to user in auth-api
+    property_id = Column(
+        Integer,
+        ForeignKey("properties.id", name="fk_monthly_rollup_property_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    month = Column(Date, primary_key=True)  # Primeiro dia do mês
+    revenue_received = Column(Numeric(12, 2), nullable=False, default=0)  # Pagos no mês
+    expected_rent = Column(Numeric(12, 2), nullable=False, default=0)  # Vencendo no mês
+    expenses_total = Column(Numeric(12, 2), nullable=False, default=0)
+    expenses_by_category = Column(JSONB, nullable=False, default=dict)  # {categoria: total}
+    payments_paid = Column(Integer, nullable=False, default=0)
+    payments_pending = Column(Integer, nullable=False, default=0)
+    payments_overdue = Column(Integer, nullable=False, default=0)
+    payments_partial = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
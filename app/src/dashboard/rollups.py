@@ -0,0 +1,402 @@
+"""
+Rollup financeiro mensal (monthly_rollups) mantido a cada escrita
+
+Toda escrita de Payment/Expense feita pelo ORM (repositories, routers, tarefas
+de background) recalcula, na mesma transação e em uma única instrução, apenas os
+buckets (user_id, property_id, mês) afetados, sob advisory lock por bucket para
+que escritas concorrentes no mesmo bucket não se sobrescrevam. As operações em lote do BaseRepository
+(bulk_create/bulk_update/bulk_delete) também, via on_bulk_write. Escritas em
+SQL puro (UPDATE/DELETE em massa) devem chamar MonthlyRollupService.refresh
+com as chaves afetadas.
+
+Backfill / reconstrução:
+    python -m app.src.dashboard.rollups [--user-id ID]
+"""
+import argparse
+import hashlib
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Sequence, Set, Tuple
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    and_,
+    cast,
+    column,
+    delete,
+    event,
+    func,
+    inspect,
+    literal,
+    select,
+    text,
+    union,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.orm import Session
+
+from app.db.base_repository import on_bulk_write
+from app.src.expenses.models import Expense
+from app.src.payments.models import Payment
+
+from .models import MonthlyRollup
+
+# (user_id, property_id, primeiro dia do mês)
+RollupKey = Tuple[int, int, date]
+
+# Atributos que definem a qual bucket uma linha pertence
+_KEY_ATTRIBUTES = {
+    Payment: ("user_id", "property_id", "due_date", "payment_date"),
+    Expense: ("user_id", "property_id", "date"),
+}
+
+_PENDING_KEYS = "monthly_rollup_keys"
+
+# unnest preserva a ordem do array: os locks são obtidos na ordem das chaves
+_LOCK_BUCKETS = text(
+    "SELECT pg_advisory_xact_lock(key) FROM unnest(CAST(:keys AS bigint[])) AS key"
+)
+
+
+def _month_of(column):
+    return cast(func.date_trunc("month", column), Date)
+
+
+def _keys_cte(keys: Sequence[RollupKey]):
+    """CTE com os buckets (user_id, property_id, month, next_month) a recalcular"""
+    rows = [
+        (user_id, property_id, month, month + relativedelta(months=1))
+        for user_id, property_id, month in keys
+    ]
+    return select(
+        values(
+            column("user_id", Integer),
+            column("property_id", Integer),
+            column("month", Date),
+            column("next_month", Date),
+            name="rollup_key_values",
+        ).data(rows)
+    ).cte("rollup_keys")
+
+
+def _aggregate(model, date_column, aggregates, conditions, keys, user_id, extra=()):
+    """
+    Agregados por bucket: só dos buckets em `keys` (junção pelo intervalo do mês,
+    que usa os índices por usuário/data) ou de todos, opcionalmente de um usuário
+    """
+    if keys is not None:
+        query = (
+            select(keys.c.user_id, keys.c.property_id, keys.c.month, *extra, *aggregates)
+            .select_from(keys)
+            .join(
+                model,
+                and_(
+                    model.user_id == keys.c.user_id,
+                    model.property_id == keys.c.property_id,
+                    date_column >= keys.c.month,
+                    date_column < keys.c.next_month,
+                ),
+            )
+            .group_by(keys.c.user_id, keys.c.property_id, keys.c.month, *extra)
+        )
+    else:
+        month = _month_of(date_column)
+        query = select(
+            model.user_id, model.property_id, month.label("month"), *extra, *aggregates
+        ).group_by(model.user_id, model.property_id, month, *extra)
+        if user_id is not None:
+            query = query.where(model.user_id == user_id)
+    return query.where(*conditions).subquery()
+
+
+def _upsert_statement(keys: Optional[Sequence[RollupKey]] = None, user_id: Optional[int] = None):
+    """
+    INSERT ... SELECT ... ON CONFLICT que recalcula buckets
+
+    Com `keys`, recalcula exatamente esses buckets em uma instrução, gravando
+    cada um mesmo zerado (para que exclusões também sejam refletidas). Sem
+    `keys`, recalcula todos os buckets com dados (de um usuário, se informado).
+    """
+    key_cte = _keys_cte(keys) if keys is not None else None
+
+    due = _aggregate(
+        Payment,
+        Payment.due_date,
+        [
+            func.sum(Payment.amount).label("expected_rent"),
+            func.count().filter(Payment.status == "paid").label("payments_paid"),
+            func.count().filter(Payment.status == "pending").label("payments_pending"),
+            func.count().filter(Payment.status == "overdue").label("payments_overdue"),
+            func.count().filter(Payment.status == "partial").label("payments_partial"),
+        ],
+        [],
+        key_cte,
+        user_id,
+    )
+    paid = _aggregate(
+        Payment,
+        Payment.payment_date,
+        [func.sum(Payment.amount).label("revenue_received")],
+        [Payment.status == "paid", Payment.payment_date.isnot(None)],
+        key_cte,
+        user_id,
+    )
+    by_category = _aggregate(
+        Expense,
+        Expense.date,
+        [func.sum(Expense.amount).label("total")],
+        [],
+        key_cte,
+        user_id,
+        extra=(Expense.category,),
+    )
+    expenses = (
+        select(
+            by_category.c.user_id,
+            by_category.c.property_id,
+            by_category.c.month,
+            func.sum(by_category.c.total).label("expenses_total"),
+            func.jsonb_object_agg(by_category.c.category, by_category.c.total).label(
+                "expenses_by_category"
+            ),
+        )
+        .group_by(by_category.c.user_id, by_category.c.property_id, by_category.c.month)
+        .subquery()
+    )
+
+    if key_cte is not None:
+        bucket_keys = select(key_cte.c.user_id, key_cte.c.property_id, key_cte.c.month).subquery()
+    else:
+        bucket_keys = union(
+            select(due.c.user_id, due.c.property_id, due.c.month),
+            select(paid.c.user_id, paid.c.property_id, paid.c.month),
+            select(expenses.c.user_id, expenses.c.property_id, expenses.c.month),
+        ).subquery()
+
+    def _joined(subquery):
+        return and_(
+            subquery.c.user_id == bucket_keys.c.user_id,
+            subquery.c.property_id == bucket_keys.c.property_id,
+            subquery.c.month == bucket_keys.c.month,
+        )
+
+    rows = (
+        select(
+            bucket_keys.c.user_id,
+            bucket_keys.c.property_id,
+            bucket_keys.c.month,
+            func.coalesce(paid.c.revenue_received, 0),
+            func.coalesce(due.c.expected_rent, 0),
+            func.coalesce(expenses.c.expenses_total, 0),
+            func.coalesce(expenses.c.expenses_by_category, cast(literal("{}"), JSONB)),
+            func.coalesce(due.c.payments_paid, 0),
+            func.coalesce(due.c.payments_pending, 0),
+            func.coalesce(due.c.payments_overdue, 0),
+            func.coalesce(due.c.payments_partial, 0),
+            literal(datetime.utcnow(), DateTime),
+        )
+        .select_from(bucket_keys)
+        .outerjoin(due, _joined(due))
+        .outerjoin(paid, _joined(paid))
+        .outerjoin(expenses, _joined(expenses))
+    )
+
+    columns = [
+        "user_id",
+        "property_id",
+        "month",
+        "revenue_received",
+        "expected_rent",
+        "expenses_total",
+        "expenses_by_category",
+        "payments_paid",
+        "payments_pending",
+        "payments_overdue",
+        "payments_partial",
+        "updated_at",
+    ]
+    statement = insert(MonthlyRollup).from_select(columns, rows)
+    return statement.on_conflict_do_update(
+        index_elements=["user_id", "property_id", "month"],
+        set_={name: statement.excluded[name] for name in columns[3:]},
+    )
+
+
+class MonthlyRollupService:
+    """Serviço para manter e reconstruir a tabela monthly_rollups"""
+
+    @staticmethod
+    def lock_key(key: RollupKey) -> int:
+        """Chave bigint estável do advisory lock de um bucket"""
+        user_id, property_id, month = key
+        digest = hashlib.sha1(f"rollup:{user_id}:{property_id}:{month}".encode()).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
+    @classmethod
+    def refresh(cls, db: Any, keys: Iterable[RollupKey]) -> int:
+        """
+        Recalcula os buckets informados
+
+        Cada bucket é recalculado sob um advisory lock de transação: uma
+        transação concorrente que escreveu no mesmo bucket espera o commit desta
+        e recalcula com um snapshot novo (READ COMMITTED) que já inclui as linhas
+        dela, em vez de sobrescrever o bucket com um total sem essas linhas.
+        Os locks são obtidos em ordem fixa; todos os buckets vão em uma instrução.
+
+        Args:
+            db: Sessão ou conexão síncrona (mesma transação da escrita)
+            keys: Chaves (user_id, property_id, mês)
+
+        Returns:
+            Número de buckets recalculados
+        """
+        unique_keys = sorted(set(keys))
+        if not unique_keys:
+            return 0
+        lock_keys = sorted({cls.lock_key(key) for key in unique_keys})
+        db.execute(_LOCK_BUCKETS, {"keys": lock_keys})
+        db.execute(_upsert_statement(keys=unique_keys))
+        return len(unique_keys)
+
+    @staticmethod
+    def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+        """
+        Reconstrói os rollups a partir de payments e expenses (backfill)
+
+        Args:
+            db: Sessão do banco
+            user_id: Limitar a um usuário (padrão: todos)
+
+        Returns:
+            Número de buckets gravados
+        """
+        clear = delete(MonthlyRollup)
+        if user_id is not None:
+            clear = clear.where(MonthlyRollup.user_id == user_id)
+        db.execute(clear)
+        result = db.execute(_upsert_statement(user_id=user_id))
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def keys_for(obj: Any, previous: bool = False) -> Set[RollupKey]:
+        """
+        Buckets afetados por um Payment ou Expense
+
+        Args:
+            obj: Instância de Payment ou Expense
+            previous: Usar os valores anteriores à alteração (histórico do ORM)
+        """
+
+        def value(attr: str):
+            if previous:
+                history = inspect(obj).attrs[attr].history
+                if history.deleted:
+                    return history.deleted[0]
+            return getattr(obj, attr)
+
+        if isinstance(obj, Payment):
+            dates = [value("due_date"), value("payment_date")]
+        else:
+            dates = [value("date")]
+
+        return MonthlyRollupService.keys_for_row(value("user_id"), value("property_id"), *dates)
+
+    @staticmethod
+    def keys_for_row(user_id: Optional[int], property_id: Optional[int], *dates) -> Set[RollupKey]:
+        """
+        Buckets afetados por uma linha (ex.: retornada por UPDATE ... RETURNING)
+
+        Args:
+            user_id: ID do usuário
+            property_id: ID do imóvel
+            dates: Datas da linha (vencimento, pagamento ou data da despesa)
+        """
+        if user_id is None or property_id is None:
+            return set()
+        return {(user_id, property_id, d.replace(day=1)) for d in dates if d is not None}
+
+
+def _noop_set_listener(target, value, oldvalue, initiator):
+    return value
+
+
+# active_history=True garante que o valor antigo esteja no histórico mesmo que o
+# atributo tenha sido expirado, para que o bucket anterior também seja recalculado
+for _model, _attributes in _KEY_ATTRIBUTES.items():
+    for _attribute in _attributes:
+        event.listen(
+            getattr(_model, _attribute),
+            "set",
+            _noop_set_listener,
+            active_history=True,
+            retval=True,
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_rollup_keys(session: Session, flush_context, instances) -> None:
+    """Coleta os buckets afetados enquanto as linhas ainda podem ser lidas"""
+    keys: Set[RollupKey] = set()
+
+    for obj in session.new:
+        if isinstance(obj, (Payment, Expense)):
+            keys |= MonthlyRollupService.keys_for(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, (Payment, Expense)) and session.is_modified(obj):
+            keys |= MonthlyRollupService.keys_for(obj)
+            keys |= MonthlyRollupService.keys_for(obj, previous=True)
+
+    for obj in session.deleted:
+        if isinstance(obj, (Payment, Expense)):
+            keys |= MonthlyRollupService.keys_for(obj, previous=True)
+
+    if keys:
+        session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_rollups(session: Session, flush_context) -> None:
+    """Recalcula os buckets na mesma transação, logo após o flush"""
+    keys = session.info.pop(_PENDING_KEYS, None)
+    if keys:
+        MonthlyRollupService.refresh(session.connection(), keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollup_keys(session: Session) -> None:
+    session.info.pop(_PENDING_KEYS, None)
+
+
+@on_bulk_write(Payment, Expense)
+def _refresh_rollups_after_bulk_write(db: Session, model: type, rows) -> None:
+    """Recalcula os buckets das linhas afetadas por uma operação em lote"""
+    keys: Set[RollupKey] = set()
+    for row in rows:
+        dates = [row["due_date"], row["payment_date"]] if model is Payment else [row["date"]]
+        keys |= MonthlyRollupService.keys_for_row(row["user_id"], row["property_id"], *dates)
+    MonthlyRollupService.refresh(db, keys)
+
+
+def main() -> None:
+    """Entry point de linha de comando para o backfill dos rollups"""
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Reconstrói a tabela monthly_rollups")
+    parser.add_argument("--user-id", type=int, default=None, help="Limitar a um usuário")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = MonthlyRollupService.rebuild(db, user_id=args.user_id)
+        print(f"✅ {count} buckets de rollup reconstruídos")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
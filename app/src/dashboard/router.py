@@ -1,52 +1,47 @@
-from datetime import date, timedelta
+from calendar import monthrange
+from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user_id_from_token
-from app.db.session import get_db
-from app.src.contracts.models import Contract
+from app.db.session import get_async_read_db
+from app.src.contracts.repository import AsyncContractRepository
 from app.src.expenses.models import Expense
 from app.src.payments.models import Payment
-from app.src.payments.repository import PaymentRepository
-from app.src.properties.models import Property
-from app.src.properties.repository import PropertyRepository
-from app.src.tenants.models import Tenant
+from app.src.payments.repository import AsyncPaymentRepository
+from app.src.properties.repository import AsyncPropertyRepository
+from app.src.tenants.repository import AsyncTenantRepository
+
+from .cache import cached_response
+from .service import DashboardAggregationService
 
 router = APIRouter()
 
 
 @router.get("/stats")
+@cached_response("dashboard:stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id_from_token)
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(get_current_user_id_from_token),
 ):
     """Obter estatísticas básicas do dashboard (filtrado por usuário)"""
 
+    contract_repo = AsyncContractRepository(db)
+
     # Contar propriedades do usuário
-    total_properties = (
-        db.query(func.count(Property.id)).filter(Property.user_id == user_id).scalar() or 0
-    )
+    total_properties = await AsyncPropertyRepository(db).count_by_user(db, user_id)
 
     # Contar inquilinos do usuário
-    total_tenants = db.query(func.count(Tenant.id)).filter(Tenant.user_id == user_id).scalar() or 0
+    total_tenants = await AsyncTenantRepository(db).count_by_user(db, user_id)
 
     # Contar contratos ativos do usuário
-    total_contracts = (
-        db.query(func.count(Contract.id))
-        .filter(Contract.user_id == user_id, Contract.status == "active")
-        .scalar()
-        or 0
-    )
+    total_contracts = await contract_repo.count_active(db, user_id)
 
     # Receita mensal (soma dos aluguéis de contratos ativos)
-    monthly_revenue = (
-        db.query(func.sum(Contract.rent))
-        .filter(Contract.user_id == user_id, Contract.status == "active")
-        .scalar()
-        or 0.0
-    )
+    monthly_revenue = await contract_repo.sum_active_rent(db, user_id)
 
     return {
         "total_properties": total_properties,
@@ -57,52 +52,32 @@ async def get_dashboard_stats(
 
 
 @router.get("/summary")
+@cached_response("dashboard:summary")
 async def get_dashboard_summary(
-    db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id_from_token)
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(get_current_user_id_from_token),
 ):
     """Obter resumo completo do dashboard (filtrado por usuário)"""
 
-    payment_repo = PaymentRepository(db)
+    payment_repo = AsyncPaymentRepository(db)
+    contract_repo = AsyncContractRepository(db)
 
     # Contadores básicos
-    total_properties = (
-        db.query(func.count(Property.id)).filter(Property.user_id == user_id).scalar() or 0
-    )
+    total_properties = await AsyncPropertyRepository(db).count_by_user(db, user_id)
 
-    active_contracts = (
-        db.query(func.count(Contract.id))
-        .filter(Contract.user_id == user_id, Contract.status == "active")
-        .scalar()
-        or 0
-    )
+    active_contracts = await contract_repo.count_active(db, user_id)
 
     # Contratos vencendo em 30 dias
-    expiring_date = date.today() + timedelta(days=30)
-    expiring_soon = (
-        db.query(func.count(Contract.id))
-        .filter(
-            Contract.user_id == user_id,
-            Contract.status == "active",
-            Contract.end_date <= expiring_date,
-            Contract.end_date >= date.today(),
-        )
-        .scalar()
-        or 0
-    )
+    expiring_soon = await contract_repo.count_expiring(db, user_id, days_ahead=30)
 
     # Receita mensal esperada (soma dos aluguéis ativos)
-    monthly_revenue = (
-        db.query(func.sum(Contract.rent))
-        .filter(Contract.user_id == user_id, Contract.status == "active")
-        .scalar()
-        or 0.0
-    )
+    monthly_revenue = await contract_repo.sum_active_rent(db, user_id)
 
     # Pagamentos em atraso
-    overdue_payments = len(payment_repo.get_overdue_payments(db, user_id))
+    overdue_payments = await payment_repo.count_overdue(db, user_id)
 
     # Pagamentos pendentes
-    pending_payments = len(payment_repo.get_pending_payments(db, user_id))
+    pending_payments = await payment_repo.count_pending(db, user_id)
 
     return {
         "properties": {"total": total_properties, "active_contracts": active_contracts},
@@ -116,145 +91,75 @@ async def get_dashboard_summary(
 
 
 @router.get("/revenue-chart")
+@cached_response("dashboard:revenue-chart")
 async def get_revenue_chart(
     months: int = Query(default=12, ge=1, le=24),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user_id: int = Depends(get_current_user_id_from_token),
 ):
     """Obter dados para gráfico de receitas (filtrado por usuário)"""
-    chart_data = []
-    current_date = date.today()
-
-    for i in range(months):
-        target_date = current_date - timedelta(days=30 * i)
-        month = target_date.month
-        year = target_date.year
-
-        # Primeiro e último dia do mês
-        from calendar import monthrange
-
-        first_day = date(year, month, 1)
-        last_day = date(year, month, monthrange(year, month)[1])
-
-        # Somar pagamentos recebidos no mês
-        revenue = (
-            db.query(func.sum(Payment.amount))
-            .filter(
-                Payment.user_id == user_id,
-                Payment.status == "paid",
-                Payment.payment_date >= first_day,
-                Payment.payment_date <= last_day,
-            )
-            .scalar()
-            or 0.0
-        )
-
-        chart_data.append({"month": f"{year}-{month:02d}", "revenue": float(revenue)})
+    # Série mensal completa (meses do calendário) em uma única consulta
+    chart_data = await DashboardAggregationService.get_monthly_series(
+        db, user_id, months, include_expenses=False
+    )
 
-    return {"data": list(reversed(chart_data))}
+    return {"data": chart_data}
 
 
 @router.get("/property-performance")
+@cached_response("dashboard:property-performance")
 async def get_property_performance(
-    db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id_from_token)
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(get_current_user_id_from_token),
 ):
     """Obter performance das propriedades do usuário"""
-    property_repo = PropertyRepository(db)
-
-    # Buscar todas as propriedades do usuário
-    properties = property_repo.get_by_user(db, user_id, skip=0, limit=1000)
-    performance_data = []
-
     current_month = date.today().month
     current_year = date.today().year
 
     # Primeiro e último dia do mês
-    from calendar import monthrange
-
     first_day = date(current_year, current_month, 1)
     last_day = date(current_year, current_month, monthrange(current_year, current_month)[1])
 
-    for prop in properties:
-        # Contar contratos ativos para esta propriedade
-        active_contracts = (
-            db.query(func.count(Contract.id))
-            .filter(
-                Contract.user_id == user_id,
-                Contract.property_id == prop.id,
-                Contract.status == "active",
-            )
-            .scalar()
-            or 0
-        )
-
-        # Receita da propriedade no mês (pagamentos recebidos)
-        revenue = (
-            db.query(func.sum(Payment.amount))
-            .filter(
-                Payment.user_id == user_id,
-                Payment.property_id == prop.id,
-                Payment.status == "paid",
-                Payment.payment_date >= first_day,
-                Payment.payment_date <= last_day,
-            )
-            .scalar()
-            or 0.0
-        )
-
-        # Receita esperada (soma dos aluguéis dos contratos ativos)
-        expected_revenue = (
-            db.query(func.sum(Contract.rent))
-            .filter(
-                Contract.user_id == user_id,
-                Contract.property_id == prop.id,
-                Contract.status == "active",
-            )
-            .scalar()
-            or 0.0
-        )
+    # Métricas de todos os imóveis em uma única consulta agrupada
+    metrics = await DashboardAggregationService.get_property_metrics(
+        db, user_id, first_day, last_day
+    )
 
-        performance_data.append(
-            {
-                "property_id": prop.id,
-                "property_name": prop.name,
-                "property_address": prop.address,
-                "active_contracts": active_contracts,
-                "revenue_received": float(revenue),
-                "revenue_expected": float(expected_revenue),
-                "collection_rate": round(
-                    (revenue / expected_revenue * 100) if expected_revenue > 0 else 0, 2
-                ),
-            }
-        )
+    performance_data = [
+        {
+            "property_id": prop["id"],
+            "property_name": prop["name"],
+            "property_address": prop["address"],
+            "active_contracts": prop["active_contracts"],
+            "revenue_received": prop["revenue_received"],
+            "revenue_expected": prop["expected_revenue"],
+            "collection_rate": round(
+                (prop["revenue_received"] / prop["expected_revenue"] * 100)
+                if prop["expected_revenue"] > 0
+                else 0,
+                2,
+            ),
+        }
+        for prop in metrics
+    ]
 
     return {"properties": performance_data}
 
 
 @router.get("/recent-activity")
+@cached_response("dashboard:recent-activity")
 async def get_recent_activity(
     limit: int = Query(default=10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user_id: int = Depends(get_current_user_id_from_token),
 ):
     """Obter atividades recentes do usuário"""
 
     # Pagamentos recentes (últimos 5)
-    recent_payments = (
-        db.query(Payment)
-        .filter(Payment.user_id == user_id)
-        .order_by(Payment.created_at.desc())
-        .limit(limit // 2)
-        .all()
-    )
+    recent_payments = await AsyncPaymentRepository(db).get_recent(db, user_id, limit=limit // 2)
 
     # Contratos recentes (últimos 5)
-    recent_contracts = (
-        db.query(Contract)
-        .filter(Contract.user_id == user_id)
-        .order_by(Contract.created_at.desc())
-        .limit(limit // 2)
-        .all()
-    )
+    recent_contracts = await AsyncContractRepository(db).get_recent(db, user_id, limit=limit // 2)
 
     activities = []
 
@@ -293,12 +198,13 @@ async def get_recent_activity(
 
 
 @router.get("/revenue-vs-expenses")
+@cached_response("dashboard:revenue-vs-expenses")
 async def get_revenue_vs_expenses(
     months: int = Query(default=12, ge=1, le=24),
     property_id: Optional[int] = Query(
         default=None, description="Filtrar por propriedade específica"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user_id: int = Depends(get_current_user_id_from_token),
 ):
     """
@@ -311,60 +217,31 @@ async def get_revenue_vs_expenses(
 
     Com opção de filtrar por propriedade específica
     """
-    from calendar import monthrange
-
-    chart_data = []
-    current_date = date.today()
-
-    for i in range(months):
-        target_date = current_date - timedelta(days=30 * i)
-        month = target_date.month
-        year = target_date.year
-
-        # Primeiro e último dia do mês
-        first_day = date(year, month, 1)
-        last_day = date(year, month, monthrange(year, month)[1])
-
-        # Query base de receitas (pagamentos recebidos)
-        revenue_query = db.query(func.sum(Payment.amount)).filter(
-            Payment.user_id == user_id,
-            Payment.status == "paid",
-            Payment.payment_date >= first_day,
-            Payment.payment_date <= last_day,
-        )
-
-        # Query base de despesas
-        expense_query = db.query(func.sum(Expense.amount)).filter(
-            Expense.user_id == user_id, Expense.date >= first_day, Expense.date <= last_day
-        )
-
-        # Aplicar filtro de propriedade se fornecido
-        if property_id:
-            revenue_query = revenue_query.filter(Payment.property_id == property_id)
-            expense_query = expense_query.filter(Expense.property_id == property_id)
-
-        revenue = revenue_query.scalar() or 0.0
-        expenses = expense_query.scalar() or 0.0
-        profit = float(revenue) - float(expenses)
+    # Receitas e despesas por mês do calendário em uma única consulta
+    series = await DashboardAggregationService.get_monthly_series(
+        db, user_id, months, property_id=property_id
+    )
 
-        chart_data.append(
-            {
-                "month": f"{year}-{month:02d}",
-                "revenue": float(revenue),
-                "expenses": float(expenses),
-                "profit": profit,
-            }
-        )
+    chart_data = [
+        {
+            "month": item["month"],
+            "revenue": item["revenue"],
+            "expenses": item["expenses"],
+            "profit": item["revenue"] - item["expenses"],
+        }
+        for item in series
+    ]
 
-    return {"data": list(reversed(chart_data))}
+    return {"data": chart_data}
 
 
 @router.get("/financial-overview")
+@cached_response("dashboard:financial-overview")
 async def get_financial_overview(
     start_date: Optional[date] = Query(default=None, description="Data inicial (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(default=None, description="Data final (YYYY-MM-DD)"),
     property_id: Optional[int] = Query(default=None, description="Filtrar por propriedade"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user_id: int = Depends(get_current_user_id_from_token),
 ):
     """
@@ -377,8 +254,6 @@ async def get_financial_overview(
     - Breakdown por categoria de despesa
     - Status de pagamentos (pagos, pendentes, atrasados)
     """
-    from calendar import monthrange
-
     # Se não fornecido, usar mês atual
     if not start_date or not end_date:
         current_month = date.today().month
@@ -386,55 +261,67 @@ async def get_financial_overview(
         start_date = date(current_year, current_month, 1)
         end_date = date(current_year, current_month, monthrange(current_year, current_month)[1])
 
-    # Receitas no período
-    revenue_query = db.query(func.sum(Payment.amount)).filter(
-        Payment.user_id == user_id,
-        Payment.status == "paid",
-        Payment.payment_date >= start_date,
-        Payment.payment_date <= end_date,
-    )
+    if DashboardAggregationService.covers_whole_months(start_date, end_date):
+        # Meses inteiros: lê os totais pré-agregados em monthly_rollups
+        overview = await DashboardAggregationService.get_financial_overview(
+            db, user_id, start_date, end_date, property_id=property_id
+        )
+        total_revenue = overview["total_revenue"]
+        total_expenses = overview["total_expenses"]
+        expense_breakdown = list(overview["expense_breakdown"].items())
+        payment_stats = overview["payment_status"]
+    else:
+        # Receitas no período
+        revenue_query = select(func.sum(Payment.amount)).where(
+            Payment.user_id == user_id,
+            Payment.status == "paid",
+            Payment.payment_date >= start_date,
+            Payment.payment_date <= end_date,
+        )
 
-    # Despesas no período
-    expense_query = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == user_id, Expense.date >= start_date, Expense.date <= end_date
-    )
+        # Despesas no período
+        expense_query = select(func.sum(Expense.amount)).where(
+            Expense.user_id == user_id, Expense.date >= start_date, Expense.date <= end_date
+        )
 
-    # Aplicar filtro de propriedade
-    if property_id:
-        revenue_query = revenue_query.filter(Payment.property_id == property_id)
-        expense_query = expense_query.filter(Expense.property_id == property_id)
+        # Aplicar filtro de propriedade
+        if property_id:
+            revenue_query = revenue_query.where(Payment.property_id == property_id)
+            expense_query = expense_query.where(Expense.property_id == property_id)
 
-    total_revenue = revenue_query.scalar() or 0.0
-    total_expenses = expense_query.scalar() or 0.0
+        total_revenue = (await db.execute(revenue_query)).scalar() or 0.0
+        total_expenses = (await db.execute(expense_query)).scalar() or 0.0
 
-    # Breakdown de despesas por categoria
-    expense_categories_query = db.query(
-        Expense.category, func.sum(Expense.amount).label("total")
-    ).filter(Expense.user_id == user_id, Expense.date >= start_date, Expense.date <= end_date)
+        # Breakdown de despesas por categoria
+        expense_categories_query = select(
+            Expense.category, func.sum(Expense.amount).label("total")
+        ).where(Expense.user_id == user_id, Expense.date >= start_date, Expense.date <= end_date)
 
-    if property_id:
-        expense_categories_query = expense_categories_query.filter(
-            Expense.property_id == property_id
-        )
+        if property_id:
+            expense_categories_query = expense_categories_query.where(
+                Expense.property_id == property_id
+            )
 
-    expense_breakdown = expense_categories_query.group_by(Expense.category).all()
+        expense_breakdown = (
+            await db.execute(expense_categories_query.group_by(Expense.category))
+        ).all()
 
-    # Status dos pagamentos no período
-    payments_query = db.query(Payment).filter(
-        Payment.user_id == user_id, Payment.due_date >= start_date, Payment.due_date <= end_date
-    )
+        # Status dos pagamentos no período (contagem agrupada no banco)
+        payments_query = select(Payment.status, func.count(Payment.id)).where(
+            Payment.user_id == user_id, Payment.due_date >= start_date, Payment.due_date <= end_date
+        )
 
-    if property_id:
-        payments_query = payments_query.filter(Payment.property_id == property_id)
+        if property_id:
+            payments_query = payments_query.where(Payment.property_id == property_id)
 
-    all_payments = payments_query.all()
+        status_counts = dict((await db.execute(payments_query.group_by(Payment.status))).all())
 
-    payment_stats = {
-        "paid": len([p for p in all_payments if p.status == "paid"]),
-        "pending": len([p for p in all_payments if p.status == "pending"]),
-        "overdue": len([p for p in all_payments if p.status == "overdue"]),
-        "partial": len([p for p in all_payments if p.status == "partial"]),
-    }
+        payment_stats = {
+            "paid": status_counts.get("paid", 0),
+            "pending": status_counts.get("pending", 0),
+            "overdue": status_counts.get("overdue", 0),
+            "partial": status_counts.get("partial", 0),
+        }
 
     return {
         "period": {"start_date": str(start_date), "end_date": str(end_date)},
@@ -460,8 +347,10 @@ async def get_financial_overview(
 
 
 @router.get("/properties-status")
+@cached_response("dashboard:properties-status")
 async def get_properties_status(
-    db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id_from_token)
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(get_current_user_id_from_token),
 ):
     """
     Obter status de todos os imóveis do usuário
@@ -473,77 +362,34 @@ async def get_properties_status(
     - Receita mensal esperada
     - Despesas do mês
     """
-    from calendar import monthrange
-
-    property_repo = PropertyRepository(db)
-    properties = property_repo.get_by_user(db, user_id, skip=0, limit=1000)
-
     current_month = date.today().month
     current_year = date.today().year
     first_day = date(current_year, current_month, 1)
     last_day = date(current_year, current_month, monthrange(current_year, current_month)[1])
 
-    properties_status = []
-
-    for prop in properties:
-        # Contratos ativos
-        active_contracts = (
-            db.query(Contract)
-            .filter(
-                Contract.user_id == user_id,
-                Contract.property_id == prop.id,
-                Contract.status == "active",
-            )
-            .all()
-        )
-
-        # Receita esperada (soma dos aluguéis)
-        expected_revenue = sum(c.rent for c in active_contracts) if active_contracts else 0.0
-
-        # Despesas do mês
-        monthly_expenses = (
-            db.query(func.sum(Expense.amount))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.property_id == prop.id,
-                Expense.date >= first_day,
-                Expense.date <= last_day,
-            )
-            .scalar()
-            or 0.0
-        )
-
-        # Receita recebida do mês
-        monthly_revenue = (
-            db.query(func.sum(Payment.amount))
-            .filter(
-                Payment.user_id == user_id,
-                Payment.property_id == prop.id,
-                Payment.status == "paid",
-                Payment.payment_date >= first_day,
-                Payment.payment_date <= last_day,
-            )
-            .scalar()
-            or 0.0
-        )
+    # Métricas de todos os imóveis em uma única consulta agrupada
+    metrics = await DashboardAggregationService.get_property_metrics(
+        db, user_id, first_day, last_day
+    )
 
-        properties_status.append(
-            {
-                "id": prop.id,
-                "name": prop.name,
-                "address": prop.address,
-                "type": prop.type,
-                "status": "occupied" if active_contracts else "vacant",
-                "active_contracts": len(active_contracts),
-                "expected_monthly_revenue": float(expected_revenue),
-                "received_monthly_revenue": float(monthly_revenue),
-                "monthly_expenses": float(monthly_expenses),
-                "net_profit": float(monthly_revenue) - float(monthly_expenses),
-            }
-        )
+    properties_status = [
+        {
+            "id": prop["id"],
+            "name": prop["name"],
+            "address": prop["address"],
+            "type": prop["type"],
+            "status": "occupied" if prop["active_contracts"] else "vacant",
+            "active_contracts": prop["active_contracts"],
+            "expected_monthly_revenue": prop["expected_revenue"],
+            "received_monthly_revenue": prop["revenue_received"],
+            "monthly_expenses": prop["expenses"],
+            "net_profit": prop["revenue_received"] - prop["expenses"],
+        }
+        for prop in metrics
+    ]
 
     # Estatísticas gerais
-    total_properties = len(properties)
+    total_properties = len(properties_status)
     occupied = len([p for p in properties_status if p["status"] == "occupied"])
     vacant = total_properties - occupied
 
@@ -0,0 +1,267 @@
+"""
+Agregações do dashboard calculadas em consultas agrupadas
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Date, DateTime, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.contracts.models import Contract
+from app.src.expenses.models import Expense
+from app.src.payments.models import Payment
+from app.src.properties.models import Property
+
+from .models import MonthlyRollup
+
+
+class DashboardAggregationService:
+    """Serviço de métricas do dashboard com número constante de consultas"""
+
+    @staticmethod
+    async def get_property_metrics(
+        db: AsyncSession,
+        user_id: int,
+        first_day: date,
+        last_day: date,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Calcula as métricas de todos os imóveis do usuário em uma única consulta
+
+        Cada agregado (contratos ativos, receita do período e despesas do período)
+        é agrupado por property_id em uma subconsulta e unido aos imóveis com
+        LEFT JOIN, de forma que a latência não cresce com o tamanho da carteira.
+
+        Args:
+            db: Sessão assíncrona do banco
+            user_id: ID do usuário
+            first_day: Início do período (inclusivo)
+            last_day: Fim do período (inclusivo)
+            limit: Número máximo de imóveis
+
+        Returns:
+            Lista de dicts com id, name, address, type, active_contracts,
+            expected_revenue, revenue_received e expenses
+        """
+        contracts = (
+            select(
+                Contract.property_id.label("property_id"),
+                func.count(Contract.id).label("active_contracts"),
+                func.sum(Contract.rent).label("expected_revenue"),
+            )
+            .where(Contract.user_id == user_id, Contract.status == "active")
+            .group_by(Contract.property_id)
+            .subquery()
+        )
+
+        revenue = (
+            select(
+                Payment.property_id.label("property_id"),
+                func.sum(Payment.amount).label("revenue_received"),
+            )
+            .where(
+                Payment.user_id == user_id,
+                Payment.status == "paid",
+                Payment.payment_date >= first_day,
+                Payment.payment_date <= last_day,
+            )
+            .group_by(Payment.property_id)
+            .subquery()
+        )
+
+        expenses = (
+            select(
+                Expense.property_id.label("property_id"),
+                func.sum(Expense.amount).label("expenses"),
+            )
+            .where(
+                Expense.user_id == user_id,
+                Expense.date >= first_day,
+                Expense.date <= last_day,
+            )
+            .group_by(Expense.property_id)
+            .subquery()
+        )
+
+        query = (
+            select(
+                Property.id,
+                Property.name,
+                Property.address,
+                Property.type,
+                func.coalesce(contracts.c.active_contracts, 0).label("active_contracts"),
+                func.coalesce(contracts.c.expected_revenue, 0).label("expected_revenue"),
+                func.coalesce(revenue.c.revenue_received, 0).label("revenue_received"),
+                func.coalesce(expenses.c.expenses, 0).label("expenses"),
+            )
+            .outerjoin(contracts, contracts.c.property_id == Property.id)
+            .outerjoin(revenue, revenue.c.property_id == Property.id)
+            .outerjoin(expenses, expenses.c.property_id == Property.id)
+            .where(Property.user_id == user_id)
+            .order_by(Property.id)
+            .limit(limit)
+        )
+
+        result = await db.execute(query)
+
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "address": row.address,
+                "type": row.type,
+                "active_contracts": int(row.active_contracts),
+                "expected_revenue": float(row.expected_revenue),
+                "revenue_received": float(row.revenue_received),
+                "expenses": float(row.expenses),
+            }
+            for row in result.all()
+        ]
+
+    @staticmethod
+    async def get_monthly_series(
+        db: AsyncSession,
+        user_id: int,
+        months: int,
+        property_id: Optional[int] = None,
+        include_expenses: bool = True,
+        today: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Série mensal de receitas (e despesas) dos últimos `months` meses
+
+        Os meses são gerados com generate_series a partir do primeiro dia do mês
+        corrente e unidos aos totais de monthly_rollups, de forma que cada mês do
+        calendário aparece exatamente uma vez, inclusive os vazios.
+
+        Args:
+            db: Sessão assíncrona do banco
+            user_id: ID do usuário
+            months: Quantidade de meses (incluindo o atual)
+            property_id: Filtrar por propriedade específica
+            include_expenses: Incluir a soma de despesas de cada mês
+            today: Data de referência (padrão: hoje)
+
+        Returns:
+            Lista ordenada do mês mais antigo ao atual com month (YYYY-MM),
+            revenue e, se solicitado, expenses
+        """
+        current_month = (today or date.today()).replace(day=1)
+        first_month = current_month - relativedelta(months=months - 1)
+
+        series = select(
+            func.generate_series(
+                cast(first_month, DateTime),
+                cast(current_month, DateTime),
+                literal_column("interval '1 month'"),
+            ).label("month")
+        ).subquery()
+
+        # Totais lidos de monthly_rollups: custo proporcional ao número de meses
+        totals = select(
+            MonthlyRollup.month.label("month"),
+            func.sum(MonthlyRollup.revenue_received).label("revenue"),
+            func.sum(MonthlyRollup.expenses_total).label("expenses"),
+        ).where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.month >= first_month,
+            MonthlyRollup.month <= current_month,
+        )
+        if property_id:
+            totals = totals.where(MonthlyRollup.property_id == property_id)
+        totals_sq = totals.group_by(MonthlyRollup.month).subquery()
+
+        query = (
+            select(
+                series.c.month,
+                func.coalesce(totals_sq.c.revenue, 0).label("revenue"),
+                func.coalesce(totals_sq.c.expenses, 0).label("expenses"),
+            )
+            .select_from(series)
+            .outerjoin(totals_sq, totals_sq.c.month == cast(series.c.month, Date))
+            .order_by(series.c.month)
+        )
+
+        result = await db.execute(query)
+
+        data = []
+        for row in result.all():
+            item: Dict[str, Any] = {
+                "month": f"{row.month.year}-{row.month.month:02d}",
+                "revenue": float(row.revenue),
+            }
+            if include_expenses:
+                item["expenses"] = float(row.expenses)
+            data.append(item)
+        return data
+
+    @staticmethod
+    def covers_whole_months(start_date: date, end_date: date) -> bool:
+        """Indica se o período começa no dia 1 e termina no último dia de um mês"""
+        return start_date.day == 1 and (end_date + timedelta(days=1)).day == 1
+
+    @staticmethod
+    async def get_financial_overview(
+        db: AsyncSession,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        property_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Totais financeiros do período a partir de monthly_rollups
+
+        Só deve ser usado quando o período cobre meses inteiros
+        (ver covers_whole_months); lê uma linha por imóvel e mês.
+
+        Args:
+            db: Sessão assíncrona do banco
+            user_id: ID do usuário
+            start_date: Primeiro dia do mês inicial
+            end_date: Último dia do mês final
+            property_id: Filtrar por propriedade específica
+
+        Returns:
+            Dict com total_revenue, total_expenses, expense_breakdown
+            ({categoria: total}) e payment_status (contagem por status)
+        """
+        query = select(
+            MonthlyRollup.revenue_received,
+            MonthlyRollup.expenses_total,
+            MonthlyRollup.expenses_by_category,
+            MonthlyRollup.payments_paid,
+            MonthlyRollup.payments_pending,
+            MonthlyRollup.payments_overdue,
+            MonthlyRollup.payments_partial,
+        ).where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.month >= start_date,
+            MonthlyRollup.month <= end_date,
+        )
+        if property_id:
+            query = query.where(MonthlyRollup.property_id == property_id)
+
+        total_revenue = Decimal(0)
+        total_expenses = Decimal(0)
+        breakdown: Dict[str, Decimal] = {}
+        payment_status = {"paid": 0, "pending": 0, "overdue": 0, "partial": 0}
+
+        for row in (await db.execute(query)).all():
+            total_revenue += row.revenue_received
+            total_expenses += row.expenses_total
+            for category, amount in (row.expenses_by_category or {}).items():
+                breakdown[category] = breakdown.get(category, Decimal(0)) + Decimal(str(amount))
+            payment_status["paid"] += row.payments_paid
+            payment_status["pending"] += row.payments_pending
+            payment_status["overdue"] += row.payments_overdue
+            payment_status["partial"] += row.payments_partial
+
+        return {
+            "total_revenue": total_revenue,
+            "total_expenses": total_expenses,
+            "expense_breakdown": breakdown,
+            "payment_status": payment_status,
+        }
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -10,6 +10,12 @@ from app.db.base import Base
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Despesas por período (listagem por ano/mês, dashboard, rollups) e paginação
+        # por cursor: WHERE user_id = ? AND (date, id) < (?, ?) ORDER BY date DESC, id DESC
+        Index("ix_expenses_user_date_id", "user_id", "date", "id"),
+        Index("ix_expenses_user_property_date", "user_id", "property_id", "date"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Integer, nullable=False, index=True)  # Reference to user in auth-api
@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id_from_token
 from app.core.upload_service import upload_service
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, keyset_page, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 from .repository import get_expense_repository
 from .schemas import ExpenseCreate, ExpenseResponse, ExpenseUpdate
@@ -36,14 +37,16 @@ async def create_expense(
 
 @router.get("/", response_model=List[ExpenseResponse])
 async def list_expenses(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     property_id: int = None,
     category: str = None,
     month: int = None,
     year: int = None,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Listar despesas do usuário autenticado"""
 
@@ -68,6 +71,14 @@ async def list_expenses(
 
         query = query.filter(extract("month", Expense.date) == month)
 
+    if cursor is not None:
+        # Mais recentes primeiro; (user_id, date, id) no índice ix_expenses_user_date_id
+        expenses, next_cursor = keyset_page(
+            query, [Expense.date, Expense.id], cursor, limit, descending=True
+        )
+        set_next_cursor(response, next_cursor)
+        return expenses
+
     expenses = query.offset(skip).limit(limit).all()
     return expenses
 
@@ -76,7 +87,7 @@ async def list_expenses(
 async def get_expense(
     expense_id: str,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Obter despesa por ID (apenas do usuário autenticado)"""
     expense_repo = get_expense_repository(db)
@@ -101,17 +112,15 @@ async def update_expense(
 ):
     """Atualizar despesa (apenas do usuário autenticado)"""
     expense_repo = get_expense_repository(db)
-    expense = expense_repo.get(db, expense_id)
+    # Checagem de dono (multi-tenancy) e escrita em uma instrução
+    updated_expense = expense_repo.update_returning(db, expense_id, user_id, expense_update)
+    if updated_expense:
+        return updated_expense
 
-    if not expense:
+    # Caminho de erro: distinguir despesa inexistente de despesa de outro usuário
+    if not expense_repo.get(db, expense_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa não encontrada")
-
-    # Verificar se a despesa pertence ao usuário (multi-tenancy)
-    if expense.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
-
-    updated_expense = expense_repo.update(db, db_obj=expense, obj_in=expense_update)
-    return updated_expense
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
 
 
 @router.delete("/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -122,21 +131,19 @@ async def delete_expense(
 ):
     """Deletar despesa (apenas do usuário autenticado)"""
     expense_repo = get_expense_repository(db)
-    expense = expense_repo.get(db, expense_id)
+    # Checagem de dono (multi-tenancy) e remoção em uma instrução
+    if expense_repo.delete_owned(db, expense_id, user_id):
+        return
 
-    if not expense:
+    # Caminho de erro: distinguir despesa inexistente de despesa de outro usuário
+    if not expense_repo.get(db, expense_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa não encontrada")
-
-    # Verificar se a despesa pertence ao usuário (multi-tenancy)
-    if expense.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
-
-    expense_repo.delete(db, id=expense_id)
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
 
 
 @router.get("/property/{property_id}/monthly", response_model=dict)
 async def get_monthly_expenses(
-    property_id: int, year: int, month: int, db: Session = Depends(get_db)
+    property_id: int, year: int, month: int, db: Session = Depends(get_read_db)
 ):
     """Obter despesas mensais de uma propriedade"""
     expense_repo = get_expense_repository(db)
@@ -162,7 +169,7 @@ async def get_monthly_expenses(
 
 @router.get("/categories/summary", response_model=dict)
 async def get_expenses_by_category(
-    property_id: int = None, year: int = None, month: int = None, db: Session = Depends(get_db)
+    property_id: int = None, year: int = None, month: int = None, db: Session = Depends(get_read_db)
 ):
     """Obter resumo de despesas por categoria"""
     expense_repo = get_expense_repository(db)
@@ -269,7 +276,7 @@ async def upload_expense_documents(
 async def list_expense_documents(
     expense_id: str,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Listar todos os documentos de uma despesa
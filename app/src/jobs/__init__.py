@@ -0,0 +1,4 @@
+# Jobs module (tabelas da fila de jobs e do agendador; operações em app.core)
+from .models import Job, SchedulerRun
+
+__all__ = ["Job", "SchedulerRun"]
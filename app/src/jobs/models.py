@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.base import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_DEAD = "dead"
+
+
+class Job(Base):
+    """Job da fila (payload JSON executado pelo handler registrado em `name`)"""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Lease: próximos jobs prontos de uma fila
+        Index("ix_jobs_queue_status_run_at", "queue", "status", "run_at"),
+        # Enfileiramento idempotente (ex.: um job por usuário e período)
+        Index("uq_jobs_dedupe_key", "dedupe_key", unique=True),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    queue = Column(String(50), nullable=False, default="default")
+    name = Column(String(100), nullable=False)  # Handler registrado com @job_handler
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default=JOB_QUEUED)  # queued/running/done/dead
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Não executar antes
+    locked_by = Column(String(100), nullable=True)  # Worker com o lease
+    locked_until = Column(DateTime, nullable=True)  # Fim do lease (renovado por heartbeat)
+    last_error = Column(Text, nullable=True)
+    dedupe_key = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class SchedulerRun(Base):
+    """Última execução de cada job periódico"""
+
+    __tablename__ = "scheduler_runs"
+
+    name = Column(String(100), primary_key=True)
+    last_started_at = Column(DateTime, nullable=True)
+    last_finished_at = Column(DateTime, nullable=True)
+    last_status = Column(String(20), nullable=True)  # running/success/failed
+    last_error = Column(Text, nullable=True)
+    last_duration_ms = Column(Integer, nullable=True)
+    last_run_by = Column(String(100), nullable=True)  # Réplica que executou
+    run_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
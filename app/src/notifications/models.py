@@ -1,13 +1,21 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
 
 from app.db.base import Base
 
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Listagem (unread_only, ORDER BY date DESC) e contagem de não lidas
+        Index("ix_notifications_user_read_status_date", "user_id", "read_status", "date"),
+        # Paginação por cursor: WHERE user_id = ? AND (date, id) < (?, ?) ORDER BY date DESC, id DESC
+        Index("ix_notifications_user_date_id", "user_id", "date", "id"),
+        # Idempotência: uma notificação por (usuário, tipo, entidade, janela de tempo)
+        Index("uq_notifications_idempotency_key", "idempotency_key", unique=True),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Integer, nullable=False, index=True)  # Reference to user in auth-api
@@ -24,5 +32,6 @@ class Notification(Base):
     related_type = Column(
         String(50), nullable=True
     )  # 'contract', 'payment', 'maintenance', 'property'
+    idempotency_key = Column(String(255), nullable=True)  # user_id:type:related_id:marco do evento
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
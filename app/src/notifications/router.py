@@ -1,10 +1,11 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id_from_token
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, keyset_page, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 from .controller import notification_controller
 from .models import Notification
@@ -25,13 +26,15 @@ async def create_notification(
 
 @router.get("/", response_model=List[NotificationResponse])
 async def list_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     unread_only: bool = False,
     type: Optional[str] = None,
     priority: Optional[str] = None,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Listar notificações do usuário
@@ -40,6 +43,7 @@ async def list_notifications(
     - unread_only: Apenas não lidas
     - type: Filtrar por tipo
     - priority: Filtrar por prioridade
+    - cursor: Paginação por cursor (próximo cursor no header X-Next-Cursor)
     """
     query = db.query(Notification).filter(Notification.user_id == user_id)
 
@@ -52,6 +56,13 @@ async def list_notifications(
     if priority:
         query = query.filter(Notification.priority == priority)
 
+    if cursor is not None:
+        notifications, next_cursor = keyset_page(
+            query, [Notification.date, Notification.id], cursor, limit, descending=True
+        )
+        set_next_cursor(response, next_cursor)
+        return notifications
+
     return query.order_by(Notification.date.desc()).offset(skip).limit(limit).all()
 
 
@@ -59,7 +70,7 @@ async def list_notifications(
 async def get_unread_notifications(
     limit: int = 50,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Buscar apenas notificações não lidas"""
     from app.core.notification_service import NotificationService
@@ -69,7 +80,7 @@ async def get_unread_notifications(
 
 @router.get("/count/unread")
 async def count_unread_notifications(
-    user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_read_db)
 ):
     """Contar notificações não lidas"""
     count = (
@@ -122,7 +133,7 @@ async def cleanup_old_notifications(
     return {"deleted_count": count}
 
 
-@router.post("/process-background-tasks")
+@router.post("/process-background-tasks", deprecated=True)
 async def process_background_tasks(
     user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_db)
 ):
@@ -134,6 +145,10 @@ async def process_background_tasks(
     - Gera notificações de contratos vencendo
     - Gera lembretes de pagamento
     - Gera notificações de atraso
+
+    Obsoleto: as tarefas rodam para todos os usuários no worker
+    (python -m app.worker). Mantido para clientes existentes; executa as
+    mesmas etapas em lote do worker, restritas ao usuário autenticado.
     """
     from app.core.background_tasks import BackgroundTasksService
 
@@ -145,7 +160,7 @@ async def process_background_tasks(
 async def get_notification(
     notification_id: str,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Obter notificação por ID"""
     notification = (
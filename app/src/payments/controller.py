@@ -1,5 +1,5 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from dateutil.relativedelta import relativedelta
 from fastapi import HTTPException
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.src.contracts.repository import ContractRepository
 
 from .repository import PaymentRepository
-from .schemas import PaymentBulkCreate, PaymentCreate, PaymentResponse, PaymentUpdate
+from .schemas import PaymentBulkCreate, PaymentCreate, PaymentFilter, PaymentResponse, PaymentUpdate
 
 
 class payment_controller:
@@ -25,27 +25,22 @@ class payment_controller:
         user_id: int,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[str] = None,
-        property_id: Optional[int] = None,
-        tenant_id: Optional[int] = None,
-        contract_id: Optional[int] = None,
+        filters: Optional[PaymentFilter] = None,
     ) -> List[PaymentResponse]:
-        """Listar pagamentos com filtros"""
-        if status:
-            payments = self.repository.get_by_status(db, user_id, status)
-        elif property_id:
-            payments = self.repository.get_by_property(db, user_id, property_id)
-        elif tenant_id:
-            payments = self.repository.get_by_tenant(db, user_id, tenant_id)
-        elif contract_id:
-            payments = self.repository.get_by_contract(db, user_id, contract_id)
-        else:
-            payments = self.repository.get_by_user(db, user_id, skip=skip, limit=limit)
-
-        return (
-            payments[skip : skip + limit]
-            if not any([status, property_id, tenant_id, contract_id])
-            else payments
+        """Listar pagamentos com filtros combinados (filtros, ordem e paginação no SQL)"""
+        return self.repository.search_payments(db, user_id, filters, skip=skip, limit=limit)
+
+    def get_payments_page(
+        self,
+        db: Session,
+        user_id: int,
+        cursor: Optional[str],
+        limit: int = 100,
+        filters: Optional[PaymentFilter] = None,
+    ) -> Tuple[List[PaymentResponse], Optional[str]]:
+        """Listar pagamentos por cursor (filtros combinados)"""
+        return self.repository.get_page_by_user(
+            db, user_id, cursor=cursor, limit=limit, filters=filters
         )
 
     def get_payment_by_id(self, db: Session, payment_id: int, user_id: int) -> PaymentResponse:
@@ -92,30 +87,24 @@ class payment_controller:
             )
             payment_dict = payment_data.dict()
             payment_dict["user_id"] = user_id
-            payment = self.repository.create(db, obj_in=payment_dict)
-            payments.append(payment)
+            payments.append(payment_dict)
             current_date = current_date + relativedelta(months=1)
 
-        return payments
+        # Um INSERT multi-linha e um commit para todos os meses
+        return self.repository.bulk_create(db, objs_in=payments)
 
     def update_payment(
         self, db: Session, payment_id: int, user_id: int, payment_data: PaymentUpdate
     ) -> PaymentResponse:
-        """Atualizar pagamento"""
-        payment_obj = self.repository.get_by_id_and_user(db, payment_id, user_id)
+        """Atualizar pagamento (checagem de dono e escrita em uma instrução)"""
+        payment_obj = self.repository.update_returning(db, payment_id, user_id, payment_data)
         if not payment_obj:
             raise HTTPException(status_code=404, detail="Pagamento não encontrado")
-
-        return self.repository.update(db, db_obj=payment_obj, obj_in=payment_data)
+        return payment_obj
 
     def delete_payment(self, db: Session, payment_id: int, user_id: int) -> dict:
-        """Deletar pagamento"""
-        payment_obj = self.repository.get_by_id_and_user(db, payment_id, user_id)
-        if not payment_obj:
-            raise HTTPException(status_code=404, detail="Pagamento não encontrado")
-
-        success = self.repository.delete(db, id=payment_id)
-        if not success:
+        """Deletar pagamento (checagem de dono e remoção em uma instrução)"""
+        if not self.repository.delete_owned(db, payment_id, user_id):
             raise HTTPException(status_code=404, detail="Pagamento não encontrado")
         return {"message": "Pagamento deletado com sucesso"}
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -8,6 +8,16 @@ from app.db.base import Base
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Status + vencimento: atrasados/pendentes, lembretes e contagens do dashboard
+        Index("ix_payments_user_status_due_date", "user_id", "status", "due_date"),
+        # Receita por período (dashboard, rollups, filtros por data de pagamento)
+        Index("ix_payments_user_payment_date", "user_id", "payment_date"),
+        # Atividades recentes (ORDER BY created_at DESC)
+        Index("ix_payments_user_created_at", "user_id", "created_at"),
+        # Paginação por cursor: WHERE user_id = ? AND id > ? ORDER BY id
+        Index("ix_payments_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)  # Reference to user in auth-api
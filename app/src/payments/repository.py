@@ -1,12 +1,15 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.base_repository import BaseRepository
+from app.db.base_repository import AsyncBaseRepository, BaseRepository
+from app.db.pagination import keyset_page
 
 from .models import Payment
-from .schemas import PaymentCreate, PaymentUpdate
+from .schemas import PaymentCreate, PaymentFilter, PaymentUpdate
 
 
 class PaymentRepository(BaseRepository[Payment, PaymentCreate, PaymentUpdate]):
@@ -22,6 +25,60 @@ class PaymentRepository(BaseRepository[Payment, PaymentCreate, PaymentUpdate]):
         """Buscar pagamentos do usuário"""
         return db.query(Payment).filter(Payment.user_id == user_id).offset(skip).limit(limit).all()
 
+    def filter_query(self, db: Session, user_id: int, filters: Optional[PaymentFilter] = None):
+        """
+        Consulta dos pagamentos do usuário com qualquer combinação de filtros
+
+        Todos os critérios de PaymentFilter viram predicados SQL (AND); nenhum
+        filtro é aplicado em Python.
+        """
+        query = db.query(Payment).filter(Payment.user_id == user_id)
+        if filters is None:
+            return query
+
+        # (valor do filtro, predicado) aplicados apenas quando o valor foi informado
+        criteria = [
+            (filters.status, lambda v: Payment.status == v),
+            (filters.property_id, lambda v: Payment.property_id == v),
+            (filters.tenant_id, lambda v: Payment.tenant_id == v),
+            (filters.contract_id, lambda v: Payment.contract_id == v),
+            (filters.payment_method, lambda v: Payment.payment_method == v),
+            (filters.due_date_from, lambda v: Payment.due_date >= v),
+            (filters.due_date_to, lambda v: Payment.due_date <= v),
+            (filters.payment_date_from, lambda v: Payment.payment_date >= v),
+            (filters.payment_date_to, lambda v: Payment.payment_date <= v),
+        ]
+        return query.filter(*[predicate(value) for value, predicate in criteria if value])
+
+    def search_payments(
+        self,
+        db: Session,
+        user_id: int,
+        filters: Optional[PaymentFilter] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Payment]:
+        """Buscar pagamentos com filtros combinados, ordenação e paginação no SQL"""
+        return (
+            self.filter_query(db, user_id, filters)
+            .order_by(Payment.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def get_page_by_user(
+        self,
+        db: Session,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[PaymentFilter] = None,
+    ) -> Tuple[List[Payment], Optional[str]]:
+        """Página por cursor dos pagamentos do usuário (ordem por id), com filtros combinados"""
+        query = self.filter_query(db, user_id, filters)
+        return keyset_page(query, [Payment.id], cursor, limit)
+
     def get_by_id_and_user(self, db: Session, payment_id: int, user_id: int) -> Optional[Payment]:
         """Buscar pagamento por ID validando owner"""
         return (
@@ -127,3 +184,77 @@ class PaymentRepository(BaseRepository[Payment, PaymentCreate, PaymentUpdate]):
                 db.refresh(payment_obj)
                 return payment_obj
         return None
+
+
+class AsyncPaymentRepository(AsyncBaseRepository[Payment, PaymentCreate, PaymentUpdate]):
+    """Repository assíncrono para operações com pagamentos"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Payment)
+        self.db = db
+
+    async def get_by_user(
+        self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Payment]:
+        """Buscar pagamentos do usuário"""
+        result = await db.execute(
+            select(Payment).where(Payment.user_id == user_id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id_and_user(
+        self, db: AsyncSession, payment_id: int, user_id: int
+    ) -> Optional[Payment]:
+        """Buscar pagamento por ID validando owner"""
+        result = await db.execute(
+            select(Payment).where(Payment.id == payment_id, Payment.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def get_overdue_payments(self, db: AsyncSession, user_id: int) -> List[Payment]:
+        """Buscar pagamentos em atraso (filtrando por usuário)"""
+        result = await db.execute(
+            select(Payment).where(
+                Payment.user_id == user_id,
+                Payment.status.in_(["pending", "partial"]),
+                Payment.due_date < date.today(),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_pending_payments(self, db: AsyncSession, user_id: int) -> List[Payment]:
+        """Buscar pagamentos pendentes (filtrando por usuário)"""
+        result = await db.execute(
+            select(Payment).where(Payment.user_id == user_id, Payment.status == "pending")
+        )
+        return list(result.scalars().all())
+
+    async def count_overdue(self, db: AsyncSession, user_id: int) -> int:
+        """Contar pagamentos em atraso sem carregar as linhas"""
+        result = await db.execute(
+            select(func.count(Payment.id)).where(
+                Payment.user_id == user_id,
+                Payment.status.in_(["pending", "partial"]),
+                Payment.due_date < date.today(),
+            )
+        )
+        return result.scalar() or 0
+
+    async def count_pending(self, db: AsyncSession, user_id: int) -> int:
+        """Contar pagamentos pendentes sem carregar as linhas"""
+        result = await db.execute(
+            select(func.count(Payment.id)).where(
+                Payment.user_id == user_id, Payment.status == "pending"
+            )
+        )
+        return result.scalar() or 0
+
+    async def get_recent(self, db: AsyncSession, user_id: int, limit: int = 5) -> List[Payment]:
+        """Buscar pagamentos criados mais recentemente"""
+        result = await db.execute(
+            select(Payment)
+            .where(Payment.user_id == user_id)
+            .order_by(Payment.created_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
@@ -1,26 +1,29 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id_from_token
+from app.core.logger import get_logger
 from app.core.notification_service import NotificationService
 from app.core.payment_service import PaymentCalculationService
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, set_next_cursor
+from app.db.session import get_db, get_read_db
 from app.src.contracts.models import Contract
-from app.src.payments.models import Payment
 
 from .controller import payment_controller
 from .schemas import (
     PaymentCalculateRequest,
     PaymentCalculateResponse,
     PaymentCreate,
+    PaymentFilter,
     PaymentRegisterRequest,
     PaymentResponse,
     PaymentUpdate,
 )
 
 router = APIRouter()
+logger = get_logger(__name__)
 
 
 @router.post("/calculate", response_model=PaymentCalculateResponse)
@@ -123,21 +126,17 @@ async def create_payment(
 ):
     """Criar novo pagamento"""
     try:
-        print(f"🔹 Criando pagamento para user_id: {user_id}")
-        print(f"🔹 Dados: {payment.dict()}")
+        logger.debug("Criando pagamento", extra={"user_id": user_id})
 
         controller = payment_controller(db)
         result = controller.create_payment(db, user_id, payment)
 
-        print(f"✅ Pagamento criado com ID: {result.id}")
+        logger.info("Pagamento criado", extra={"user_id": user_id, "payment_id": result.id})
         return result
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Erro ao criar pagamento: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Erro ao criar pagamento", extra={"user_id": user_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao criar pagamento: {str(e)}",
@@ -146,32 +145,35 @@ async def create_payment(
 
 @router.get("/", response_model=List[PaymentResponse])
 async def list_payments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    filters: PaymentFilter = Depends(),
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """Listar pagamentos"""
-    try:
-        print(f"🔹 Listando pagamentos para user_id: {user_id}")
-
-        controller = payment_controller(db)
-        payments = controller.get_payments(db, user_id, skip=skip, limit=limit)
+    """
+    Listar pagamentos
 
-        print(f"✅ Encontrados {len(payments)} pagamentos")
+    Filtros combináveis (query params): status, property_id, tenant_id, contract_id,
+    payment_method, due_date_from/due_date_to e payment_date_from/payment_date_to
+    """
+    if cursor is not None:
+        payments, next_cursor = payment_controller(db).get_payments_page(
+            db, user_id, cursor, limit, filters=filters
+        )
+        set_next_cursor(response, next_cursor)
+        return payments
 
-        # Debug: verificar todos os pagamentos no banco
-        all_payments = db.query(Payment).all()
-        print(f"📊 Total de pagamentos no banco: {len(all_payments)}")
-        if all_payments:
-            print(f"📊 user_ids no banco: {list(set(p.user_id for p in all_payments))}")
+    try:
+        controller = payment_controller(db)
+        payments = controller.get_payments(db, user_id, skip=skip, limit=limit, filters=filters)
 
-        return payments if payments else []
+        logger.debug("Pagamentos listados", extra={"user_id": user_id, "count": len(payments)})
+        return payments
     except Exception as e:
-        print(f"❌ Erro ao listar pagamentos: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Erro ao listar pagamentos", extra={"user_id": user_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao listar pagamentos: {str(e)}",
@@ -182,7 +184,7 @@ async def list_payments(
 async def get_payment(
     payment_id: int,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Obter pagamento por ID"""
     return payment_controller(db).get_payment_by_id(db, payment_id, user_id)
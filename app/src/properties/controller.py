@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
@@ -47,6 +47,12 @@ class property_controller:
         # Caso contrário, usar listagem padrão
         return self.repository.get_by_user(db, user_id=user_id, skip=skip, limit=limit)
 
+    def get_properties_page(
+        self, db: Session, user_id: int, cursor: Optional[str], limit: int = 100, **filters
+    ) -> Tuple[List[PropertyResponse], Optional[str]]:
+        """Listar propriedades por cursor (mesmos filtros de get_properties)"""
+        return self.repository.get_page_by_user(db, user_id, cursor=cursor, limit=limit, **filters)
+
     def get_property_by_id(self, db: Session, property_id: int, user_id: int) -> PropertyResponse:
         """Obter propriedade por ID"""
         property_obj = self.repository.get_by_id_and_user(db, property_id, user_id)
@@ -72,21 +78,15 @@ class property_controller:
     def update_property(
         self, db: Session, property_id: int, user_id: int, property_data: PropertyUpdate
     ) -> PropertyResponse:
-        """Atualizar propriedade existente"""
-        property_obj = self.repository.get_by_id_and_user(db, property_id, user_id)
+        """Atualizar propriedade existente (checagem de dono e escrita em uma instrução)"""
+        property_obj = self.repository.update_returning(db, property_id, user_id, property_data)
         if not property_obj:
             raise HTTPException(status_code=404, detail="Imóvel não encontrado")
-
-        return self.repository.update(db, db_obj=property_obj, obj_in=property_data)
+        return property_obj
 
     def delete_property(self, db: Session, property_id: int, user_id: int) -> dict:
-        """Deletar propriedade"""
-        property_obj = self.repository.get_by_id_and_user(db, property_id, user_id)
-        if not property_obj:
-            raise HTTPException(status_code=404, detail="Imóvel não encontrado")
-
-        success = self.repository.delete(db, id=property_id)
-        if not success:
+        """Deletar propriedade (checagem de dono e remoção em uma instrução)"""
+        if not self.repository.delete_owned(db, property_id, user_id):
             raise HTTPException(status_code=404, detail="Imóvel não encontrado")
         return {"message": "Imóvel deletado com sucesso"}
 
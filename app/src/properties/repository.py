@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.base_repository import BaseRepository
+from app.db.base_repository import AsyncBaseRepository, BaseRepository
+from app.db.pagination import keyset_page
+from app.src.units.models import Unit
 
 from .models import Property
 from .schemas import PropertyCreate, PropertyUpdate
@@ -11,6 +15,8 @@ from .schemas import PropertyCreate, PropertyUpdate
 class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate]):
     """Repository para operações com propriedades"""
 
+    cascade_delete = (Unit.property_id,)
+
     def __init__(self, db: Session):
         super().__init__(Property)
         self.db = db
@@ -45,21 +51,36 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
             .all()
         )
 
+    def get_page_by_user(
+        self, db: Session, user_id: int, cursor: Optional[str] = None, limit: int = 100, **filters
+    ) -> Tuple[List[Property], Optional[str]]:
+        """Página por cursor das propriedades do usuário (ordem por id), com os filtros da busca"""
+        query = self._search_query(db, user_id, **filters)
+        return keyset_page(query, [Property.id], cursor, limit)
+
     def search_properties(
         self,
         db: Session,
         user_id: int,
         *,
+        skip: int = 0,
+        limit: int = 100,
+        **filters,
+    ) -> List[Property]:
+        """Buscar propriedades com filtros avançados (filtrando por usuário)"""
+        return self._search_query(db, user_id, **filters).offset(skip).limit(limit).all()
+
+    def _search_query(
+        self,
+        db: Session,
+        user_id: int,
         property_type: Optional[str] = None,
         status: Optional[str] = None,
         min_rent: Optional[float] = None,
         max_rent: Optional[float] = None,
         min_area: Optional[float] = None,
         max_area: Optional[float] = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> List[Property]:
-        """Buscar propriedades com filtros avançados (filtrando por usuário)"""
+    ):
         query = db.query(Property).filter(Property.user_id == user_id)
 
         if property_type:
@@ -80,7 +101,7 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
         if max_area:
             query = query.filter(Property.area <= max_area)
 
-        return query.offset(skip).limit(limit).all()
+        return query
 
     def get_available_properties(self, db: Session, user_id: int) -> List[Property]:
         """Buscar apenas propriedades disponíveis (filtrando por usuário)"""
@@ -97,3 +118,36 @@ class PropertyRepository(BaseRepository[Property, PropertyCreate, PropertyUpdate
             db.refresh(property_obj)
             return property_obj
         return None
+
+
+class AsyncPropertyRepository(AsyncBaseRepository[Property, PropertyCreate, PropertyUpdate]):
+    """Repository assíncrono para operações com propriedades"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Property)
+        self.db = db
+
+    async def get_by_user(
+        self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Property]:
+        """Buscar propriedades do usuário"""
+        result = await db.execute(
+            select(Property).where(Property.user_id == user_id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id_and_user(
+        self, db: AsyncSession, property_id: int, user_id: int
+    ) -> Optional[Property]:
+        """Buscar propriedade por ID e usuário"""
+        result = await db.execute(
+            select(Property).where(Property.id == property_id, Property.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def count_by_user(self, db: AsyncSession, user_id: int) -> int:
+        """Contar propriedades do usuário"""
+        result = await db.execute(
+            select(func.count(Property.id)).where(Property.user_id == user_id)
+        )
+        return result.scalar() or 0
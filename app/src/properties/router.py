@@ -1,11 +1,12 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id_from_token
 from app.core.upload_service import upload_service
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 from .controller import property_controller
 from .schemas import PropertyCreate, PropertyResponse, PropertyUpdate
@@ -15,8 +16,10 @@ router = APIRouter()
 
 @router.get("/", response_model=List[PropertyResponse])
 def get_properties(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     property_type: Optional[str] = Query(None, description="Filtrar por tipo de propriedade"),
     status: Optional[str] = Query(None, description="Filtrar por status"),
     min_rent: Optional[float] = Query(None, ge=0, description="Valor mínimo do aluguel"),
@@ -24,9 +27,25 @@ def get_properties(
     min_area: Optional[float] = Query(None, ge=0, description="Área mínima"),
     max_area: Optional[float] = Query(None, ge=0, description="Área máxima"),
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Listar propriedades com filtros opcionais"""
+    if cursor is not None:
+        properties, next_cursor = property_controller(db).get_properties_page(
+            db,
+            user_id,
+            cursor,
+            limit,
+            property_type=property_type,
+            status=status,
+            min_rent=min_rent,
+            max_rent=max_rent,
+            min_area=min_area,
+            max_area=max_area,
+        )
+        set_next_cursor(response, next_cursor)
+        return properties
+
     properties = property_controller(db).get_properties(
         db=db,
         user_id=user_id,
@@ -44,7 +63,7 @@ def get_properties(
 
 @router.get("/available", response_model=List[PropertyResponse])
 def get_available_properties(
-    user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id_from_token), db: Session = Depends(get_read_db)
 ):
     """Listar apenas propriedades disponíveis"""
     properties = property_controller(db).get_available_properties(db, user_id)
@@ -68,7 +87,7 @@ def create_property(
 def get_property(
     property_id: int,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Obter propriedade por ID"""
     property_obj = property_controller(db).get_property_by_id(
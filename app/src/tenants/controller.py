@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
@@ -35,6 +35,12 @@ class tenant_controller:
         # Caso contrário, usar listagem padrão
         return self.repository.get_by_user(db, user_id, skip=skip, limit=limit)
 
+    def get_tenants_page(
+        self, db: Session, user_id: int, cursor: Optional[str], limit: int = 100
+    ) -> Tuple[List[TenantResponse], Optional[str]]:
+        """Listar inquilinos por cursor"""
+        return self.repository.get_page_by_user(db, user_id, cursor=cursor, limit=limit)
+
     def get_tenant_by_id(self, db: Session, tenant_id: int, user_id: int) -> TenantResponse:
         """Obter inquilino por ID"""
         tenant_obj = self.repository.get_by_id_and_user(db, tenant_id, user_id)
@@ -78,11 +84,7 @@ class tenant_controller:
     def update_tenant(
         self, db: Session, tenant_id: int, user_id: int, tenant_data: TenantUpdate
     ) -> TenantResponse:
-        """Atualizar inquilino existente"""
-        tenant_obj = self.repository.get_by_id_and_user(db, tenant_id, user_id)
-        if not tenant_obj:
-            raise HTTPException(status_code=404, detail="Inquilino não encontrado")
-
+        """Atualizar inquilino existente (checagem de dono e escrita em uma instrução)"""
         # Verificar se email e CPF são únicos (excluindo o próprio registro)
         if hasattr(tenant_data, "email") and tenant_data.email:
             tenant_create_data = TenantCreate(**tenant_data.dict())
@@ -92,16 +94,14 @@ class tenant_controller:
             if validation_errors:
                 raise HTTPException(status_code=400, detail=validation_errors)
 
-        return self.repository.update(db, db_obj=tenant_obj, obj_in=tenant_data)
-
-    def delete_tenant(self, db: Session, tenant_id: int, user_id: int) -> dict:
-        """Deletar inquilino"""
-        tenant_obj = self.repository.get_by_id_and_user(db, tenant_id, user_id)
+        tenant_obj = self.repository.update_returning(db, tenant_id, user_id, tenant_data)
         if not tenant_obj:
             raise HTTPException(status_code=404, detail="Inquilino não encontrado")
+        return tenant_obj
 
-        success = self.repository.delete(db, id=tenant_id)
-        if not success:
+    def delete_tenant(self, db: Session, tenant_id: int, user_id: int) -> dict:
+        """Deletar inquilino (checagem de dono e remoção em uma instrução)"""
+        if not self.repository.delete_owned(db, tenant_id, user_id):
             raise HTTPException(status_code=404, detail="Inquilino não encontrado")
         return {"message": "Inquilino deletado com sucesso"}
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, Column, Date, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -8,6 +8,10 @@ from app.db.base import Base
 
 class Tenant(Base):
     __tablename__ = "tenants"
+    __table_args__ = (
+        # Paginação por cursor: WHERE user_id = ? AND id > ? ORDER BY id
+        Index("ix_tenants_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)  # Reference to user in auth-api
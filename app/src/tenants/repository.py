@@ -1,8 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.base_repository import BaseRepository
+from app.db.base_repository import AsyncBaseRepository, BaseRepository
+from app.db.pagination import keyset_page
 
 from .models import Tenant
 from .schemas import TenantCreate, TenantUpdate
@@ -21,6 +24,13 @@ class TenantRepository(BaseRepository[Tenant, TenantCreate, TenantUpdate]):
         """Buscar inquilinos do usuário"""
         return db.query(Tenant).filter(Tenant.user_id == user_id).offset(skip).limit(limit).all()
 
+    def get_page_by_user(
+        self, db: Session, user_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Tenant], Optional[str]]:
+        """Página por cursor dos inquilinos do usuário (ordem por id)"""
+        query = db.query(Tenant).filter(Tenant.user_id == user_id)
+        return keyset_page(query, [Tenant.id], cursor, limit)
+
     def get_by_id_and_user(self, db: Session, tenant_id: int, user_id: int) -> Optional[Tenant]:
         """Buscar inquilino por ID validando owner"""
         return db.query(Tenant).filter(Tenant.id == tenant_id, Tenant.user_id == user_id).first()
@@ -90,3 +100,34 @@ class TenantRepository(BaseRepository[Tenant, TenantCreate, TenantUpdate]):
             errors["cpf_cnpj"] = "CPF/CNPJ já está em uso"
 
         return errors
+
+
+class AsyncTenantRepository(AsyncBaseRepository[Tenant, TenantCreate, TenantUpdate]):
+    """Repository assíncrono para operações com inquilinos"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Tenant)
+        self.db = db
+
+    async def get_by_user(
+        self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Tenant]:
+        """Buscar inquilinos do usuário"""
+        result = await db.execute(
+            select(Tenant).where(Tenant.user_id == user_id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id_and_user(
+        self, db: AsyncSession, tenant_id: int, user_id: int
+    ) -> Optional[Tenant]:
+        """Buscar inquilino por ID validando owner"""
+        result = await db.execute(
+            select(Tenant).where(Tenant.id == tenant_id, Tenant.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def count_by_user(self, db: AsyncSession, user_id: int) -> int:
+        """Contar inquilinos do usuário"""
+        result = await db.execute(select(func.count(Tenant.id)).where(Tenant.user_id == user_id))
+        return result.scalar() or 0
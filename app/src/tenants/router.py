@@ -1,12 +1,13 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id_from_token
 from app.core.upload_service import upload_service
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 from .controller import tenant_controller
 from .schemas import TenantCreate, TenantResponse, TenantUpdate
@@ -26,12 +27,19 @@ async def create_tenant(
 
 @router.get("/", response_model=List[TenantResponse])
 async def list_tenants(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Listar inquilinos"""
+    if cursor is not None:
+        tenants, next_cursor = tenant_controller(db).get_tenants_page(db, user_id, cursor, limit)
+        set_next_cursor(response, next_cursor)
+        return tenants
+
     return tenant_controller(db).get_tenants(db, user_id, skip=skip, limit=limit)
 
 
@@ -39,7 +47,7 @@ async def list_tenants(
 async def get_tenant(
     tenant_id: int,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Obter inquilino por ID"""
     return tenant_controller(db).get_tenant_by_id(db, tenant_id, user_id)
@@ -178,7 +186,7 @@ async def delete_tenant_document(
 async def list_tenant_documents(
     tenant_id: int,
     user_id: int = Depends(get_current_user_id_from_token),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Listar todos os documentos de um inquilino
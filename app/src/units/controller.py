@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
@@ -18,6 +18,12 @@ class unit_controller:
         """Listar unidades"""
         return self.repository.get_multi(db, skip=skip, limit=limit)
 
+    def get_units_page(
+        self, db: Session, cursor: Optional[str], limit: int = 100
+    ) -> Tuple[List[Unit], Optional[str]]:
+        """Listar unidades por cursor"""
+        return self.repository.get_multi_page(db, cursor=cursor, limit=limit)
+
     def get_units_by_property(self, db: Session, property_id: int) -> List[Unit]:
         """Obter unidades por propriedade"""
         return self.repository.get_by_property(db, property_id=property_id)
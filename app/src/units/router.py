@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.pagination import CURSOR_DESCRIPTION, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 from .controller import unit_controller
 from .schemas import UnitCreate, UnitResponse, UnitUpdate
@@ -18,13 +19,24 @@ async def create_unit(unit: UnitCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[UnitResponse])
-async def list_units(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_units(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+):
     """Listar unidades"""
+    if cursor is not None:
+        units, next_cursor = unit_controller(db).get_units_page(db, cursor, limit)
+        set_next_cursor(response, next_cursor)
+        return units
+
     return unit_controller(db).get_units(db, skip=skip, limit=limit)
 
 
 @router.get("/{unit_id}", response_model=UnitResponse)
-async def get_unit(unit_id: int, db: Session = Depends(get_db)):
+async def get_unit(unit_id: int, db: Session = Depends(get_read_db)):
     """Obter unidade por ID"""
     return unit_controller(db).get_unit_by_id(db, unit_id)
 
@@ -42,6 +54,6 @@ async def delete_unit(unit_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/property/{property_id}", response_model=List[UnitResponse])
-async def get_units_by_property(property_id: int, db: Session = Depends(get_db)):
+async def get_units_by_property(property_id: int, db: Session = Depends(get_read_db)):
     """Obter unidades por propriedade"""
     return unit_controller(db).get_units_by_property(db, property_id)
@@ -0,0 +1,291 @@
+"""
+Worker de tarefas de background (fora do caminho das requisições HTTP)
+
+Executa as etapas do BackgroundTasksService para todos os usuários, em lotes,
+uma vez por período:
+
+    python -m app.worker                 # loop com intervalo WORKER_INTERVAL_SECONDS
+    python -m app.worker --once          # uma única execução (cron, jobs agendados)
+    python -m app.worker --once --dry-run  # calcula tudo e faz rollback
+
+Com vários workers, o trabalho é distribuído pela fila de jobs (tabela jobs):
+
+    python -m app.worker --mode enqueue  # enfileira um job por lote de usuários
+    python -m app.worker --mode consume  # executa jobs (quantos processos quiser)
+    python -m app.worker --mode schedule # agendador: uma réplica executa cada período
+"""
+import argparse
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+import app.src  # noqa: F401  # carrega os domínios antes dos serviços (evita import circular)
+from app.core.background_tasks import BackgroundTasksService
+from app.core.config import settings
+from app.core.job_queue import JobQueue, default_worker_id, job_handler
+from app.core.logger import configure_logging, get_logger
+from app.core.metrics import BACKGROUND_STAGE_SECONDS
+from app.core.scheduler import Scheduler, scheduled_job
+from app.src.contracts.models import Contract
+from app.src.payments.models import Payment
+
+logger = get_logger("app.worker")
+
+# Etapas de notificação executadas para o lote de usuários, na ordem (nome, função)
+USER_STAGES: List[Tuple[str, Callable[..., int]]] = [
+    ("contract_notifications", BackgroundTasksService.process_contract_expiring_notifications),
+    ("payment_reminders", BackgroundTasksService.process_payment_reminders),
+    ("overdue_notifications", BackgroundTasksService.process_overdue_payment_notifications),
+]
+
+
+def get_user_ids(db: Session) -> List[int]:
+    """Usuários com pagamentos ou contratos (não há tabela de usuários neste banco)"""
+    query = union(select(Payment.user_id), select(Contract.user_id))
+    return sorted(row[0] for row in db.execute(query))
+
+
+def chunked(items: List[int], size: int) -> Iterator[List[int]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class StageTimer:
+    """Acumula duração, execuções e itens produzidos por etapa"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stage: str, seconds: float, count: int) -> None:
+        BACKGROUND_STAGE_SECONDS.labels(stage).observe(seconds)
+        entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0, "count": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        entry["count"] += count
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {**entry, "seconds": round(entry["seconds"], 4)}
+            for stage, entry in self.stages.items()
+        }
+
+
+# Job da fila que executa as etapas para um lote de usuários
+PROCESS_USERS_JOB = "background.process_users"
+
+
+def run_stages(db: Session, user_ids: List[int], timer: StageTimer) -> None:
+    """
+    Executa todas as etapas para um lote de usuários, sem commit
+
+    Cada etapa roda uma vez para o lote (filtro user_id IN), então o número de
+    instruções por lote não cresce com o número de usuários.
+    """
+    started = time.perf_counter()
+    changes = BackgroundTasksService.update_payment_statuses_automatically(
+        db, user_ids=user_ids, commit=False
+    )
+    timer.record("payment_status", time.perf_counter() - started, changes["pending_to_overdue"])
+
+    for stage, func in USER_STAGES:
+        started = time.perf_counter()
+        count = func(db, user_ids=user_ids, commit=False)
+        timer.record(stage, time.perf_counter() - started, count)
+
+
+def process_chunk(db: Session, user_ids: List[int], timer: StageTimer, dry_run: bool) -> None:
+    """Executa as etapas de um lote em uma transação (desfeita em dry-run)"""
+    run_stages(db, user_ids, timer)
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+
+def run_once(
+    db: Session,
+    chunk_size: int = settings.WORKER_CHUNK_SIZE,
+    dry_run: bool = False,
+    user_ids: Optional[List[int]] = None,
+) -> dict:
+    """
+    Uma execução completa para todos os usuários
+
+    Args:
+        db: Sessão do banco
+        chunk_size: Usuários por lote/transação
+        dry_run: Desfazer as alterações ao final de cada lote
+        user_ids: Limitar a estes usuários (padrão: todos)
+
+    Returns:
+        Resumo com usuários, lotes, duração total e métricas por etapa
+    """
+    started = time.perf_counter()
+    timer = StageTimer()
+    failed_chunks = 0
+
+    users = user_ids if user_ids is not None else get_user_ids(db)
+    chunks = list(chunked(users, chunk_size))
+
+    for chunk in chunks:
+        try:
+            process_chunk(db, chunk, timer, dry_run)
+        except Exception:
+            # Um lote com erro não impede os demais
+            db.rollback()
+            failed_chunks += 1
+            logger.exception(
+                "Erro no lote de usuários", extra={"first_user": chunk[0], "last_user": chunk[-1]}
+            )
+
+    return {
+        "dry_run": dry_run,
+        "users": len(users),
+        "chunks": len(chunks),
+        "failed_chunks": failed_chunks,
+        "seconds": round(time.perf_counter() - started, 4),
+        "stages": timer.summary(),
+    }
+
+
+@job_handler(PROCESS_USERS_JOB)
+def process_users_job(db: Session, payload: dict) -> None:
+    """Handler do job: o commit é feito pela fila junto com a conclusão do job"""
+    run_stages(db, payload["user_ids"], StageTimer())
+
+
+def enqueue_chunks(
+    db: Session,
+    chunk_size: int = settings.WORKER_CHUNK_SIZE,
+    period: Optional[str] = None,
+) -> int:
+    """
+    Enfileira um job por lote de usuários (commit único)
+
+    Args:
+        db: Sessão do banco
+        chunk_size: Usuários por job
+        period: Identificador do período; com ele, re-enfileirar o mesmo
+            período não duplica jobs (dedupe_key)
+
+    Returns:
+        Número de jobs criados
+    """
+    created = 0
+    for chunk in chunked(get_user_ids(db), chunk_size):
+        dedupe_key = f"{PROCESS_USERS_JOB}:{period}:{chunk[0]}-{chunk[-1]}" if period else None
+        job_id = JobQueue.enqueue(
+            db, PROCESS_USERS_JOB, {"user_ids": chunk}, dedupe_key=dedupe_key, commit=False
+        )
+        created += job_id is not None
+    db.commit()
+    return created
+
+
+def current_period(interval_seconds: int) -> str:
+    """Período atual em múltiplos do intervalo do worker (UTC)"""
+    return str(int(time.time()) // max(interval_seconds, 1))
+
+
+@scheduled_job("background.all_users", interval_seconds=settings.WORKER_INTERVAL_SECONDS)
+def process_all_users(db: Session) -> None:
+    """Job periódico: todas as etapas para todos os usuários, uma réplica por período"""
+    logger.info("Execução do worker concluída", extra=run_once(db))
+
+
+def consume(session_factory: Callable[[], Session], worker_id: str, once: bool = False) -> None:
+    """Executa jobs da fila até ser interrompido (ou até esvaziá-la com once=True)"""
+    db = session_factory()
+    try:
+        while True:
+            results = JobQueue.work_once(db, worker_id, heartbeat_session_factory=session_factory)
+            if results:
+                logger.info("Jobs executados", extra={"worker_id": worker_id, "jobs": results})
+                continue
+            if once:
+                break
+            time.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+    finally:
+        db.close()
+
+
+def warn_if_process_local_cache() -> None:
+    """Avisa quando o cache é local: a versão por usuário não chegaria à API"""
+    if settings.CACHE_BACKEND == "memory":
+        logger.warning(
+            "CACHE_BACKEND=memory no worker: o cache do dashboard da API não será invalidado; "
+            "use CACHE_BACKEND=redis com o mesmo REDIS_URL da API"
+        )
+
+
+def main() -> None:
+    """Entry point de linha de comando"""
+    from app.db.session import SessionLocal
+
+    configure_logging()
+    warn_if_process_local_cache()
+    if settings.TRACING_ENABLED:
+        from app.core.tracing import configure_tracing
+
+        configure_tracing()
+
+    parser = argparse.ArgumentParser(description="Worker das tarefas de background")
+    parser.add_argument("--once", action="store_true", help="Executar uma vez e sair")
+    parser.add_argument("--dry-run", action="store_true", help="Não gravar alterações")
+    parser.add_argument("--interval", type=int, default=settings.WORKER_INTERVAL_SECONDS)
+    parser.add_argument("--chunk-size", type=int, default=settings.WORKER_CHUNK_SIZE)
+    parser.add_argument("--user-id", type=int, action="append", help="Limitar a um usuário")
+    parser.add_argument(
+        "--mode",
+        choices=["inline", "enqueue", "consume", "schedule"],
+        default="inline",
+        help=(
+            "inline: executa aqui; enqueue: cria jobs por lote; consume: executa jobs; "
+            "schedule: agendador com advisory lock (seguro com várias réplicas)"
+        ),
+    )
+    parser.add_argument("--worker-id", default=default_worker_id())
+    args = parser.parse_args()
+
+    if args.mode == "consume":
+        consume(SessionLocal, args.worker_id, once=args.once)
+        return
+
+    if args.mode == "schedule":
+        from app.db.session import engine
+
+        if args.once:
+            db = SessionLocal()
+            try:
+                results = Scheduler.run_pending(db, engine, args.worker_id)
+                logger.info("Tick do agendador", extra={"jobs": results})
+            finally:
+                db.close()
+        else:
+            Scheduler.run_forever(SessionLocal, engine, args.worker_id)
+        return
+
+    while True:
+        db = SessionLocal()
+        try:
+            if args.mode == "enqueue":
+                period = current_period(args.interval)
+                summary = {"enqueued": enqueue_chunks(db, args.chunk_size, period=period)}
+            else:
+                summary = run_once(
+                    db, chunk_size=args.chunk_size, dry_run=args.dry_run, user_ids=args.user_id
+                )
+        finally:
+            db.close()
+        logger.info("Execução do worker concluída", extra=summary)
+
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""baseline: schema existente antes das migrações
+
+Bancos criados com Base.metadata.create_all devem ser marcados com
+`alembic stamp 0001` antes de `alembic upgrade head`.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 04:37:26.111539
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("priority", sa.String(length=20), nullable=False),
+        sa.Column("read_status", sa.Boolean(), nullable=True),
+        sa.Column("action_required", sa.Boolean(), nullable=True),
+        sa.Column("related_id", sa.String(length=255), nullable=True),
+        sa.Column("related_type", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_notifications_user_id"), "notifications", ["user_id"], unique=False)
+    op.create_table(
+        "tenants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("phone", sa.String(length=20), nullable=False),
+        sa.Column("cpf_cnpj", sa.String(length=20), nullable=False),
+        sa.Column("birth_date", sa.Date(), nullable=True),
+        sa.Column("profession", sa.String(length=100), nullable=False),
+        sa.Column("emergency_contact", sa.JSON(), nullable=True),
+        sa.Column("documents", sa.JSON(), nullable=True),
+        sa.Column("contract_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cpf_cnpj"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_index(op.f("ix_tenants_id"), "tenants", ["id"], unique=False)
+    op.create_index(op.f("ix_tenants_user_id"), "tenants", ["user_id"], unique=False)
+    op.create_table(
+        "properties",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("address", sa.Text(), nullable=False),
+        sa.Column("neighborhood", sa.String(length=100), nullable=False),
+        sa.Column("city", sa.String(length=100), nullable=False),
+        sa.Column("state", sa.String(length=50), nullable=False),
+        sa.Column("zip_code", sa.String(length=20), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=False),
+        sa.Column("area", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("bedrooms", sa.Integer(), nullable=False),
+        sa.Column("bathrooms", sa.Integer(), nullable=False),
+        sa.Column("parking_spaces", sa.Integer(), nullable=True),
+        sa.Column("rent", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("images", sa.JSON(), nullable=True),
+        sa.Column("is_residential", sa.Boolean(), nullable=True),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"], ["tenants.id"], name="fk_property_tenant_id", ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_properties_id"), "properties", ["id"], unique=False)
+    op.create_index(op.f("ix_properties_tenant_id"), "properties", ["tenant_id"], unique=False)
+    op.create_index(op.f("ix_properties_user_id"), "properties", ["user_id"], unique=False)
+    op.create_table(
+        "contracts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("property_id", sa.Integer(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("rent", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("deposit", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("interest_rate", sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column("fine_rate", sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["property_id"], ["properties.id"], name="fk_contract_property_id"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], name="fk_contract_tenant_id"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_contracts_id"), "contracts", ["id"], unique=False)
+    op.create_index(op.f("ix_contracts_user_id"), "contracts", ["user_id"], unique=False)
+    # tenants <-> contracts é um ciclo: a FK do inquilino é criada após a tabela de contratos
+    op.create_foreign_key("fk_tenant_contract_id", "tenants", "contracts", ["contract_id"], ["id"])
+    op.create_table(
+        "expenses",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("property_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("priority", sa.String(length=20), nullable=True),
+        sa.Column("vendor", sa.String(length=255), nullable=True),
+        sa.Column("number", sa.String(length=20), nullable=True),
+        sa.Column("receipt", sa.Text(), nullable=True),
+        sa.Column("documents", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["property_id"],
+            ["properties.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_expenses_user_id"), "expenses", ["user_id"], unique=False)
+    op.create_table(
+        "units",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("property_id", sa.Integer(), nullable=False),
+        sa.Column("number", sa.String(length=50), nullable=False),
+        sa.Column("area", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("bedrooms", sa.Integer(), nullable=False),
+        sa.Column("bathrooms", sa.Integer(), nullable=False),
+        sa.Column("rent", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("tenant", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["property_id"],
+            ["properties.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_units_id"), "units", ["id"], unique=False)
+    op.create_index(op.f("ix_units_user_id"), "units", ["user_id"], unique=False)
+    op.create_table(
+        "payments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("property_id", sa.Integer(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=False),
+        sa.Column("contract_id", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("payment_date", sa.Date(), nullable=True),
+        sa.Column("amount", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("fine_amount", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("total_amount", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("payment_method", sa.String(length=20), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["contract_id"],
+            ["contracts.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["property_id"],
+            ["properties.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["tenants.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_payments_id"), "payments", ["id"], unique=False)
+    op.create_index(op.f("ix_payments_user_id"), "payments", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_payments_user_id"), table_name="payments")
+    op.drop_index(op.f("ix_payments_id"), table_name="payments")
+    op.drop_table("payments")
+    op.drop_index(op.f("ix_units_user_id"), table_name="units")
+    op.drop_index(op.f("ix_units_id"), table_name="units")
+    op.drop_table("units")
+    op.drop_index(op.f("ix_expenses_user_id"), table_name="expenses")
+    op.drop_table("expenses")
+    op.drop_constraint("fk_tenant_contract_id", "tenants", type_="foreignkey")
+    op.drop_index(op.f("ix_contracts_user_id"), table_name="contracts")
+    op.drop_index(op.f("ix_contracts_id"), table_name="contracts")
+    op.drop_table("contracts")
+    op.drop_index(op.f("ix_properties_user_id"), table_name="properties")
+    op.drop_index(op.f("ix_properties_tenant_id"), table_name="properties")
+    op.drop_index(op.f("ix_properties_id"), table_name="properties")
+    op.drop_table("properties")
+    op.drop_index(op.f("ix_tenants_user_id"), table_name="tenants")
+    op.drop_index(op.f("ix_tenants_id"), table_name="tenants")
+    op.drop_table("tenants")
+    op.drop_index(op.f("ix_notifications_user_id"), table_name="notifications")
+    op.drop_table("notifications")
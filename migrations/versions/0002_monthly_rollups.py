@@ -0,0 +1,49 @@
+"""monthly_rollups: totais financeiros mensais por usuário e imóvel
+
+Após aplicar, popular com `python -m app.src.dashboard.rollups`.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 04:40:12.482915
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("property_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("revenue_received", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("expected_rent", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("expenses_total", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("expenses_by_category", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("payments_paid", sa.Integer(), nullable=False),
+        sa.Column("payments_pending", sa.Integer(), nullable=False),
+        sa.Column("payments_overdue", sa.Integer(), nullable=False),
+        sa.Column("payments_partial", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["property_id"],
+            ["properties.id"],
+            name="fk_monthly_rollup_property_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("user_id", "property_id", "month"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_rollups")
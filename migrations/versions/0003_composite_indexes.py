@@ -0,0 +1,73 @@
+"""índices compostos e parciais para os filtros mais usados
+
+Os modelos só indexavam id e user_id, então todo filtro por status/data virava
+um index scan em user_id seguido de filtro no heap. Os índices abaixo seguem as
+consultas dos repositories, do router do dashboard, dos rollups e do
+BackgroundTasksService.
+
+Em bancos grandes, gere o SQL com `alembic upgrade 0002:0003 --sql` e troque
+CREATE INDEX por CREATE INDEX CONCURRENTLY para evitar bloquear escritas.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 04:52:41.907311
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_payments_user_status_due_date", "payments", ["user_id", "status", "due_date"]
+    )
+    op.create_index("ix_payments_user_payment_date", "payments", ["user_id", "payment_date"])
+    op.create_index("ix_payments_user_created_at", "payments", ["user_id", "created_at"])
+
+    op.create_index(
+        "ix_contracts_user_status_end_date", "contracts", ["user_id", "status", "end_date"]
+    )
+    op.create_index(
+        "ix_contracts_active_property_period",
+        "contracts",
+        ["property_id", "start_date", "end_date"],
+        postgresql_where=sa.text("status = 'active'"),
+    )
+    op.create_index("ix_contracts_user_created_at", "contracts", ["user_id", "created_at"])
+
+    op.create_index("ix_expenses_user_date", "expenses", ["user_id", "date"])
+    op.create_index(
+        "ix_expenses_user_property_date", "expenses", ["user_id", "property_id", "date"]
+    )
+
+    op.create_index(
+        "ix_notifications_user_read_status_date",
+        "notifications",
+        ["user_id", "read_status", "date"],
+    )
+    op.create_index(
+        "ix_notifications_user_type_related_created",
+        "notifications",
+        ["user_id", "type", "related_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_user_type_related_created", table_name="notifications")
+    op.drop_index("ix_notifications_user_read_status_date", table_name="notifications")
+    op.drop_index("ix_expenses_user_property_date", table_name="expenses")
+    op.drop_index("ix_expenses_user_date", table_name="expenses")
+    op.drop_index("ix_contracts_user_created_at", table_name="contracts")
+    op.drop_index("ix_contracts_active_property_period", table_name="contracts")
+    op.drop_index("ix_contracts_user_status_end_date", table_name="contracts")
+    op.drop_index("ix_payments_user_created_at", table_name="payments")
+    op.drop_index("ix_payments_user_payment_date", table_name="payments")
+    op.drop_index("ix_payments_user_status_due_date", table_name="payments")
@@ -0,0 +1,41 @@
+"""notifications.idempotency_key com índice único
+
+Substitui a consulta "notificação recente similar" feita por item nas tarefas
+de background: as inserções usam ON CONFLICT (idempotency_key) DO NOTHING.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 05:21:08.336170
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notifications", sa.Column("idempotency_key", sa.String(length=255), nullable=True)
+    )
+    op.create_index(
+        "uq_notifications_idempotency_key", "notifications", ["idempotency_key"], unique=True
+    )
+    # A verificação por item deixou de existir
+    op.drop_index("ix_notifications_user_type_related_created", table_name="notifications")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_notifications_user_type_related_created",
+        "notifications",
+        ["user_id", "type", "related_id", "created_at"],
+    )
+    op.drop_index("uq_notifications_idempotency_key", table_name="notifications")
+    op.drop_column("notifications", "idempotency_key")
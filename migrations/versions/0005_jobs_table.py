@@ -0,0 +1,53 @@
+"""Tabela jobs (fila de jobs no Postgres, app.core.job_queue)
+
+Workers reservam jobs com FOR UPDATE SKIP LOCKED; o índice por
+(queue, status, run_at) atende a busca dos próximos jobs prontos.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 04:49:32.233660
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("queue", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("dedupe_key", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_jobs_queue_status_run_at", "jobs", ["queue", "status", "run_at"], unique=False
+    )
+    op.create_index("uq_jobs_dedupe_key", "jobs", ["dedupe_key"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_jobs_dedupe_key", table_name="jobs")
+    op.drop_index("ix_jobs_queue_status_run_at", table_name="jobs")
+    op.drop_table("jobs")
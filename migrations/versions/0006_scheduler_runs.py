@@ -0,0 +1,41 @@
+"""Tabela scheduler_runs (última execução dos jobs periódicos)
+
+Lida pelo agendador de app.core.scheduler depois do advisory lock para
+garantir uma execução por período entre as réplicas.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 04:52:01.546039
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduler_runs",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("last_started_at", sa.DateTime(), nullable=True),
+        sa.Column("last_finished_at", sa.DateTime(), nullable=True),
+        sa.Column("last_status", sa.String(length=20), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_duration_ms", sa.Integer(), nullable=True),
+        sa.Column("last_run_by", sa.String(length=100), nullable=True),
+        sa.Column("run_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduler_runs")
@@ -0,0 +1,44 @@
+"""Índices (user_id, chave, id) para a paginação por cursor
+
+Cada listagem com cursor busca a partir da última linha com um predicado
+(chave, id) > (?, ?); estes índices tornam o custo independente da página.
+ix_expenses_user_date é substituído por ix_expenses_user_date_id.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 04:54:58.666380
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_contracts_user_id_id", "contracts", ["user_id", "id"], unique=False)
+    op.drop_index("ix_expenses_user_date", table_name="expenses")
+    op.create_index("ix_expenses_user_date_id", "expenses", ["user_id", "date", "id"], unique=False)
+    op.create_index(
+        "ix_notifications_user_date_id", "notifications", ["user_id", "date", "id"], unique=False
+    )
+    op.create_index("ix_payments_user_id_id", "payments", ["user_id", "id"], unique=False)
+    op.create_index("ix_properties_user_id_id", "properties", ["user_id", "id"], unique=False)
+    op.create_index("ix_tenants_user_id_id", "tenants", ["user_id", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tenants_user_id_id", table_name="tenants")
+    op.drop_index("ix_properties_user_id_id", table_name="properties")
+    op.drop_index("ix_payments_user_id_id", table_name="payments")
+    op.drop_index("ix_notifications_user_date_id", table_name="notifications")
+    op.drop_index("ix_expenses_user_date_id", table_name="expenses")
+    op.create_index("ix_expenses_user_date", "expenses", ["user_id", "date"], unique=False)
+    op.drop_index("ix_contracts_user_id_id", table_name="contracts")
@@ -7,11 +7,18 @@ from typing import Generator
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import (
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    to_async_database_url,
+)
 from app.main import app
 
 # ============ PROTEÇÃO CONTRA USO DE BANCO DE PRODUÇÃO ============
@@ -54,7 +61,17 @@ if PRODUCTION_DATABASE_URL and TEST_DATABASE_URL == PRODUCTION_DATABASE_URL:
     print("\n" + "=" * 80)
     sys.exit(1)
 
-# VALIDAÇÃO 3: Se for Postgres, garantir que o nome do banco termina com '_test'
+# VALIDAÇÃO 3: os testes exigem Postgres (JSONB, RETURNING, advisory locks, sessões async)
+if not TEST_DATABASE_URL.startswith("postgresql"):
+    print("\n" + "=" * 80)
+    print("❌ ERRO: TEST_DATABASE_URL deve apontar para um Postgres!")
+    print("=" * 80)
+    print("\nSQLite não suporta os tipos e recursos usados pelo schema (JSONB, advisory locks).")
+    print(f"\n  URL atual: {TEST_DATABASE_URL}")
+    print("\n" + "=" * 80)
+    sys.exit(1)
+
+# VALIDAÇÃO 4: Se for Postgres, garantir que o nome do banco termina com '_test'
 if TEST_DATABASE_URL.startswith("postgresql"):
     if not ("_test" in TEST_DATABASE_URL or ":memory:" in TEST_DATABASE_URL):
         print("\n" + "=" * 80)
@@ -69,18 +86,18 @@ if TEST_DATABASE_URL.startswith("postgresql"):
 
 print(f"\n✅ Testes rodando em: {TEST_DATABASE_URL}\n")
 
-if TEST_DATABASE_URL.startswith("sqlite"):
-    # SQLite in-memory (uso local) – atenção: tipos específicos (JSONB) não são suportados
-    engine = create_engine(
-        TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-else:
-    # Postgres (CI/CD)
-    engine = create_engine(TEST_DATABASE_URL)
+engine = create_engine(TEST_DATABASE_URL)
+# Sessões async (rotas com get_async_db) enxergam o mesmo schema isolado
+async_engine = create_async_engine(
+    to_async_database_url(TEST_DATABASE_URL),
+    poolclass=NullPool,
+    connect_args={"options": "-csearch_path=test_schema"},
+)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="function")
@@ -88,38 +105,31 @@ def db() -> Generator[Session, None, None]:
     """Create a fresh database for each test in isolated schema"""
     from sqlalchemy import text
 
-    # Para Postgres, usar schema isolado 'test_schema'
-    if TEST_DATABASE_URL.startswith("postgresql"):
-        with engine.connect() as conn:
-            # Criar schema de teste isolado
-            conn.execute(text("DROP SCHEMA IF EXISTS test_schema CASCADE"))
-            conn.execute(text("CREATE SCHEMA test_schema"))
-            conn.execute(text("SET search_path TO test_schema"))
-            conn.commit()
+    # Schema isolado 'test_schema'
+    with engine.connect() as conn:
+        conn.execute(text("DROP SCHEMA IF EXISTS test_schema CASCADE"))
+        conn.execute(text("CREATE SCHEMA test_schema"))
+        conn.execute(text("SET search_path TO test_schema"))
+        conn.commit()
 
     # Criar todas as tabelas
     Base.metadata.create_all(bind=engine)
 
     db = TestingSessionLocal()
 
-    # Para Postgres, configurar o search_path na sessão
-    if TEST_DATABASE_URL.startswith("postgresql"):
-        db.execute(text("SET search_path TO test_schema"))
-        db.commit()
+    # Configurar o search_path na sessão
+    db.execute(text("SET search_path TO test_schema"))
+    db.commit()
 
     try:
         yield db
     finally:
         db.close()
         # Cleanup: Drop schema de teste
+        # Drop APENAS o schema de teste
         with engine.connect() as conn:
-            if TEST_DATABASE_URL.startswith("postgresql"):
-                # Postgres: drop APENAS o schema de teste
-                conn.execute(text("DROP SCHEMA IF EXISTS test_schema CASCADE"))
-                conn.commit()
-            else:
-                # SQLite: regular drop_all
-                Base.metadata.drop_all(bind=engine)
+            conn.execute(text("DROP SCHEMA IF EXISTS test_schema CASCADE"))
+            conn.commit()
 
 
 @pytest.fixture(scope="function")
@@ -135,17 +145,29 @@ def client(db: Session) -> Generator[TestClient, None, None]:
 
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
+    # Cada teste começa com o cache do dashboard vazio (o banco também é recriado)
+    from app.src.dashboard.cache import dashboard_cache
+
+    dashboard_cache.clear()
+
     def override_get_db():
         try:
             yield db
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     def override_get_current_user():
         """Mock user_id for tests - simulates authenticated user"""
         return 1  # Default test user_id
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     app.dependency_overrides[get_current_user_id_from_token] = override_get_current_user
 
     with TestClient(app) as test_client:
@@ -154,6 +176,30 @@ def client(db: Session) -> Generator[TestClient, None, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def max_queries():
+    """
+    Limite de consultas para um bloco (detecta N+1 nos endpoints)
+
+    Uso:
+        with max_queries(3):
+            client.get("/api/v1/payments/")
+    """
+    from contextlib import contextmanager
+
+    from app.db.instrumentation import capture_queries
+
+    @contextmanager
+    def _max_queries(limit: int, allow_repeated: bool = False):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"Esperado no máximo {limit}: {stats.report()}"
+        if not allow_repeated:
+            assert not stats.repeated(), f"Instrução repetida (N+1): {stats.report()}"
+
+    return _max_queries
+
+
 @pytest.fixture
 def sample_property_data():
     """Sample property data for tests"""
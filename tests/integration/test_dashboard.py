@@ -96,3 +96,211 @@ class TestDashboardAPI:
         # Test financial overview with property filter
         response = client.get(f"/api/v1/dashboard/financial-overview?property_id={property_id}")
         assert response.status_code == 200
+
+    def test_dashboard_stats_counts_user_data(
+        self, client: TestClient, sample_property_data, sample_tenant_data, sample_contract_data
+    ):
+        """Test stats reflect data written through the sync session"""
+        property_id = client.post("/api/v1/properties/", json=sample_property_data).json()["id"]
+        tenant_id = client.post("/api/v1/tenants/", json=sample_tenant_data).json()["id"]
+
+        contract_data = sample_contract_data.copy()
+        contract_data["property_id"] = property_id
+        contract_data["tenant_id"] = tenant_id
+        contract_data["start_date"] = contract_data["start_date"].isoformat()
+        contract_data["end_date"] = contract_data["end_date"].isoformat()
+        assert client.post("/api/v1/contracts/", json=contract_data).status_code == 201
+
+        stats = client.get("/api/v1/dashboard/stats").json()
+        assert stats["total_properties"] == 1
+        assert stats["total_tenants"] == 1
+        assert stats["total_contracts"] == 1
+        assert stats["monthly_revenue"] == 1500.0
+
+    def test_property_metrics_aggregate_per_property(
+        self,
+        client: TestClient,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+        sample_payment_data,
+        sample_expense_data,
+    ):
+        """Test per-property metrics for occupied and vacant properties"""
+        from datetime import date
+
+        today = date.today().isoformat()
+        occupied_id = client.post("/api/v1/properties/", json=sample_property_data).json()["id"]
+        vacant_data = {**sample_property_data, "name": "Vacant Property"}
+        vacant_id = client.post("/api/v1/properties/", json=vacant_data).json()["id"]
+        tenant_id = client.post("/api/v1/tenants/", json=sample_tenant_data).json()["id"]
+
+        contract_data = sample_contract_data.copy()
+        contract_data["property_id"] = occupied_id
+        contract_data["tenant_id"] = tenant_id
+        contract_data["start_date"] = contract_data["start_date"].isoformat()
+        contract_data["end_date"] = contract_data["end_date"].isoformat()
+        contract_id = client.post("/api/v1/contracts/", json=contract_data).json()["id"]
+
+        payment_data = sample_payment_data.copy()
+        payment_data.update(
+            property_id=occupied_id,
+            tenant_id=tenant_id,
+            contract_id=contract_id,
+            due_date=today,
+            payment_date=today,
+            amount=1000.00,
+            status="paid",
+        )
+        assert client.post("/api/v1/payments/", json=payment_data).status_code == 201
+
+        expense_data = {**sample_expense_data, "property_id": occupied_id, "date": today}
+        assert client.post("/api/v1/expenses/", json=expense_data).status_code == 201
+
+        status = client.get("/api/v1/dashboard/properties-status").json()
+        by_id = {p["id"]: p for p in status["properties"]}
+        assert by_id[occupied_id]["status"] == "occupied"
+        assert by_id[occupied_id]["active_contracts"] == 1
+        assert by_id[occupied_id]["expected_monthly_revenue"] == 1500.0
+        assert by_id[occupied_id]["received_monthly_revenue"] == 1000.0
+        assert by_id[occupied_id]["monthly_expenses"] == 250.0
+        assert by_id[occupied_id]["net_profit"] == 750.0
+        assert by_id[vacant_id]["status"] == "vacant"
+        assert by_id[vacant_id]["active_contracts"] == 0
+        assert status["summary"]["occupied"] == 1
+        assert status["summary"]["vacant"] == 1
+
+        performance = client.get("/api/v1/dashboard/property-performance").json()
+        perf_by_id = {p["property_id"]: p for p in performance["properties"]}
+        assert perf_by_id[occupied_id]["revenue_received"] == 1000.0
+        assert perf_by_id[occupied_id]["revenue_expected"] == 1500.0
+        assert perf_by_id[occupied_id]["collection_rate"] == 66.67
+        assert perf_by_id[vacant_id]["collection_rate"] == 0
+
+    def test_revenue_vs_expenses_calendar_months(
+        self, client: TestClient, sample_property_data, sample_expense_data
+    ):
+        """Test monthly series has one entry per calendar month, oldest first"""
+        from datetime import date
+
+        from dateutil.relativedelta import relativedelta
+
+        property_id = client.post("/api/v1/properties/", json=sample_property_data).json()["id"]
+        last_month = date.today().replace(day=1) - relativedelta(months=1)
+        expense_data = {
+            **sample_expense_data,
+            "property_id": property_id,
+            "date": last_month.isoformat(),
+        }
+        assert client.post("/api/v1/expenses/", json=expense_data).status_code == 201
+
+        response = client.get("/api/v1/dashboard/revenue-vs-expenses?months=24")
+        assert response.status_code == 200
+        data = response.json()["data"]
+
+        current = date.today().replace(day=1)
+        expected_months = [
+            (current - relativedelta(months=i)).strftime("%Y-%m") for i in reversed(range(24))
+        ]
+        assert [item["month"] for item in data] == expected_months
+
+        by_month = {item["month"]: item for item in data}
+        assert by_month[last_month.strftime("%Y-%m")]["expenses"] == 250.0
+        assert by_month[last_month.strftime("%Y-%m")]["profit"] == -250.0
+        assert by_month[current.strftime("%Y-%m")]["expenses"] == 0.0
+
+        chart = client.get("/api/v1/dashboard/revenue-chart?months=3").json()["data"]
+        assert [item["month"] for item in chart] == expected_months[-3:]
+
+    def test_monthly_rollups_follow_writes(
+        self,
+        client: TestClient,
+        db,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+        sample_payment_data,
+        sample_expense_data,
+    ):
+        """Test rollups are kept in sync on create, update and delete"""
+        from datetime import date
+
+        from dateutil.relativedelta import relativedelta
+
+        from app.src.dashboard.models import MonthlyRollup
+        from app.src.dashboard.rollups import MonthlyRollupService
+
+        current = date.today().replace(day=1)
+        last_month = current - relativedelta(months=1)
+        property_id = client.post("/api/v1/properties/", json=sample_property_data).json()["id"]
+        tenant_id = client.post("/api/v1/tenants/", json=sample_tenant_data).json()["id"]
+
+        contract_data = sample_contract_data.copy()
+        contract_data["property_id"] = property_id
+        contract_data["tenant_id"] = tenant_id
+        contract_data["start_date"] = contract_data["start_date"].isoformat()
+        contract_data["end_date"] = contract_data["end_date"].isoformat()
+        contract_id = client.post("/api/v1/contracts/", json=contract_data).json()["id"]
+
+        payment_data = sample_payment_data.copy()
+        payment_data.update(
+            property_id=property_id,
+            tenant_id=tenant_id,
+            contract_id=contract_id,
+            due_date=current.isoformat(),
+            payment_date=current.isoformat(),
+            amount=1000.00,
+            status="paid",
+        )
+        payment_id = client.post("/api/v1/payments/", json=payment_data).json()["id"]
+
+        expense_data = {**sample_expense_data, "property_id": property_id}
+        expense_data["date"] = current.isoformat()
+        expense_id = client.post("/api/v1/expenses/", json=expense_data).json()["id"]
+
+        overview = client.get("/api/v1/dashboard/financial-overview").json()
+        assert overview["summary"]["total_revenue"] == 1000.0
+        assert overview["summary"]["total_expenses"] == 250.0
+        assert overview["expense_breakdown"] == [{"category": "maintenance", "amount": 250.0}]
+        assert overview["payment_status"]["paid"] == 1
+
+        # Mover a despesa para o mês anterior recalcula os dois buckets
+        response = client.put(
+            f"/api/v1/expenses/{expense_id}", json={"date": last_month.isoformat()}
+        )
+        assert response.status_code == 200
+        series = client.get("/api/v1/dashboard/revenue-vs-expenses?months=2").json()["data"]
+        assert [item["expenses"] for item in series] == [250.0, 0.0]
+        assert [item["revenue"] for item in series] == [0.0, 1000.0]
+
+        assert client.delete(f"/api/v1/payments/{payment_id}").status_code == 200
+        overview = client.get("/api/v1/dashboard/financial-overview").json()
+        assert overview["summary"]["total_revenue"] == 0.0
+        assert overview["payment_status"]["paid"] == 0
+
+        # A reconstrução completa produz os mesmos buckets da manutenção incremental
+        def snapshot():
+            db.expire_all()
+            return {
+                (r.property_id, r.month): (r.revenue_received, r.expenses_total, r.payments_paid)
+                for r in db.query(MonthlyRollup).filter(MonthlyRollup.user_id == 1)
+                if r.revenue_received or r.expenses_total or r.payments_paid
+            }
+
+        incremental = snapshot()
+        MonthlyRollupService.rebuild(db, user_id=1)
+        assert snapshot() == incremental
+        assert incremental == {(property_id, last_month): (0, 250, 0)}
+
+    def test_cached_stats_invalidated_after_write(self, client: TestClient, sample_property_data):
+        """Test cached responses go stale as soon as the user writes data"""
+        from app.src.dashboard.cache import dashboard_cache
+
+        assert client.get("/api/v1/dashboard/stats").json()["total_properties"] == 0
+        key, cached = dashboard_cache.get(1, "dashboard:stats", {})
+        assert cached["total_properties"] == 0
+
+        client.post("/api/v1/properties/", json=sample_property_data)
+
+        assert dashboard_cache.get(1, "dashboard:stats", {})[1] is None
+        assert client.get("/api/v1/dashboard/stats").json()["total_properties"] == 1
@@ -25,6 +25,29 @@ class TestExpensesAPI:
         assert expense["status"] == "pending"
         assert "id" in expense
 
+    def test_list_expenses_with_cursor(
+        self, client: TestClient, sample_property_data, sample_expense_data
+    ):
+        """Test keyset pagination ordered by date (most recent first)"""
+        prop_response = client.post("/api/v1/properties/", json=sample_property_data)
+        property_id = prop_response.json()["id"]
+
+        dates = ["2025-01-10", "2025-03-05", "2025-02-01", "2025-03-05", "2025-01-20"]
+        for expense_date in dates:
+            expense_data = {**sample_expense_data, "property_id": property_id, "date": expense_date}
+            assert client.post("/api/v1/expenses/", json=expense_data).status_code == 201
+
+        pages = []
+        cursor = ""
+        while cursor is not None:
+            response = client.get("/api/v1/expenses/", params={"cursor": cursor, "limit": 2})
+            assert response.status_code == 200
+            pages.append([item["date"] for item in response.json()])
+            cursor = response.headers.get("X-Next-Cursor")
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sum(pages, []) == sorted(dates, reverse=True)
+
     def test_get_expense(self, client: TestClient, sample_property_data, sample_expense_data):
         """Test retrieving an expense by ID"""
         # Create property
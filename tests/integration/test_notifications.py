@@ -69,3 +69,18 @@ class TestNotificationsAPI:
         for notification in notifications:
             if "type" in notification:
                 assert notification["type"] in valid_types
+
+    def test_process_background_tasks_is_deprecated(self, client: TestClient):
+        """Test that the per-user endpoint still works but is marked deprecated"""
+        response = client.post("/api/v1/notifications/process-background-tasks")
+        assert response.status_code == 200
+        assert set(response.json()) == {
+            "payment_status_changes",
+            "contract_notifications",
+            "payment_reminders",
+            "overdue_notifications",
+        }
+
+        schema = client.get("/api/v1/openapi.json").json()
+        operation = schema["paths"]["/api/v1/notifications/process-background-tasks"]["post"]
+        assert operation["deprecated"] is True
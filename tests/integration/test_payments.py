@@ -88,6 +88,18 @@ class TestPaymentsAPI:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    def test_list_payments_with_filters(self, client: TestClient):
+        """Test combined query-string filters"""
+        response = client.get(
+            "/api/v1/payments/",
+            params={"status": "paid", "due_date_from": "2025-01-01", "payment_method": "pix"},
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+        response = client.get("/api/v1/payments/", params={"due_date_from": "not-a-date"})
+        assert response.status_code == 422
+
     def test_update_payment(
         self,
         client: TestClient,
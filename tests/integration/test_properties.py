@@ -46,6 +46,39 @@ class TestPropertiesAPI:
         response = client.get("/api/v1/properties/?status=vacant")
         assert response.status_code == 200
 
+    def test_list_properties_with_cursor(self, client: TestClient, sample_property_data):
+        """Test keyset pagination with the opaque next cursor"""
+        created = [
+            client.post(
+                "/api/v1/properties/", json={**sample_property_data, "name": f"P{i}"}
+            ).json()["id"]
+            for i in range(5)
+        ]
+
+        seen = []
+        cursor = ""
+        while True:
+            response = client.get("/api/v1/properties/", params={"cursor": cursor, "limit": 2})
+            assert response.status_code == 200
+            seen += [item["id"] for item in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert seen == sorted(created)
+
+        # Cursor combinado com filtros
+        response = client.get(
+            "/api/v1/properties/", params={"cursor": "", "status": "occupied", "limit": 2}
+        )
+        assert response.json() == []
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_list_properties_with_invalid_cursor(self, client: TestClient):
+        """Test that a malformed cursor is rejected"""
+        response = client.get("/api/v1/properties/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
     def test_update_property(self, client: TestClient, sample_property_data):
         """Test updating a property"""
         # Create property
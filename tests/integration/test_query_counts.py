@@ -0,0 +1,76 @@
+"""Query budgets per endpoint (N+1 detection)"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.instrumentation import QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+
+
+@pytest.fixture
+def seeded(client: TestClient, sample_property_data, sample_tenant_data, sample_contract_data):
+    """Imóvel, inquilino, contrato e vários pagamentos/despesas do usuário 1"""
+    property_id = client.post("/api/v1/properties/", json=sample_property_data).json()["id"]
+    tenant_id = client.post("/api/v1/tenants/", json=sample_tenant_data).json()["id"]
+    contract_data = {
+        **sample_contract_data,
+        "property_id": property_id,
+        "tenant_id": tenant_id,
+        "start_date": sample_contract_data["start_date"].isoformat(),
+        "end_date": sample_contract_data["end_date"].isoformat(),
+    }
+    contract_id = client.post("/api/v1/contracts/", json=contract_data).json()["id"]
+    for month in range(1, 7):
+        payment = {
+            "property_id": property_id,
+            "tenant_id": tenant_id,
+            "contract_id": contract_id,
+            "due_date": f"2025-{month:02d}-05",
+            "amount": 1500.0,
+            "total_amount": 1500.0,
+            "status": "pending",
+        }
+        assert client.post("/api/v1/payments/", json=payment).status_code in (200, 201)
+    return {"property_id": property_id, "tenant_id": tenant_id, "contract_id": contract_id}
+
+
+class TestQueryCounts:
+    """Test that list, detail and dashboard endpoints do a constant number of queries"""
+
+    @pytest.mark.parametrize(
+        "url, limit",
+        [
+            ("/api/v1/properties/", 1),
+            ("/api/v1/tenants/", 1),
+            ("/api/v1/contracts/", 1),
+            ("/api/v1/payments/", 1),
+            ("/api/v1/payments/?status=pending&skip=1&limit=2", 1),
+            ("/api/v1/expenses/", 1),
+            ("/api/v1/notifications/", 1),
+            ("/api/v1/dashboard/stats", 4),
+            ("/api/v1/dashboard/summary", 6),
+            ("/api/v1/dashboard/recent-activity", 2),
+            ("/api/v1/dashboard/financial-overview", 1),
+        ],
+    )
+    def test_endpoint_query_budget(self, client: TestClient, seeded, max_queries, url, limit):
+        """Test the query budget of each endpoint with several rows seeded"""
+        with max_queries(limit):
+            assert client.get(url).status_code == 200
+
+    def test_detail_query_budget(self, client: TestClient, seeded, max_queries):
+        """Test detail endpoints: one query each"""
+        with max_queries(1):
+            assert client.get(f"/api/v1/properties/{seeded['property_id']}").status_code == 200
+        with max_queries(1):
+            assert client.get(f"/api/v1/contracts/{seeded['contract_id']}").status_code == 200
+
+    def test_debug_headers(self, client: TestClient, seeded, monkeypatch):
+        """Test query count headers when DB_QUERY_STATS is enabled"""
+        response = client.get("/api/v1/properties/")
+        assert QUERY_COUNT_HEADER not in response.headers
+
+        monkeypatch.setattr(settings, "DB_QUERY_STATS", True)
+        response = client.get("/api/v1/dashboard/stats")
+        assert response.headers[QUERY_COUNT_HEADER] == "4"
+        assert float(response.headers[QUERY_TIME_HEADER]) > 0
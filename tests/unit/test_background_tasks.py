@@ -0,0 +1,337 @@
+"""Unit tests for BackgroundTasksService"""
+
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.background_tasks import BackgroundTasksService
+from app.core.notification_service import NotificationService
+from app.src.contracts.models import Contract
+from app.src.dashboard.models import MonthlyRollup
+from app.src.notifications.models import Notification
+from app.src.payments.models import Payment
+from app.src.properties.models import Property
+from app.src.tenants.models import Tenant
+
+
+def _create_contract(db: Session, user_id: int, data: dict) -> Contract:
+    """Cria imóvel, inquilino e contrato para o usuário"""
+    property_obj = Property(**{**data["property"], "user_id": user_id})
+    tenant = Tenant(
+        **{
+            **data["tenant"],
+            "user_id": user_id,
+            "email": f"user{user_id}@example.com",
+            "cpf_cnpj": f"0000000000{user_id}",
+        }
+    )
+    db.add_all([property_obj, tenant])
+    db.flush()
+    contract = Contract(
+        **{
+            **data["contract"],
+            "user_id": user_id,
+            "property_id": property_obj.id,
+            "tenant_id": tenant.id,
+        }
+    )
+    db.add(contract)
+    db.flush()
+    return contract
+
+
+def _payment(contract: Contract, due_date: date, **values) -> Payment:
+    defaults = {
+        "user_id": contract.user_id,
+        "property_id": contract.property_id,
+        "tenant_id": contract.tenant_id,
+        "contract_id": contract.id,
+        "due_date": due_date,
+        "amount": 1500,
+        "total_amount": 1500,
+        "status": "pending",
+    }
+    return Payment(**{**defaults, **values})
+
+
+class TestPaymentStatusUpdate:
+    """Test set-based payment status transitions"""
+
+    def test_updates_statuses_for_one_user(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test transitions and grouped counts for a single user"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        other_contract = _create_contract(db, 2, data)
+        yesterday = date.today() - timedelta(days=1)
+        next_week = date.today() + timedelta(days=7)
+
+        late = _payment(contract, yesterday)
+        upcoming = _payment(contract, next_week)
+        registered = _payment(contract, yesterday, status="overdue", payment_date=date.today())
+        short = _payment(contract, yesterday, payment_date=date.today(), amount=1000)
+        other_user_late = _payment(other_contract, yesterday)
+        db.add_all([late, upcoming, registered, short, other_user_late])
+        db.commit()
+
+        changes = BackgroundTasksService.update_payment_statuses_automatically(db, 1)
+
+        assert changes == {
+            "pending_to_overdue": 1,
+            "total_overdue": 1,
+            "total_pending": 1,
+            "total_paid": 1,
+            "total_partial": 1,
+        }
+        db.expire_all()
+        assert late.status == "overdue"
+        assert upcoming.status == "pending"
+        assert registered.status == "paid"
+        assert short.status == "partial"
+        assert other_user_late.status == "pending"
+
+        # Rollup do mês de vencimento acompanha a mudança de status
+        rollup = db.get(MonthlyRollup, (1, contract.property_id, yesterday.replace(day=1)))
+        assert rollup.payments_overdue == 1
+
+    def test_zero_amount_with_payment_date_is_not_paid(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test payment_date with amount 0 follows determine_payment_status (pending/overdue)"""
+        from decimal import Decimal
+
+        from app.core.payment_service import PaymentCalculationService
+
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        yesterday = date.today() - timedelta(days=1)
+        next_week = date.today() + timedelta(days=7)
+
+        late = _payment(contract, yesterday, payment_date=date.today(), amount=0)
+        upcoming = _payment(
+            contract, next_week, status="paid", payment_date=date.today(), amount=0, total_amount=0
+        )
+        db.add_all([late, upcoming])
+        db.commit()
+
+        changes = BackgroundTasksService.update_payment_statuses_automatically(db, 1)
+
+        assert changes["pending_to_overdue"] == 1
+        assert changes["total_paid"] == 0
+        assert changes["total_partial"] == 0
+        db.expire_all()
+        for payment in (late, upcoming):
+            assert payment.status == PaymentCalculationService.determine_payment_status(
+                payment.due_date, payment.payment_date, None, Decimal(str(payment.total_amount))
+            )
+        assert (late.status, upcoming.status) == ("overdue", "pending")
+
+    def test_updates_statuses_for_all_users(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test a run without user_id covers every user"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        yesterday = date.today() - timedelta(days=1)
+        payments = [_payment(_create_contract(db, user_id, data), yesterday) for user_id in (1, 2)]
+        db.add_all(payments)
+        db.commit()
+
+        changes = BackgroundTasksService.update_payment_statuses_automatically(db)
+
+        assert changes["pending_to_overdue"] == 2
+        assert changes["total_overdue"] == 2
+
+        # Segunda execução não encontra nada para mudar
+        changes = BackgroundTasksService.update_payment_statuses_automatically(db)
+        assert changes["pending_to_overdue"] == 0
+
+
+class TestNotificationPasses:
+    """Test idempotent notification inserts"""
+
+    def test_reminders_are_not_duplicated(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test a second run in the same window inserts nothing"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        db.add_all(
+            [
+                _payment(contract, date.today()),
+                _payment(contract, date.today() + timedelta(days=2)),
+                _payment(contract, date.today() + timedelta(days=5)),
+            ]
+        )
+        db.commit()
+
+        assert BackgroundTasksService.process_payment_reminders(db, 1) == 2
+        assert BackgroundTasksService.process_payment_reminders(db, 1) == 0
+
+        reminders = db.query(Notification).filter(Notification.type == "reminder").all()
+        assert len(reminders) == 2
+        assert all(sample_tenant_data["name"] in n.title for n in reminders)
+
+    def test_idempotency_key_from_event(self):
+        """Test keys identify the notified event, not the moment of the run"""
+        key = NotificationService.build_idempotency_key(1, "reminder", "10", "due_today:2025-06-05")
+
+        assert key == "1:reminder:10:due_today:2025-06-05"
+        assert key != NotificationService.build_idempotency_key(
+            1, "reminder", "10", "2d_before:2025-06-05"
+        )
+        assert key != NotificationService.build_idempotency_key(
+            2, "reminder", "10", "due_today:2025-06-05"
+        )
+
+    def test_contract_expiring_once_across_window(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+        monkeypatch,
+    ):
+        """Test that runs on days 61, 60 and 59 before the end create one notification"""
+        from datetime import datetime
+
+        from app.core import payment_service
+
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": {**sample_contract_data, "end_date": date(2025, 12, 31)},
+        }
+        contract = _create_contract(db, 1, data)
+        db.commit()
+
+        for days_before in (61, 60, 59):
+            run_day = contract.end_date - timedelta(days=days_before)
+
+            class FrozenDatetime(datetime):
+                @classmethod
+                def now(cls, tz=None):
+                    return cls.combine(run_day, datetime.min.time())
+
+            monkeypatch.setattr(payment_service, "datetime", FrozenDatetime)
+            BackgroundTasksService.process_contract_expiring_notifications(db, 1)
+
+        notifications = (
+            db.query(Notification).filter(Notification.type == "contract_expiring").all()
+        )
+        assert len(notifications) == 1
+        assert (
+            notifications[0].idempotency_key == f"1:contract_expiring:{contract.id}:60d:2025-12-31"
+        )
+
+    def test_single_notification_helpers_are_idempotent(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test a repeated event returns the existing row instead of raising IntegrityError"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        payment = _payment(contract, date.today(), status="paid", payment_date=date.today())
+        db.add(payment)
+        db.commit()
+
+        first = NotificationService.create_contract_expiring_notification(db, contract, 60)
+        again = NotificationService.create_contract_expiring_notification(db, contract, 60)
+        reminder = NotificationService.create_payment_reminder_notification(db, payment, 0)
+        NotificationService.create_payment_reminder_notification(db, payment, 0)
+        received = NotificationService.create_payment_received_notification(db, payment)
+        received_again = NotificationService.create_payment_received_notification(db, payment)
+
+        assert again.id == first.id
+        assert first.title == "Contrato vencendo em 60 dias"
+        assert reminder.idempotency_key.startswith(f"1:reminder:{payment.id}:due_today:")
+        assert received.idempotency_key is None
+        assert received_again.id != received.id
+        assert db.query(Notification).count() == 4
+
+    def test_full_run_statement_count_does_not_grow(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test a full run costs the same number of statements for 2 or 8 items"""
+        from sqlalchemy import event
+
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        db.commit()
+
+        def run_with(count: int) -> tuple:
+            db.query(Notification).delete()
+            db.query(Payment).delete()
+            for _ in range(count):
+                db.add(_payment(contract, date.today()))  # lembrete "vence hoje"
+                db.add(_payment(contract, date.today() - timedelta(days=1)))  # 1 dia de atraso
+            db.commit()
+
+            statements = []
+
+            def count_statement(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", count_statement)
+            try:
+                results = BackgroundTasksService.run_all_background_tasks(db, 1)
+            finally:
+                event.remove(bind, "before_cursor_execute", count_statement)
+            return len(statements), results
+
+        small_count, small = run_with(1)
+        large_count, large = run_with(4)
+
+        assert small["payment_reminders"] == 1
+        assert small["overdue_notifications"] == 1
+        assert large["payment_reminders"] == 4
+        assert large["overdue_notifications"] == 4
+        assert large_count == small_count
@@ -0,0 +1,53 @@
+"""Unit tests for the response cache backends"""
+
+from app.core.cache import InMemoryCache, ResponseCache
+
+
+class TestInMemoryCache:
+    """Test in-process LRU + TTL backend"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full"""
+        cache = InMemoryCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        assert cache.get("a") == 1  # "a" passa a ser o mais recente
+
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_expired_entries_are_misses(self):
+        """Test entries are not returned after their TTL"""
+        cache = InMemoryCache()
+        cache.set("a", 1, ttl=0)
+
+        assert cache.get("a") is None
+
+
+class TestResponseCache:
+    """Test per-user versioned keys"""
+
+    def test_invalidate_user_only_affects_that_user(self):
+        """Test bumping a user version hides only that user's entries"""
+        cache = ResponseCache(InMemoryCache(), ttl=60)
+        key_1, _ = cache.get(1, "dashboard:stats", {})
+        key_2, _ = cache.get(2, "dashboard:stats", {})
+        cache.set(key_1, {"total": 1})
+        cache.set(key_2, {"total": 2})
+
+        cache.invalidate_user(1)
+
+        assert cache.get(1, "dashboard:stats", {})[1] is None
+        assert cache.get(2, "dashboard:stats", {})[1] == {"total": 2}
+
+    def test_params_are_part_of_the_key(self):
+        """Test different query params do not share entries"""
+        cache = ResponseCache(InMemoryCache(), ttl=60)
+        key, _ = cache.get(1, "dashboard:revenue-chart", {"months": 6})
+        cache.set(key, {"data": []})
+
+        assert cache.get(1, "dashboard:revenue-chart", {"months": 12})[1] is None
+        assert cache.get(1, "dashboard:revenue-chart", {"months": 6})[1] == {"data": []}
@@ -0,0 +1,47 @@
+"""Tests for query counting and N+1 detection"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import capture_queries, get_query_stats, track_queries
+
+
+class TestQueryInstrumentation:
+    """Test statement counting, timing and repeated shapes"""
+
+    def test_track_queries_counts_statements(self, db: Session):
+        """Test that statements in the block are counted, and only them"""
+        db.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            assert get_query_stats() is stats
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT   2"))
+        db.execute(text("SELECT 3"))
+
+        assert get_query_stats() is None
+        assert stats.count == 2
+        assert stats.total_ms > 0
+        assert stats.shapes["SELECT 2"] == 1
+
+    def test_repeated_shapes_flag_n_plus_one(self, db: Session):
+        """Test that the same statement in a loop is reported, parameters aside"""
+        with capture_queries() as stats:
+            for value in range(6):
+                db.execute(text("SELECT :value"), {"value": value})
+            db.execute(text("SELECT now()"))
+
+        assert stats.count == 7
+        assert stats.repeated(threshold=5) == {"SELECT %(value)s": 6}
+        assert stats.repeated(threshold=7) == {}
+        assert "6x SELECT %(value)s" in stats.report()
+
+    def test_failed_statement_is_not_counted(self, db: Session):
+        """Test that a failing statement does not break the timing bookkeeping"""
+        with track_queries() as stats:
+            try:
+                db.execute(text("SELECT * FROM tabela_inexistente"))
+            except Exception:
+                db.rollback()
+            db.execute(text("SELECT 1"))
+
+        assert stats.count == 1
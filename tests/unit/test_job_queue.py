@@ -0,0 +1,129 @@
+"""Tests for the Postgres-backed job queue"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.job_queue import JOB_HANDLERS, JobQueue, job_handler
+from app.src.jobs.models import Job
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+def handlers():
+    """Registra handlers de teste e remove ao final"""
+    calls = []
+
+    @job_handler("test.ok")
+    def ok(db: Session, payload: dict) -> None:
+        calls.append(payload)
+
+    @job_handler("test.fail")
+    def fail(db: Session, payload: dict) -> None:
+        raise RuntimeError("boom")
+
+    yield calls
+
+    JOB_HANDLERS.pop("test.ok", None)
+    JOB_HANDLERS.pop("test.fail", None)
+
+
+class TestJobQueue:
+    """Test enqueue, lease, heartbeat, retry and dead-letter"""
+
+    def test_enqueue_with_dedupe_key(self, db: Session):
+        """Test that a repeated dedupe key does not create a second job"""
+        first = JobQueue.enqueue(db, "test.ok", {"n": 1}, dedupe_key="k1")
+        second = JobQueue.enqueue(db, "test.ok", {"n": 2}, dedupe_key="k1")
+
+        assert first is not None
+        assert second is None
+        assert db.query(Job).count() == 1
+
+    def test_lease_skips_locked_and_future_jobs(self, db: Session):
+        """Test that leases skip rows locked by another transaction"""
+        first = JobQueue.enqueue(db, "test.ok")
+        second = JobQueue.enqueue(db, "test.ok")
+        JobQueue.enqueue(db, "test.ok", run_at=datetime.utcnow() + timedelta(hours=1))
+
+        # Conexão própria (fora do pool da sessão) segurando o lock de um job
+        other_engine = create_engine(
+            TEST_DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={"options": "-csearch_path=test_schema"},
+        )
+        other = other_engine.connect()
+        try:
+            other.execute(text("SELECT id FROM jobs WHERE id = :id FOR UPDATE"), {"id": first})
+
+            leased = JobQueue.lease(db, "worker-a", limit=10)
+            assert [job.id for job in leased] == [second]
+            assert leased[0].status == "running"
+            assert leased[0].attempts == 1
+            assert leased[0].locked_by == "worker-a"
+        finally:
+            other.rollback()
+            other.close()
+            other_engine.dispose()
+
+        assert [job.id for job in JobQueue.lease(db, "worker-b", limit=10)] == [first]
+        assert JobQueue.lease(db, "worker-c", limit=10) == []
+
+    def test_heartbeat_and_expired_lease(self, db: Session):
+        """Test lease renewal and reclaiming jobs from a dead worker"""
+        job_id = JobQueue.enqueue(db, "test.ok")
+        JobQueue.lease(db, "worker-a", lease_seconds=60)
+
+        assert JobQueue.heartbeat(db, job_id, "worker-a") is True
+        assert JobQueue.heartbeat(db, job_id, "worker-b") is False
+
+        db.query(Job).filter(Job.id == job_id).update(
+            {"locked_until": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+
+        leased = JobQueue.lease(db, "worker-b")
+        assert [job.id for job in leased] == [job_id]
+        assert leased[0].attempts == 2
+        assert JobQueue.heartbeat(db, job_id, "worker-a") is False
+
+    def test_retry_backoff_and_dead_letter(self, db: Session, handlers):
+        """Test that failures are retried with backoff and then dead-lettered"""
+        job_id = JobQueue.enqueue(db, "test.fail", max_attempts=2)
+
+        assert JobQueue.work_once(db, "worker-a") == {"queued": 1}
+        job = db.get(Job, job_id)
+        assert job.status == "queued"
+        assert job.run_at > datetime.utcnow()
+        assert "boom" in job.last_error
+
+        job.run_at = datetime.utcnow()
+        db.commit()
+
+        assert JobQueue.work_once(db, "worker-a") == {"dead": 1}
+        db.refresh(job)
+        assert job.status == "dead"
+        assert job.attempts == 2
+        assert JobQueue.count_by_status(db) == {"dead": 1}
+
+        assert JobQueue.requeue_dead(db, job_id) is True
+        db.refresh(job)
+        assert job.status == "queued"
+        assert job.attempts == 0
+
+    def test_retry_delay_is_capped(self):
+        """Test exponential backoff with a maximum"""
+        assert JobQueue.retry_delay(2) == 2 * JobQueue.retry_delay(1)
+        assert JobQueue.retry_delay(50) == JobQueue.retry_delay(60)
+
+    def test_work_once_runs_handler(self, db: Session, handlers):
+        """Test successful jobs and unknown handlers"""
+        JobQueue.enqueue(db, "test.ok", {"n": 1})
+        JobQueue.enqueue(db, "missing.handler", max_attempts=1)
+
+        assert JobQueue.work_once(db, "worker-a", limit=10) == {"done": 1, "dead": 1}
+        assert handlers == [{"n": 1}]
+        assert JobQueue.count_by_status(db) == {"done": 1, "dead": 1}
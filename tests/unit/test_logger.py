@@ -0,0 +1,69 @@
+"""Tests for the structured logging module"""
+
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.core.logger import (
+    REQUEST_ID_HEADER,
+    DebugSamplingFilter,
+    JsonFormatter,
+    RequestIdFilter,
+    parse_logger_levels,
+    request_id_var,
+)
+
+
+def _record(level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", level, __file__, 1, "mensagem %s", ("ok",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestStructuredLogging:
+    """Test JSON lines, request ids and debug sampling"""
+
+    def test_json_formatter_includes_request_id_and_extra(self):
+        """Test that each record becomes one JSON object"""
+        token = request_id_var.set("req-1")
+        try:
+            record = _record(payment_id=7)
+            RequestIdFilter().filter(record)
+            payload = json.loads(JsonFormatter().format(record))
+        finally:
+            request_id_var.reset(token)
+
+        assert payload["message"] == "mensagem ok"
+        assert payload["level"] == "INFO"
+        assert payload["logger"] == "app.test"
+        assert payload["request_id"] == "req-1"
+        assert payload["payment_id"] == 7
+
+    def test_debug_sampling_is_per_request(self):
+        """Test that sampling keeps or drops all debug logs of a request"""
+        sampler = DebugSamplingFilter(0.5)
+        for request_id in [f"req-{i}" for i in range(20)]:
+            decisions = {
+                sampler.filter(_record(logging.DEBUG, request_id=request_id)) for _ in range(5)
+            }
+            assert len(decisions) == 1
+
+        assert DebugSamplingFilter(0.0).filter(_record(logging.DEBUG, request_id="x")) is False
+        assert DebugSamplingFilter(0.0).filter(_record(logging.WARNING)) is True
+
+    def test_parse_logger_levels(self):
+        """Test per-logger level configuration"""
+        assert parse_logger_levels("app.src.payments=debug, sqlalchemy.engine=WARNING") == {
+            "app.src.payments": "DEBUG",
+            "sqlalchemy.engine": "WARNING",
+        }
+        assert parse_logger_levels("") == {}
+
+    def test_request_id_header(self, client: TestClient):
+        """Test that the request id is propagated or generated"""
+        response = client.get("/health", headers={REQUEST_ID_HEADER: "abc123"})
+        assert response.headers[REQUEST_ID_HEADER] == "abc123"
+
+        response = client.get("/health")
+        assert len(response.headers[REQUEST_ID_HEADER]) == 32
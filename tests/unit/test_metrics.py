@@ -0,0 +1,121 @@
+"""Tests for the Prometheus-style metrics exposition"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.metrics import (
+    COLLECTORS,
+    DB_POOL_TIMEOUTS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    render_metrics,
+)
+from app.db import session
+from app.db.session import TimeoutCountingAsyncQueuePool, TimeoutCountingQueuePool, engine
+from tests.conftest import TEST_DATABASE_URL
+
+
+def unregister(*metrics):
+    for metric in metrics:
+        REGISTRY.remove(metric)
+
+
+class TestMetrics:
+    """Test label reuse, histogram buckets and collectors"""
+
+    def test_labels_reuse_child(self):
+        """Test that the same label values return the same child object"""
+        counter = Counter("test_jobs_total", "Jobs", ["status"])
+        gauge = Gauge("test_in_flight", "Em andamento")
+        try:
+            child = counter.labels("done")
+            assert counter.labels("done") is child
+            child.inc()
+            counter.labels("done").inc(2)
+            counter.labels("failed").inc()
+            gauge.inc()
+            gauge.inc()
+            gauge.dec()
+
+            text = render_metrics()
+            assert "# TYPE test_jobs_total counter" in text
+            assert 'test_jobs_total{status="done"} 3.0' in text
+            assert 'test_jobs_total{status="failed"} 1.0' in text
+            assert "test_in_flight 1.0" in text
+        finally:
+            unregister(counter, gauge)
+
+    def test_histogram_cumulative_buckets(self):
+        """Test bucket boundaries (le is inclusive), +Inf, sum and count"""
+        histogram = Histogram("test_seconds", "Duração", ["stage"], buckets=(0.1, 1.0))
+        try:
+            stage = histogram.labels("load")
+            for value in (0.05, 0.1, 0.5, 3.0):
+                stage.observe(value)
+            with histogram.labels("idle").time():
+                pass
+
+            lines = render_metrics().splitlines()
+            assert 'test_seconds_bucket{stage="load",le="0.1"} 2' in lines
+            assert 'test_seconds_bucket{stage="load",le="1.0"} 3' in lines
+            assert 'test_seconds_bucket{stage="load",le="+Inf"} 4' in lines
+            assert 'test_seconds_sum{stage="load"} 3.65' in lines
+            assert 'test_seconds_count{stage="load"} 4' in lines
+            assert 'test_seconds_count{stage="idle"} 1' in lines
+        finally:
+            unregister(histogram)
+
+    def test_pool_collectors(self):
+        """Test that the pool gauges are read at scrape time"""
+        assert {"db_pool_checked_out", "db_pool_overflow", "db_pool_size"} <= set(COLLECTORS)
+        text = render_metrics()
+        assert "# TYPE db_pool_checked_out gauge" in text
+        if hasattr(engine.pool, "checkedout"):
+            assert f'db_pool_size{{engine="primary"}} {engine.pool.size()}' in text
+
+    def test_metrics_endpoint_uses_route_template(self, client: TestClient):
+        """Test that /metrics reports latency by route template, not by raw path"""
+        client.get("/api/v1/properties/999999")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/properties/{property_id}",status_class="4xx"}'
+        ) in text
+        assert "/api/v1/properties/999999" not in text
+        assert 'http_request_db_queries_count{method="GET",route="/api/v1/properties/' in text
+        assert 'http_requests_in_flight{method="GET"} 1.0' in text
+
+    def test_pool_timeouts_counted_at_checkout(self, monkeypatch):
+        """Test that a checkout timeout is counted even when the caller swallows it"""
+        monkeypatch.setattr(session, "use_nullpool", False)
+        assert session._pool_options()["poolclass"] is TimeoutCountingQueuePool
+        assert session._pool_options(is_async=True)["poolclass"] is TimeoutCountingAsyncQueuePool
+
+        pool_engine = create_engine(
+            TEST_DATABASE_URL,
+            poolclass=TimeoutCountingQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        before = DB_POOL_TIMEOUTS.labels().value
+        try:
+            with pool_engine.connect():
+                with pytest.raises(PoolTimeoutError):
+                    pool_engine.connect()
+                try:
+                    pool_engine.connect()
+                except Exception:
+                    pass  # ex.: rota que converte o erro em HTTPException 500
+        finally:
+            pool_engine.dispose()
+
+        assert DB_POOL_TIMEOUTS.labels().value == before + 2
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.src.contracts.repository import ContractRepository
 from app.src.contracts.schemas import ContractCreate
 from app.src.payments.repository import PaymentRepository
-from app.src.payments.schemas import PaymentCreate, PaymentUpdate
+from app.src.payments.schemas import PaymentCreate, PaymentFilter, PaymentUpdate
 from app.src.properties.repository import PropertyRepository
 from app.src.properties.schemas import PropertyCreate
 from app.src.tenants.repository import TenantRepository
@@ -170,6 +170,155 @@ class TestPaymentRepository:
 
         assert created.status == status
 
+    def test_search_payments_with_combined_filters(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+        sample_payment_data,
+    ):
+        """Test that filters combine in SQL with ordering and pagination"""
+        property_obj = PropertyRepository(db).create(
+            db, obj_in=PropertyCreate(**sample_property_data)
+        )
+        tenant_obj = TenantRepository(db).create(db, obj_in=TenantCreate(**sample_tenant_data))
+        contract_data = {
+            **sample_contract_data,
+            "property_id": property_obj.id,
+            "tenant_id": tenant_obj.id,
+        }
+        contract_obj = ContractRepository(db).create(db, obj_in=ContractCreate(**contract_data))
+
+        repo = PaymentRepository(db)
+        base = {
+            **sample_payment_data,
+            "property_id": property_obj.id,
+            "tenant_id": tenant_obj.id,
+            "contract_id": contract_obj.id,
+        }
+        rows = [
+            (date(2025, 1, 5), "paid", "pix"),
+            (date(2025, 2, 5), "paid", "cash"),
+            (date(2025, 3, 5), "paid", "pix"),
+            (date(2025, 4, 5), "pending", None),
+        ]
+        for due_date, status, method in rows:
+            repo.create(
+                db,
+                obj_in=PaymentCreate(
+                    **{**base, "due_date": due_date, "status": status, "payment_method": method}
+                ),
+            )
+
+        filters = PaymentFilter(
+            status="paid",
+            payment_method="pix",
+            contract_id=contract_obj.id,
+            due_date_from=date(2025, 1, 1),
+            due_date_to=date(2025, 3, 31),
+        )
+        found = repo.search_payments(db, 1, filters)
+        assert [p.due_date for p in found] == [date(2025, 1, 5), date(2025, 3, 5)]
+
+        # Paginação aplicada depois dos filtros, no SQL
+        page = repo.search_payments(db, 1, filters, skip=1, limit=1)
+        assert [p.due_date for p in page] == [date(2025, 3, 5)]
+
+        # Outro usuário não enxerga os pagamentos
+        assert repo.search_payments(db, 2, PaymentFilter(status="paid")) == []
+        assert len(repo.search_payments(db, 1)) == 4
+
+    def test_bulk_create_update_delete(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+        sample_payment_data,
+    ):
+        """Test bulk operations in one transaction, keeping monthly rollups in sync"""
+        from app.src.dashboard.models import MonthlyRollup
+        from app.src.dashboard.rollups import MonthlyRollupService
+
+        property_obj = PropertyRepository(db).create(
+            db, obj_in=PropertyCreate(**sample_property_data)
+        )
+        tenant_obj = TenantRepository(db).create(db, obj_in=TenantCreate(**sample_tenant_data))
+        contract_data = {
+            **sample_contract_data,
+            "property_id": property_obj.id,
+            "tenant_id": tenant_obj.id,
+        }
+        contract_obj = ContractRepository(db).create(db, obj_in=ContractCreate(**contract_data))
+
+        repo = PaymentRepository(db)
+        base = {
+            **sample_payment_data,
+            "property_id": property_obj.id,
+            "tenant_id": tenant_obj.id,
+            "contract_id": contract_obj.id,
+        }
+        due_dates = [date(2025, 1, 5), date(2025, 2, 5), date(2025, 3, 5)]
+        created = repo.bulk_create(
+            db, objs_in=[PaymentCreate(**{**base, "due_date": d}) for d in due_dates]
+        )
+        assert [p.due_date for p in created] == due_dates
+        assert all(p.id is not None for p in created)
+
+        # O controller gera todos os meses com um único INSERT
+        from app.src.payments.controller import payment_controller
+        from app.src.payments.schemas import PaymentBulkCreate
+
+        bulk = PaymentBulkCreate(
+            contract_id=contract_obj.id, months=3, start_date=date(2026, 1, 10), amount=1200
+        )
+        generated = payment_controller(db).create_bulk_payments(db, 1, bulk)
+        assert [p.due_date for p in generated] == [
+            date(2026, 1, 10),
+            date(2026, 2, 10),
+            date(2026, 3, 10),
+        ]
+        repo.bulk_delete(db, ids=[p.id for p in generated])
+
+        # Unidade de trabalho: nada é gravado até o commit do chamador
+        ids = [p.id for p in created]
+        updated = repo.bulk_update(
+            db,
+            values=[
+                {"id": ids[0], "status": "paid", "payment_date": date(2025, 1, 5)},
+                {"id": ids[1], "due_date": date(2025, 4, 5)},
+                {"id": 999999, "status": "paid"},
+            ],
+            commit=False,
+        )
+        assert updated == 2
+        assert repo.bulk_delete(db, ids=[ids[2]], commit=False) == 1
+        db.rollback()
+        assert len(repo.search_payments(db, 1)) == 3
+
+        repo.bulk_update(db, values=[{"id": ids[1], "due_date": date(2025, 4, 5)}])
+        assert repo.bulk_delete(db, ids=[ids[2], 999999]) == 1
+        db.expire_all()
+        assert [p.due_date for p in repo.search_payments(db, 1)] == [
+            date(2025, 1, 5),
+            date(2025, 4, 5),
+        ]
+
+        # Os buckets mantidos pelas operações em lote batem com a reconstrução
+        def snapshot():
+            db.expire_all()
+            return {
+                (r.month, r.expected_rent, r.payments_pending)
+                for r in db.query(MonthlyRollup).filter(MonthlyRollup.user_id == 1)
+                if r.expected_rent or r.payments_pending
+            }
+
+        incremental = snapshot()
+        MonthlyRollupService.rebuild(db, user_id=1)
+        assert snapshot() == incremental
+        assert {month for month, _, _ in incremental} == {date(2025, 1, 1), date(2025, 4, 1)}
+
     @pytest.mark.parametrize("method", ["cash", "transfer", "pix", "check", "card"])
     def test_payment_methods(self, method):
         """Test valid payment methods (parametrized)"""
@@ -1,6 +1,7 @@
 """Unit tests for Properties module"""
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.src.properties.repository import PropertyRepository
@@ -48,6 +49,52 @@ class TestPropertyRepository:
         assert updated.rent == 2000.00
         assert updated.name == sample_property_data["name"]
 
+    def test_update_returning_scoped_to_owner(self, db: Session, sample_property_data):
+        """Test single-statement update with the ownership check"""
+        repo = PropertyRepository(db)
+        created = repo.create(db, obj_in=PropertyCreate(**sample_property_data))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            updated = repo.update_returning(db, created.id, 1, PropertyUpdate(rent=2100.00))
+            assert updated.rent == 2100.00
+            assert updated.name == sample_property_data["name"]
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        # Um UPDATE ... RETURNING, sem SELECT antes nem refresh depois
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("UPDATE")
+
+        # Registro de outro usuário: nada é alterado
+        assert repo.update_returning(db, created.id, 2, PropertyUpdate(rent=1.00)) is None
+        db.expire_all()
+        assert repo.get(db, created.id).rent == 2100.00
+
+    def test_delete_owned_cascades_units(self, db: Session, sample_property_data, sample_unit_data):
+        """Test single-statement delete scoped to the owner, removing the units"""
+        from app.src.units.models import Unit
+        from app.src.units.repository import UnitRepository
+
+        repo = PropertyRepository(db)
+        created = repo.create(db, obj_in=PropertyCreate(**sample_property_data))
+        UnitRepository(db).create(
+            db, obj_in={**sample_unit_data, "property_id": created.id, "user_id": 1}
+        )
+        property_id = created.id
+
+        # Outro usuário: nada é removido
+        assert repo.delete_owned(db, property_id, 2) is False
+        assert repo.get(db, property_id) is not None
+
+        assert repo.delete_owned(db, property_id, 1) is True
+        db.expire_all()
+        assert repo.get(db, property_id) is None
+        assert db.query(Unit).filter(Unit.property_id == property_id).count() == 0
+        assert repo.delete_owned(db, property_id, 1) is False
+
     def test_delete_property(self, db: Session, sample_property_data):
         """Test deleting a property"""
         repo = PropertyRepository(db)
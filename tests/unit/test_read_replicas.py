@@ -0,0 +1,59 @@
+"""Tests for read-replica routing"""
+
+import pytest
+
+from app.db.session import READ_LAG_INFO, ReadRouter, SessionLocal, get_read_db, is_stale_read
+from tests.conftest import TEST_DATABASE_URL
+
+UNREACHABLE_URL = "postgresql://postgres@127.0.0.1:1/unreachable?connect_timeout=1"
+
+
+class TestReadRouter:
+    """Test replica choice, staleness tolerance and primary fallback"""
+
+    def test_chooses_replica_within_tolerance(self):
+        """Test that a caught-up server is eligible (lag measured as zero)"""
+        router = ReadRouter([TEST_DATABASE_URL], max_lag_seconds=5, check_seconds=60)
+        replica = router.choose()
+        assert replica is router.replicas[0]
+        assert replica.lag == 0
+
+        # Medição em cache dentro do intervalo
+        checked_at = replica.checked_at
+        assert router.choose() is replica
+        assert replica.checked_at == checked_at
+
+    def test_skips_unreachable_and_lagging_replicas(self):
+        """Test fallback to the primary when no replica is eligible"""
+        router = ReadRouter([UNREACHABLE_URL], max_lag_seconds=5, check_seconds=60)
+        assert router.choose() is None
+        assert router.replicas[0].lag is None
+
+        router = ReadRouter([UNREACHABLE_URL, TEST_DATABASE_URL], 5, 60)
+        assert [router.choose().url for _ in range(2)] == [TEST_DATABASE_URL] * 2
+
+        router.replicas[1].lag = 12.0
+        assert router.choose() is None
+        assert router.choose(max_lag=30) is router.replicas[1]
+
+    @pytest.mark.asyncio
+    async def test_async_choose(self):
+        """Test that the async path measures the lag without blocking"""
+        router = ReadRouter([UNREACHABLE_URL, TEST_DATABASE_URL], 5, 60)
+        replica = await router.async_choose()
+        assert replica.url == TEST_DATABASE_URL
+        assert router.replicas[0].lag is None
+
+    def test_get_read_db_without_replicas_uses_primary(self):
+        """Test the dependency default: primary session, not a stale read"""
+        dependency = get_read_db()
+        db = next(dependency)
+        try:
+            assert db.get_bind() is SessionLocal.kw["bind"]
+            assert db.info[READ_LAG_INFO] == 0.0
+            assert not is_stale_read(db)
+        finally:
+            dependency.close()
+
+        db.info[READ_LAG_INFO] = 2.5
+        assert is_stale_read(db)
@@ -0,0 +1,90 @@
+"""Unit tests for the incremental monthly rollups"""
+
+import threading
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.db.instrumentation import capture_queries
+from app.src.dashboard.models import MonthlyRollup
+from app.src.dashboard.rollups import MonthlyRollupService
+from tests.conftest import TEST_DATABASE_URL
+from tests.unit.test_background_tasks import _create_contract, _payment
+
+
+class TestMonthlyRollupRefresh:
+    """Test batched refresh and concurrent writers to the same bucket"""
+
+    def test_refresh_many_buckets_in_one_statement(
+        self, db: Session, sample_property_data, sample_tenant_data, sample_contract_data
+    ):
+        """Test that all dirty buckets are recomputed by one upsert"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        months = [date(2025, month, 1) for month in (1, 2, 3)]
+        db.add_all(_payment(contract, month.replace(day=5)) for month in months)
+        db.commit()
+
+        db.query(MonthlyRollup).delete()
+        keys = [(1, contract.property_id, month) for month in months] * 2
+        with capture_queries() as stats:
+            assert MonthlyRollupService.refresh(db, keys) == 3
+        assert stats.count == 2  # advisory locks + upsert
+        db.commit()
+
+        rollups = db.query(MonthlyRollup).order_by(MonthlyRollup.month).all()
+        assert [r.month for r in rollups] == months
+        assert [r.expected_rent for r in rollups] == [1500] * 3
+        assert MonthlyRollupService.refresh(db, []) == 0
+
+    def test_concurrent_writes_to_same_bucket(
+        self, db: Session, sample_property_data, sample_tenant_data, sample_contract_data
+    ):
+        """Test that the second writer waits and recomputes with the first one's rows"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        contract = _create_contract(db, 1, data)
+        db.commit()
+        month = date(2025, 6, 1)
+
+        engine = create_engine(
+            TEST_DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={"options": "-csearch_path=test_schema"},
+        )
+        first = Session(engine)
+        second = Session(engine)
+        try:
+            first.add(_payment(contract, month.replace(day=5), amount=100, total_amount=100))
+            first.flush()  # bucket recalculado e lock mantido até o commit
+
+            def write_second():
+                second.add(_payment(contract, month.replace(day=10), amount=200, total_amount=200))
+                second.commit()
+
+            writer = threading.Thread(target=write_second)
+            writer.start()
+            writer.join(timeout=0.5)
+            assert writer.is_alive()  # esperando o lock do bucket
+
+            first.commit()
+            writer.join(timeout=10)
+            assert not writer.is_alive()
+        finally:
+            first.close()
+            second.close()
+            engine.dispose()
+
+        db.expire_all()
+        rollup = db.get(MonthlyRollup, (1, contract.property_id, month))
+        assert rollup.expected_rent == 300
+        assert rollup.payments_pending == 2
@@ -0,0 +1,79 @@
+"""Tests for the advisory-lock scheduler"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.scheduler import Scheduler
+from app.src.jobs.models import SchedulerRun
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+def lock_engine():
+    """Engine separado para as conexões que seguram os advisory locks"""
+    engine = create_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    yield engine
+    engine.dispose()
+
+
+class TestScheduler:
+    """Test that each periodic job runs once per period"""
+
+    def test_runs_due_job_once_per_period(self, db: Session, lock_engine):
+        """Test last-run bookkeeping and skipping jobs that are not due"""
+        calls = []
+        jobs = {"test.tick": (3600, lambda session: calls.append(1))}
+
+        assert Scheduler.run_pending(db, lock_engine, "replica-a", jobs) == {"test.tick": "ran"}
+        assert Scheduler.run_pending(db, lock_engine, "replica-b", jobs) == {"test.tick": "not_due"}
+        assert calls == [1]
+
+        run = db.get(SchedulerRun, "test.tick")
+        assert run.last_status == "success"
+        assert run.last_run_by == "replica-a"
+        assert run.run_count == 1
+        assert run.last_finished_at >= run.last_started_at
+
+        # Período seguinte
+        run.last_started_at = datetime.utcnow() - timedelta(hours=2)
+        db.commit()
+        assert Scheduler.run_pending(db, lock_engine, "replica-b", jobs) == {"test.tick": "ran"}
+        db.refresh(run)
+        assert run.run_count == 2
+        assert run.last_run_by == "replica-b"
+
+    def test_skips_job_locked_by_another_replica(self, db: Session, lock_engine):
+        """Test that a replica without the advisory lock does not run the job"""
+        calls = []
+        jobs = {"test.locked": (60, lambda session: calls.append(1))}
+
+        with lock_engine.connect() as other:
+            with other.begin():
+                other.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": Scheduler.lock_key("test.locked")},
+                )
+                assert Scheduler.run_pending(db, lock_engine, "replica-a", jobs) == {
+                    "test.locked": "locked"
+                }
+
+        assert calls == []
+        assert Scheduler.run_pending(db, lock_engine, "replica-a", jobs) == {"test.locked": "ran"}
+
+    def test_failed_job_is_recorded(self, db: Session, lock_engine):
+        """Test that failures are stored and do not block the period"""
+
+        def boom(session: Session) -> None:
+            raise RuntimeError("falhou")
+
+        jobs = {"test.fail": (60, boom)}
+        assert Scheduler.run_pending(db, lock_engine, "replica-a", jobs) == {"test.fail": "failed"}
+
+        run = db.get(SchedulerRun, "test.fail")
+        assert run.last_status == "failed"
+        assert "falhou" in run.last_error
+        assert Scheduler.run_pending(db, lock_engine, "replica-a", jobs) == {"test.fail": "not_due"}
@@ -0,0 +1,41 @@
+"""Unit tests for the startup schema check"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.schema import (
+    check_schema_revision,
+    get_current_revision,
+    get_head_revision,
+    run_startup_schema_step,
+)
+
+
+class TestSchemaRevision:
+    """Test Alembic revision check used on startup"""
+
+    def test_head_revision_from_scripts(self):
+        """Test head is read from migrations/ without a database"""
+        assert get_head_revision() is not None
+
+    def test_unversioned_database(self, db: Session):
+        """Test a database without alembic_version is reported as behind"""
+        connection = db.connection()
+
+        assert get_current_revision(connection) is None
+        assert check_schema_revision(connection) is False
+
+    def test_database_at_head(self, db: Session):
+        """Test a database stamped at head passes the check"""
+        db.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        db.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": get_head_revision()})
+
+        assert check_schema_revision(db.connection()) is True
+
+    def test_invalid_startup_mode(self):
+        """Test unknown DB_STARTUP_SCHEMA_MODE values are rejected"""
+        run_startup_schema_step("skip")
+
+        with pytest.raises(ValueError):
+            run_startup_schema_step("drop_everything")
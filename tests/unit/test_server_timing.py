@@ -0,0 +1,88 @@
+"""Tests for the Server-Timing header"""
+
+import re
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.server_timing import (
+    SERVER_TIMING_HEADER,
+    SERVER_TIMING_TOKEN_HEADER,
+    RequestTimings,
+    format_server_timing,
+)
+from app.db.instrumentation import QueryStats
+
+
+def parse(header):
+    """{"db": {"dur": "1.00"}, "db_count": {"desc": '"3"'}, ...}"""
+    metrics = {}
+    for entry in header.split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+class TestServerTiming:
+    """Test the header format, the gate and the measured components"""
+
+    def test_format_server_timing(self):
+        """Test that app is what remains after db and serialization"""
+        stats = QueryStats()
+        stats.record("SELECT 1", 4.0)
+        stats.record("SELECT 2", 6.0)
+        timings = RequestTimings()
+        timings.serialize_ms = 2.5
+
+        header = format_server_timing(20.0, stats, timings)
+        assert header == (
+            'db;dur=10.00, db_count;desc="2", serialize;dur=2.50, app;dur=7.50, total;dur=20.00'
+        )
+        assert "app;dur=0.00" in format_server_timing(5.0, stats, timings)
+        assert format_server_timing(1.0, None, RequestTimings()).startswith("db;dur=0.00")
+
+    def test_disabled_by_default(self, client: TestClient, monkeypatch):
+        """Test that the header needs the setting or the trusted token"""
+        monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", False)
+        monkeypatch.setattr(settings, "SERVER_TIMING_TOKEN", "")
+        assert SERVER_TIMING_HEADER not in client.get("/api/v1/properties/").headers
+
+        # Token vazio nunca libera o header
+        response = client.get("/api/v1/properties/", headers={SERVER_TIMING_TOKEN_HEADER: ""})
+        assert SERVER_TIMING_HEADER not in response.headers
+
+        monkeypatch.setattr(settings, "SERVER_TIMING_TOKEN", "s3cret")
+        response = client.get("/api/v1/properties/", headers={SERVER_TIMING_TOKEN_HEADER: "wrong"})
+        assert SERVER_TIMING_HEADER not in response.headers
+
+        response = client.get(
+            "/api/v1/properties/",
+            headers={SERVER_TIMING_TOKEN_HEADER: "s3cret", "Origin": "http://localhost:3000"},
+        )
+        assert set(parse(response.headers[SERVER_TIMING_HEADER])) == {
+            "db",
+            "db_count",
+            "serialize",
+            "app",
+            "total",
+        }
+        assert response.headers["Timing-Allow-Origin"] == "http://localhost:3000"
+
+    def test_measures_db_and_serialization(
+        self, client: TestClient, sample_property_data, monkeypatch
+    ):
+        """Test that db counts the request's statements and serialize is measured"""
+        monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+        for _ in range(3):
+            client.post("/api/v1/properties/", json=sample_property_data)
+
+        response = client.get("/api/v1/properties/")
+        assert response.status_code == 200
+        metrics = parse(response.headers[SERVER_TIMING_HEADER])
+        assert metrics["db_count"]["desc"] == '"1"'
+        assert float(metrics["db"]["dur"]) > 0
+        assert float(metrics["serialize"]["dur"]) > 0
+        total = float(metrics["total"]["dur"])
+        parts = sum(float(metrics[name]["dur"]) for name in ("db", "serialize", "app"))
+        assert abs(parts - total) < 0.05
+        assert re.fullmatch(r"\d+\.\d{2}", metrics["app"]["dur"])
@@ -0,0 +1,94 @@
+"""Tests for the slow-query log with sampled EXPLAIN"""
+
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.db.instrumentation import current_route_var
+from app.db.slow_queries import install_slow_query_log, parameter_shape, uninstall_slow_query_log
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+def explain_engine():
+    """Conexão de leitura que enxerga o schema isolado dos testes"""
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"options": "-csearch_path=test_schema"},
+    )
+    yield engine
+    engine.dispose()
+
+
+def read_entries(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+class TestSlowQueryLog:
+    """Test threshold, parameter shapes, routes and captured plans"""
+
+    def test_records_slow_select_with_plan(self, db: Session, tmp_path, explain_engine):
+        """Test that a slow SELECT is written with its EXPLAIN ANALYZE plan"""
+        path = tmp_path / "slow.jsonl"
+        log = install_slow_query_log(
+            str(path),
+            threshold_ms=0,
+            explain_sample_rate=1.0,
+            explain_engine=lambda: explain_engine,
+        )
+        token = current_route_var.set("GET /api/v1/payments/")
+        try:
+            db.execute(
+                text("SELECT count(*) FROM payments WHERE user_id = :user_id AND due_date < :d"),
+                {"user_id": 1, "d": date(2025, 1, 1)},
+            )
+            log.flush()
+        finally:
+            current_route_var.reset(token)
+            uninstall_slow_query_log()
+
+        entries = [e for e in read_entries(path) if "FROM payments" in e["statement"]]
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["route"] == "GET /api/v1/payments/"
+        assert entry["parameters"] == {"user_id": "int", "d": "date"}
+        assert entry["plan"][0]["Plan"]["Node Type"] == "Aggregate"
+        assert "Shared Hit Blocks" in entry["plan"][0]["Plan"]
+        # Os valores dos parâmetros só aparecem no plano (condições do EXPLAIN)
+        assert "2025-01-01" not in json.dumps({k: v for k, v in entry.items() if k != "plan"})
+
+    def test_fast_statements_and_writes_are_not_explained(
+        self, db: Session, tmp_path, explain_engine
+    ):
+        """Test the threshold and that only SELECTs get EXPLAIN ANALYZE"""
+        path = tmp_path / "slow.jsonl"
+        log = install_slow_query_log(
+            str(path),
+            threshold_ms=0,
+            explain_sample_rate=1.0,
+            explain_engine=lambda: explain_engine,
+        )
+        try:
+            db.execute(text("UPDATE payments SET amount = amount WHERE id = -1"))
+            db.rollback()
+            log.threshold_ms = 60_000
+            db.execute(text("SELECT 1"))
+            log.flush()
+        finally:
+            uninstall_slow_query_log()
+
+        entries = read_entries(path)
+        assert [e["statement"][:6] for e in entries] == ["UPDATE"]
+        assert "plan" not in entries[0]
+
+    def test_parameter_shape(self):
+        """Test parameter shapes for single and executemany statements"""
+        assert parameter_shape({"a": 1, "b": "x"}) == {"a": "int", "b": "str"}
+        assert parameter_shape([{"a": 1}, {"a": 2}]) == {"rows": 2, "row": {"a": "int"}}
+        assert parameter_shape((1, None)) == ["int", "NoneType"]
@@ -0,0 +1,118 @@
+"""Tests for the optional OpenTelemetry tracing"""
+
+import importlib.util
+import io
+from contextlib import contextmanager
+
+import pytest
+from fastapi import UploadFile
+
+from app.core import tracing
+from app.core.notification_service import NotificationService
+from app.core.upload_service import UploadService
+from app.src.payments.controller import payment_controller
+from app.src.payments.repository import PaymentRepository
+
+HAS_OPENTELEMETRY = importlib.util.find_spec("opentelemetry") is not None
+
+
+class RecordingTracer:
+    """Tracer mínimo: guarda nome e atributos de cada span"""
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        self.spans.append((name, attributes))
+        yield name
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    recorder = RecordingTracer()
+    monkeypatch.setattr(tracing, "_tracer", recorder)
+    return recorder
+
+
+class Sample:
+    def load(self, value):
+        return value * 2
+
+    async def fetch(self, value):
+        return value + 1
+
+    @staticmethod
+    def build(value):
+        return [value]
+
+    @classmethod
+    def create(cls, value):
+        return cls.build(value)
+
+    def rows(self):
+        yield 1
+
+    def _private(self):
+        return "private"
+
+
+class Child(Sample):
+    pass
+
+
+class TestTracing:
+    """Test the no-op default, method wrapping and the upload spans"""
+
+    def test_span_is_noop_when_disabled(self):
+        """Test that span() does nothing without configure_tracing"""
+        assert tracing._tracer is None
+        with tracing.span("noop", {"key": "value"}) as current:
+            assert current is None
+
+    @pytest.mark.asyncio
+    async def test_trace_class_methods(self, tracer):
+        """Test that public methods keep their behavior and open one span per call"""
+        tracing.trace_class_methods(Sample)
+        tracing.trace_class_methods(Sample)  # idempotente
+
+        assert Sample().load(2) == 4
+        assert await Child().fetch(1) == 2
+        assert Sample.create(3) == [3]
+        assert list(Sample().rows()) == [1]
+        assert Sample()._private() == "private"
+
+        assert [name for name, _ in tracer.spans] == [
+            "Sample.load",
+            "Child.fetch",
+            "Sample.create",
+            "Sample.build",
+        ]
+
+    def test_traced_classes(self):
+        """Test that controllers, repositories and NotificationService are covered"""
+        classes = tracing.traced_classes()
+        assert {payment_controller, PaymentRepository, NotificationService} <= set(classes)
+        assert not any(cls.__module__.startswith("app.src.auth") for cls in classes)
+
+    @pytest.mark.asyncio
+    async def test_upload_write_span(self, tracer, tmp_path):
+        """Test that each upload write gets its own span"""
+        service = UploadService()
+        service.base_upload_dir = tmp_path
+        upload = UploadFile(filename="photo.jpg", file=io.BytesIO(b"jpeg"))
+
+        saved = await service.save_file(upload, "properties", "image")
+        assert service.delete_file(saved["url"])
+
+        assert tracer.spans == [
+            ("upload.write", {"upload.folder": "properties", "upload.size": 4}),
+            ("upload.delete", {"upload.path": f"properties/{saved['filename']}"}),
+        ]
+
+    @pytest.mark.skipif(HAS_OPENTELEMETRY, reason="OpenTelemetry instalado")
+    def test_configure_requires_opentelemetry(self):
+        """Test the error message when the optional packages are missing"""
+        with pytest.raises(RuntimeError, match="opentelemetry-sdk"):
+            tracing.configure_tracing()
+        assert tracing._tracer is None
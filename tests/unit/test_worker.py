@@ -0,0 +1,134 @@
+"""Tests for the standalone background worker"""
+
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.job_queue import JobQueue
+from app.db.instrumentation import capture_queries
+from app.src.notifications.models import Notification
+from app.src.payments.models import Payment
+from app.worker import StageTimer, chunked, enqueue_chunks, get_user_ids, run_once, run_stages
+from tests.unit.test_background_tasks import _create_contract, _payment
+
+
+def _seed(db: Session, user_ids, data) -> None:
+    """Um contrato com um pagamento vencido há 7 dias por usuário"""
+    for user_id in user_ids:
+        contract = _create_contract(db, user_id, data)
+        db.add(_payment(contract, date.today() - timedelta(days=7)))
+    db.commit()
+
+
+class TestWorker:
+    """Test chunked runs over all users"""
+
+    def test_chunked(self):
+        """Test splitting users into chunks"""
+        assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+        assert list(chunked([], 2)) == []
+
+    def test_run_once_processes_all_users(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test that every user is processed and stage timings are reported"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        _seed(db, [1, 2, 3], data)
+
+        assert get_user_ids(db) == [1, 2, 3]
+
+        summary = run_once(db, chunk_size=2)
+
+        assert summary["users"] == 3
+        assert summary["chunks"] == 2
+        assert summary["failed_chunks"] == 0
+        assert summary["stages"]["payment_status"]["calls"] == 2
+        assert summary["stages"]["payment_status"]["count"] == 3
+        assert summary["stages"]["overdue_notifications"]["calls"] == 2
+        assert summary["stages"]["overdue_notifications"]["count"] == 3
+        assert all(stage["seconds"] >= 0 for stage in summary["stages"].values())
+
+        assert db.query(Payment).filter(Payment.status == "overdue").count() == 3
+        overdue_users = {
+            n.user_id for n in db.query(Notification).filter(Notification.type == "payment_overdue")
+        }
+        assert overdue_users == {1, 2, 3}
+
+    def test_dry_run_does_not_write(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test that a dry run reports counts but rolls everything back"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        _seed(db, [1, 2], data)
+
+        summary = run_once(db, dry_run=True)
+
+        assert summary["dry_run"] is True
+        assert summary["stages"]["payment_status"]["count"] == 2
+        assert db.query(Payment).filter(Payment.status == "overdue").count() == 0
+        assert db.query(Notification).count() == 0
+
+    def test_enqueue_and_consume_jobs(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test fanning out user chunks through the job queue"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        _seed(db, [1, 2, 3], data)
+
+        assert enqueue_chunks(db, chunk_size=2, period="p1") == 2
+        assert enqueue_chunks(db, chunk_size=2, period="p1") == 0
+
+        assert JobQueue.work_once(db, "worker-a", limit=10) == {"done": 2}
+        assert db.query(Payment).filter(Payment.status == "overdue").count() == 3
+        assert db.query(Notification).filter(Notification.type == "payment_overdue").count() == 3
+
+    def test_chunk_statement_count_does_not_grow_with_users(
+        self,
+        db: Session,
+        sample_property_data,
+        sample_tenant_data,
+        sample_contract_data,
+    ):
+        """Test that a chunk of 4 users costs the same statements as a chunk of 1"""
+        data = {
+            "property": sample_property_data,
+            "tenant": sample_tenant_data,
+            "contract": sample_contract_data,
+        }
+        _seed(db, [1, 2, 3, 4, 5], data)
+
+        with capture_queries() as single:
+            run_stages(db, [1], StageTimer())
+        with capture_queries() as batch:
+            run_stages(db, [2, 3, 4, 5], StageTimer())
+        db.commit()
+
+        assert batch.count == single.count
+        overdue_users = {
+            n.user_id for n in db.query(Notification).filter(Notification.type == "payment_overdue")
+        }
+        assert overdue_users == {1, 2, 3, 4, 5}